@@ -1,9 +1,42 @@
 from django.contrib import admin
-from .models import PetTourSpot
+from django.db import transaction
+from .models import PetTourSpot, KakaoPlace
+from .catalog import bump_generation
+from .changes import record_changes
 
 @admin.register(PetTourSpot)
 class PetTourSpotAdmin(admin.ModelAdmin):
-    list_display = ('title', 'contentid', 'addr1', 'tel', 'firstimage')
+    """관리자 수정/삭제도 CatalogWriteMixin과 같이 카탈로그 세대를 올리고 변경 로그에 기록"""
+    list_display = ('title', 'contentid', 'addr1', 'tel', 'firstimage', 'score')
     search_fields = ('title', 'addr1', 'addr2', 'tel')
     list_filter = ('areacode', 'sigungucode', 'contenttypeid')
     readonly_fields = ()
+
+    def save_model(self, request, obj, form, change):
+        with transaction.atomic():
+            super().save_model(request, obj, form, change)
+            self._record_write('change' if change else 'add', upserted=[obj])
+
+    def delete_model(self, request, obj):
+        contentid = obj.contentid
+        with transaction.atomic():
+            super().delete_model(request, obj)
+            self._record_write('delete', deleted=[contentid])
+
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            contentids = list(queryset.values_list('contentid', flat=True))
+            super().delete_queryset(request, queryset)
+            if contentids:
+                self._record_write('delete', deleted=contentids)
+
+    def _record_write(self, action, upserted=(), deleted=()):
+        generation = bump_generation(reason=f'{self.__class__.__name__} {action}')
+        record_changes(generation, upserted, deleted)
+
+
+@admin.register(KakaoPlace)
+class KakaoPlaceAdmin(admin.ModelAdmin):
+    list_display = ('place_name', 'kakao_id', 'category_name', 'address_name', 'fetched_at')
+    search_fields = ('place_name', 'address_name', 'road_address_name')
+    list_filter = ('category_group_code',)
@@ -0,0 +1,104 @@
+"""
+마감 시간이 있는 경로 개선 (anytime local search)
+
+탐욕 선택으로 만든 실행 가능한 경로에서 시작해, 마감 시간까지 더 나은 이웃 경로로 계속 옮겨 갑니다.
+마감 시간에 도달하거나 더 나아지는 이동이 없으면(국소 최적) 그때까지 찾은 가장 좋은 경로를 반환합니다.
+
+목적 함수 = 평점 합 - TRAVEL_WEIGHT × 이동 시간 합(분)   (클수록 좋음)
+제약 = 방문 시간 + 이동 시간 ≤ 시간 예산, 장소 수 ≤ max_stops, 고정(pin) 장소 유지
+
+이웃 이동 (첫 번째로 개선되는 이동을 바로 적용)
+1. 2-opt: 경로 일부 구간 순서 뒤집기 (이동 시간 단축)
+2. 삽입: 경로에 없는 후보를 어느 위치에 추가
+3. 교체: 고정되지 않은 장소 하나를 경로에 없는 후보로 바꿔 어느 위치에 삽입
+
+groups(후보별 그룹, 예: 카테고리)를 주면 경로 순서(시간대 슬롯)를 유지합니다.
+이때 이웃 이동은 고정되지 않은 장소를 같은 그룹의 후보로 같은 위치에서 바꾸는 것뿐입니다.
+"""
+import time
+
+from .replan import route_minutes
+
+# 이동 시간 1분의 비용 (평점 단위) - 이동 100분 ≈ 평점 1점
+TRAVEL_WEIGHT = 0.01
+# 마감 시간 확인 간격 (평가한 이웃 경로 수)
+_CLOCK_EVERY = 64
+
+
+def objective(route, rating, matrix, travel_weight=TRAVEL_WEIGHT):
+    travel = sum(matrix[a][b] for a, b in zip(route, route[1:]))
+    return sum(rating[i] for i in route) - travel_weight * travel
+
+
+def _neighbors(route, unused, pinned, max_stops):
+    for i in range(len(route) - 1):
+        for j in range(i + 1, len(route)):
+            yield route[:i] + route[i:j + 1][::-1] + route[j + 1:]
+    if len(route) < max_stops:
+        for candidate in unused:
+            for position in range(len(route) + 1):
+                yield route[:position] + [candidate] + route[position:]
+    for removed_position, stop in enumerate(route):
+        if stop in pinned:
+            continue
+        rest = route[:removed_position] + route[removed_position + 1:]
+        for candidate in unused:
+            for position in range(len(rest) + 1):
+                yield rest[:position] + [candidate] + rest[position:]
+
+
+def _slot_neighbors(route, unused, pinned, groups):
+    for position, stop in enumerate(route):
+        if stop in pinned:
+            continue
+        for candidate in unused:
+            if groups[candidate] == groups[stop]:
+                yield route[:position] + [candidate] + route[position + 1:]
+
+
+def improve_route(route, visit, rating, matrix, budget, deadline, candidates, pinned=(), max_stops=5,
+                  travel_weight=TRAVEL_WEIGHT, groups=None):
+    """
+    deadline(time.perf_counter 기준)까지 경로 개선, (경로, 통계 dict) 반환
+    candidates: 경로에 넣을 수 있는 후보 인덱스 (제외된 장소는 빼고 전달)
+    groups: 주면 순서를 유지하고 같은 그룹끼리 같은 위치에서만 교체
+    """
+    started = time.perf_counter()
+    pinned = set(pinned)
+    route = list(route)
+    # 시작 경로가 이미 예산을 넘으면(고정 장소만으로 초과 등) 그보다 나빠지지만 않게 함
+    limit = max(budget, route_minutes(route, visit, matrix))
+    best = initial = objective(route, rating, matrix, travel_weight)
+    iterations = evaluations = 0
+    converged = False
+
+    while time.perf_counter() < deadline:
+        in_route = set(route)
+        unused = [c for c in candidates if c not in in_route]
+        improved = False
+        if groups is None:
+            neighbors = _neighbors(route, unused, pinned, max_stops)
+        else:
+            neighbors = _slot_neighbors(route, unused, pinned, groups)
+        for neighbor in neighbors:
+            evaluations += 1
+            if evaluations % _CLOCK_EVERY == 0 and time.perf_counter() >= deadline:
+                break
+            value = objective(neighbor, rating, matrix, travel_weight)
+            if value > best + 1e-9 and route_minutes(neighbor, visit, matrix) <= limit:
+                route, best = neighbor, value
+                iterations += 1
+                improved = True
+                break
+        if not improved:
+            converged = time.perf_counter() < deadline
+            break
+
+    return route, {
+        'iterations': iterations,
+        'evaluations': evaluations,
+        'objective': round(best, 4),
+        'initial_objective': round(initial, 4),
+        'converged': converged,
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 2),
+    }
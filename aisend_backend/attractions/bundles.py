@@ -0,0 +1,191 @@
+"""
+지역(areacode)별 오프라인 카탈로그 번들
+
+앱이 지역 데이터를 한 번 내려받아 로컬에서 검색할 수 있도록
+카탈로그를 areacode 단위 SQLite 파일로 내보냅니다.
+
+    BUNDLE_ROOT/<generation>/area_<areacode>.sqlite
+    BUNDLE_ROOT/<generation>/manifest.json
+
+번들은 카탈로그 세대별 디렉터리에 저장되고 번들 API(bundles/<generation>/<filename>)로 서빙됩니다.
+매니페스트에는 파일 이름만 저장하고, 다운로드 URL은 응답할 때 요청 경로 기준으로 붙입니다.
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+import sqlite3
+from collections import defaultdict
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import PetTourSpot
+
+BUNDLE_FORMAT_VERSION = 1
+BUNDLE_FILENAME_RE = re.compile(r'^area_[0-9A-Za-z]+\.sqlite$')
+
+# places.flags 비트
+FLAG_PET_FRIENDLY = 1
+FLAG_HAS_IMAGE = 2
+FLAG_HAS_TEL = 4
+
+BUNDLE_FIELDS = (
+    'contentid', 'title', 'mapx', 'mapy', 'areacode', 'sigungucode',
+    'contenttypeid', 'cat1', 'cat2', 'cat3', 'firstimage', 'tel', 'score',
+)
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE places (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    lat REAL,
+    lng REAL,
+    sigungucode TEXT,
+    contenttypeid TEXT,
+    cat1 TEXT,
+    cat2 TEXT,
+    cat3 TEXT,
+    flags INTEGER NOT NULL DEFAULT 0,
+    thumbnail TEXT,
+    score REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX places_title ON places (title);
+CREATE INDEX places_lat_lng ON places (lat, lng);
+"""
+
+
+def _place_flags(row):
+    flags = FLAG_PET_FRIENDLY
+    if row['firstimage']:
+        flags |= FLAG_HAS_IMAGE
+    if row['tel']:
+        flags |= FLAG_HAS_TEL
+    return flags
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_bundle(path, generation, areacode, rows):
+    """SQLite 번들 파일 작성 (임시 파일에 쓴 뒤 교체)"""
+    tmp_path = path + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(SCHEMA)
+        conn.executemany('INSERT INTO meta (key, value) VALUES (?, ?)', [
+            ('format_version', str(BUNDLE_FORMAT_VERSION)),
+            ('generation', str(generation)),
+            ('areacode', areacode),
+            ('created_at', timezone.now().isoformat()),
+        ])
+        conn.executemany(
+            'INSERT OR REPLACE INTO places VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            [(
+                row['contentid'],
+                row['title'],
+                row['mapy'] or None,
+                row['mapx'] or None,
+                row['sigungucode'],
+                row['contenttypeid'],
+                row['cat1'],
+                row['cat2'],
+                row['cat3'],
+                _place_flags(row),
+                row['firstimage'],
+                row['score'],
+            ) for row in rows],
+        )
+        conn.commit()
+        conn.execute('VACUUM')
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, path)
+
+
+def export_region_bundles(generation):
+    """현재 카탈로그를 areacode별 번들로 내보내고 매니페스트 반환"""
+    generation_dir = os.path.join(settings.BUNDLE_ROOT, str(generation))
+    os.makedirs(generation_dir, exist_ok=True)
+
+    rows_by_area = defaultdict(list)
+    for row in PetTourSpot.objects.values(*BUNDLE_FIELDS).order_by('id').iterator(chunk_size=2000):
+        rows_by_area[row['areacode'] or '0'].append(row)
+
+    bundles = []
+    for areacode, rows in sorted(rows_by_area.items()):
+        filename = f'area_{areacode}.sqlite'
+        path = os.path.join(generation_dir, filename)
+        _write_bundle(path, generation, areacode, rows)
+        bundles.append({
+            'areacode': areacode,
+            'count': len(rows),
+            'filename': filename,
+            'size': os.path.getsize(path),
+            'sha256': _file_sha256(path),
+        })
+
+    manifest = {
+        'format_version': BUNDLE_FORMAT_VERSION,
+        'generation': generation,
+        'created_at': timezone.now().isoformat(),
+        'bundles': bundles,
+    }
+    manifest_path = os.path.join(generation_dir, 'manifest.json')
+    with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(manifest_path + '.tmp', manifest_path)
+
+    _remove_old_generations(keep=settings.BUNDLE_KEEP_GENERATIONS)
+    return manifest
+
+
+def _bundle_generations():
+    """매니페스트가 있는 번들 세대 목록 (오름차순)"""
+    if not os.path.isdir(settings.BUNDLE_ROOT):
+        return []
+    generations = []
+    for name in os.listdir(settings.BUNDLE_ROOT):
+        if name.isdigit() and os.path.exists(os.path.join(settings.BUNDLE_ROOT, name, 'manifest.json')):
+            generations.append(int(name))
+    return sorted(generations)
+
+
+def _remove_old_generations(keep):
+    for generation in _bundle_generations()[:-keep]:
+        shutil.rmtree(os.path.join(settings.BUNDLE_ROOT, str(generation)), ignore_errors=True)
+
+
+def latest_bundle_generation():
+    """매니페스트까지 다 쓴 가장 최근 번들 세대 (없으면 None)"""
+    generations = _bundle_generations()
+    return generations[-1] if generations else None
+
+
+def latest_manifest():
+    """가장 최근에 내보낸 번들 매니페스트 (없으면 None)"""
+    generation = latest_bundle_generation()
+    if generation is None:
+        return None
+    manifest_path = os.path.join(settings.BUNDLE_ROOT, str(generation), 'manifest.json')
+    with open(manifest_path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def bundle_path(generation, filename):
+    """번들 파일 경로 (형식에 맞지 않거나 없는 파일이면 None)"""
+    if not BUNDLE_FILENAME_RE.match(filename):
+        return None
+    path = os.path.join(settings.BUNDLE_ROOT, str(generation), filename)
+    return path if os.path.isfile(path) else None
@@ -0,0 +1,59 @@
+"""
+카탈로그 세대(generation) 관리
+
+동기화 파이프라인이나 관리자 수정으로 카탈로그가 바뀌면 세대가 1 증가합니다.
+ETag, 번들, 인덱스 등 카탈로그에서 파생된 결과물은 모두 세대 번호로 버전을 구분합니다.
+"""
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import CatalogGeneration
+
+GENERATION_CACHE_KEY = 'catalog:generation'
+
+
+def current_generation():
+    """현재 카탈로그 세대 번호 (캐시 우선, 없으면 DB 조회)"""
+    generation = cache.get(GENERATION_CACHE_KEY)
+    if generation is None:
+        latest = CatalogGeneration.objects.order_by('-pk').values_list('pk', flat=True).first()
+        generation = latest or 0
+        cache.set(GENERATION_CACHE_KEY, generation, settings.CATALOG_GENERATION_CACHE_SECONDS)
+    return generation
+
+
+def bump_generation(reason='', spot_count=0):
+    """카탈로그 세대를 1 증가시키고 새 세대 번호 반환"""
+    generation = CatalogGeneration.objects.create(reason=reason, spot_count=spot_count).pk
+
+    def publish():
+        cache.set(GENERATION_CACHE_KEY, generation, settings.CATALOG_GENERATION_CACHE_SECONDS)
+
+    # 트랜잭션 안에서 호출되면 커밋 후에 새 세대를 공개 (커밋 전 데이터로 ETag가 만들어지지 않도록)
+    transaction.on_commit(publish)
+    return generation
+
+
+class GenerationCache:
+    """
+    카탈로그 세대별로 한 번만 만드는 프로세스 내 객체 (지명 사전, 검색 인덱스 등)
+    세대가 바뀐 뒤 처음 조회할 때 builder()로 다시 만듭니다.
+    """
+
+    def __init__(self, builder):
+        self.builder = builder
+        self._lock = threading.Lock()
+        self._generation = None
+        self._value = None
+
+    def get(self):
+        generation = current_generation()
+        if self._generation != generation:
+            with self._lock:
+                if self._generation != generation:
+                    self._value = self.builder()
+                    self._generation = generation
+        return self._value
@@ -0,0 +1,125 @@
+"""
+카탈로그 변경 피드 (changes since)
+
+동기화 파이프라인이 세대마다 추가/수정(upsert)과 삭제(tombstone)를 CatalogChange에 기록하고,
+클라이언트는 마지막으로 받은 세대 이후의 변경분만 받아 로컬 데이터를 갱신합니다.
+
+변경 순서는 카탈로그 세대 하나로만 판단합니다. since에 시각(YYYYMMDDHHMMSS, 서버 로컬 시간)을 주면
+그 시각까지 만들어진 마지막 세대로 바꿔 같은 방식으로 조회합니다.
+(TourAPI modifiedtime은 원본 서버 시계라 삭제 기록과 섞어 비교하지 않음)
+"""
+from datetime import datetime
+
+from django.conf import settings
+from django.utils import timezone
+
+from .catalog import current_generation
+from .models import CatalogChange, CatalogGeneration, PetTourSpot
+
+# upsert 변경에 함께 내려주는 장소 필드
+CHANGE_PLACE_FIELDS = (
+    'contentid', 'title', 'addr1', 'addr2', 'areacode', 'sigungucode',
+    'mapx', 'mapy', 'tel', 'firstimage', 'contenttypeid', 'cat1', 'cat2', 'cat3',
+    'overview', 'createdtime', 'modifiedtime', 'score',
+)
+
+# since 시각 형식 (TourAPI modifiedtime과 같은 YYYYMMDDHHMMSS)
+MODIFIEDTIME_FORMAT = '%Y%m%d%H%M%S'
+
+
+class ChangeLogExpired(Exception):
+    """요청한 세대의 변경 로그가 이미 정리되어 전체 재동기화가 필요한 경우"""
+
+
+def record_changes(generation, upserted_spots, deleted_contentids):
+    """세대의 변경 내역 기록 (modifiedtime은 upsert 장소의 TourAPI 값으로 참고용, 삭제는 비움)"""
+    changes = [
+        CatalogChange(
+            generation=generation,
+            contentid=spot.contentid,
+            op=CatalogChange.OP_UPSERT,
+            modifiedtime=spot.modifiedtime or '',
+        )
+        for spot in upserted_spots
+    ]
+    changes.extend(
+        CatalogChange(
+            generation=generation,
+            contentid=contentid,
+            op=CatalogChange.OP_DELETE,
+        )
+        for contentid in sorted(deleted_contentids)
+    )
+    CatalogChange.objects.bulk_create(changes, batch_size=1000)
+    return len(changes)
+
+
+def prune_changes(generation):
+    """보관 기간(세대 수)이 지난 변경 로그 삭제"""
+    oldest_kept = generation - settings.CATALOG_CHANGE_RETENTION_GENERATIONS
+    CatalogChange.objects.filter(generation__lte=oldest_kept).delete()
+
+
+def generation_at(timestamp):
+    """시각(YYYYMMDDHHMMSS, 서버 로컬 시간)까지 만들어진 마지막 세대 번호 (없으면 0)"""
+    moment = timezone.make_aware(datetime.strptime(timestamp, MODIFIEDTIME_FORMAT))
+    latest = CatalogGeneration.objects.filter(created_at__lte=moment).order_by('-pk').values_list('pk', flat=True).first()
+    return latest or 0
+
+
+def _changes_queryset(since):
+    """since 값(세대 번호 또는 시각)에 해당하는 변경 쿼리셋"""
+    since = str(since).strip()
+
+    # 14자리 숫자는 시각으로 해석해 세대 번호로 변환
+    if len(since) >= len('YYYYMMDDHHMMSS'):
+        since_generation = generation_at(since)
+    else:
+        since_generation = int(since)
+
+    # 보관 기간보다 오래된 세대는 중간 변경분이 정리되었을 수 있음
+    if since_generation < current_generation() - settings.CATALOG_CHANGE_RETENTION_GENERATIONS:
+        raise ChangeLogExpired(since_generation)
+    return CatalogChange.objects.filter(generation__gt=since_generation)
+
+
+def fetch_changes(since, cursor=0, limit=500):
+    """
+    변경분 한 페이지 조회
+    반환: (변경 목록, 다음 커서 또는 None)
+    """
+    rows = list(
+        _changes_queryset(since)
+        .filter(id__gt=cursor)
+        .order_by('id')
+        .values('id', 'generation', 'contentid', 'op', 'modifiedtime')[:limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # upsert 대상 장소의 현재 데이터를 한 번에 조회
+    upsert_ids = {row['contentid'] for row in rows if row['op'] == CatalogChange.OP_UPSERT}
+    places = {
+        place['contentid']: place
+        for place in PetTourSpot.objects.filter(contentid__in=upsert_ids).values(*CHANGE_PLACE_FIELDS)
+    }
+
+    changes = []
+    for row in rows:
+        place = places.get(row['contentid']) if row['op'] == CatalogChange.OP_UPSERT else None
+        # 이후 세대에서 삭제된 장소는 해당 삭제 변경이 뒤따르므로 place 없이 전달
+        changes.append(dict(row, place=place))
+
+    next_cursor = rows[-1]['id'] if has_more else None
+    return changes, next_cursor
+
+
+def iter_changes(since, page_size=500):
+    """변경분 전체를 페이지 단위로 조회하며 하나씩 반환 (스트리밍용)"""
+    cursor = 0
+    while True:
+        changes, next_cursor = fetch_changes(since, cursor=cursor, limit=page_size)
+        yield from changes
+        if next_cursor is None:
+            return
+        cursor = next_cursor
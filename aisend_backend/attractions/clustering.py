@@ -0,0 +1,114 @@
+"""
+지도 마커 클러스터링 (계층형 격자 인덱스)
+
+좌표를 웹 메르카토르 평면(0~1)으로 투영한 뒤, 가장 세밀한 줌의 격자 셀에 장소를 모으고
+상위 줌 셀은 하위 셀 4개를 합쳐 만듭니다. 셀 하나는 화면의 CLUSTER_CELL_PX 픽셀 정사각형입니다.
+조회는 bbox가 덮는 셀만 확인하므로 줌과 관계없이 화면 크기에 비례하는 작업량으로 끝납니다.
+
+세대가 바뀐 뒤 처음 조회할 때 다시 만듭니다 (동기화 후 자동 갱신).
+"""
+import math
+
+from .catalog import GenerationCache
+from .models import PetTourSpot
+
+# 지도 타일 크기와 클러스터 셀 크기 (픽셀)
+TILE_SIZE_PX = 256
+CLUSTER_CELL_PX = 64
+MIN_ZOOM = 0
+MAX_ZOOM = 16
+
+_MAX_LATITUDE = 85.05112878
+
+
+def project(lat, lng):
+    """위경도 → 웹 메르카토르 정규 좌표 (x, y: 0~1, y는 북쪽이 0)"""
+    lat = max(min(lat, _MAX_LATITUDE), -_MAX_LATITUDE)
+    x = (lng + 180.0) / 360.0
+    sin_lat = math.sin(math.radians(lat))
+    y = 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+    return x, y
+
+
+def cells_per_axis(zoom):
+    return (1 << zoom) * (TILE_SIZE_PX // CLUSTER_CELL_PX)
+
+
+# 클러스터 값: [개수, 위도 합, 경도 합, 대표 장소 ID, 대표 장소 점수]
+def _merge(level, cell, count, lat_sum, lng_sum, best_id, best_score):
+    cluster = level.get(cell)
+    if cluster is None:
+        level[cell] = [count, lat_sum, lng_sum, best_id, best_score]
+        return
+    cluster[0] += count
+    cluster[1] += lat_sum
+    cluster[2] += lng_sum
+    if best_score > cluster[4]:
+        cluster[3], cluster[4] = best_id, best_score
+
+
+def _cluster_dict(cluster):
+    count, lat_sum, lng_sum, best_id, _ = cluster
+    return {
+        'count': count,
+        'latitude': round(lat_sum / count, 6),
+        'longitude': round(lng_sum / count, 6),
+        # 대표 장소 (클러스터 안에서 점수가 가장 높은 장소)
+        'id': best_id,
+    }
+
+
+class ClusterIndex:
+    def __init__(self, points):
+        """points: (id, lat, lng, score) 목록"""
+        # levels[zoom] = {(cell_x, cell_y): 클러스터}
+        self.levels = [None] * (MAX_ZOOM + 1)
+
+        finest = {}
+        size = cells_per_axis(MAX_ZOOM)
+        for point_id, lat, lng, score in points:
+            if not (lat and lng):
+                continue
+            x, y = project(lat, lng)
+            cell = (min(int(x * size), size - 1), min(int(y * size), size - 1))
+            _merge(finest, cell, 1, lat, lng, point_id, score)
+        self.levels[MAX_ZOOM] = finest
+
+        # 상위 줌은 하위 셀 2x2를 합침
+        for zoom in range(MAX_ZOOM - 1, MIN_ZOOM - 1, -1):
+            level = {}
+            for (cell_x, cell_y), child in self.levels[zoom + 1].items():
+                _merge(level, (cell_x >> 1, cell_y >> 1), *child)
+            self.levels[zoom] = level
+
+    def clusters(self, min_lat, min_lng, max_lat, max_lng, zoom):
+        """bbox 안의 클러스터 목록 (셀 순서), MAX_ZOOM보다 깊은 줌은 MAX_ZOOM 격자 사용"""
+        zoom = max(MIN_ZOOM, min(int(zoom), MAX_ZOOM))
+        level = self.levels[zoom]
+        size = cells_per_axis(zoom)
+
+        left, top = project(max_lat, min_lng)
+        right, bottom = project(min_lat, max_lng)
+        x0, x1 = max(int(left * size), 0), min(int(right * size), size - 1)
+        y0, y1 = max(int(top * size), 0), min(int(bottom * size), size - 1)
+
+        # 요청 범위의 셀 수가 실제 셀 수보다 많으면 전체 셀을 걸러내는 편이 빠름
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(level):
+            cells = sorted(cell for cell in level if x0 <= cell[0] <= x1 and y0 <= cell[1] <= y1)
+        else:
+            cells = [(x, y) for y in range(y0, y1 + 1) for x in range(x0, x1 + 1) if (x, y) in level]
+
+        return [_cluster_dict(level[cell]) for cell in cells]
+
+
+def build_cluster_index():
+    rows = PetTourSpot.objects.values_list('contentid', 'mapy', 'mapx', 'score').iterator(chunk_size=2000)
+    return ClusterIndex(rows)
+
+
+_cluster_index = GenerationCache(build_cluster_index)
+
+
+def get_clusters(min_lat, min_lng, max_lat, max_lng, zoom):
+    """현재 카탈로그 세대의 bbox/줌 클러스터"""
+    return _cluster_index.get().clusters(min_lat, min_lng, max_lat, max_lng, zoom)
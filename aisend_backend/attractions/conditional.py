@@ -0,0 +1,97 @@
+"""
+카탈로그 조회 API용 조건부 GET(ETag / If-None-Match) 지원
+
+ETag는 카탈로그 세대 + 경로 + 쿼리 파라미터로만 계산하므로,
+클라이언트가 가진 데이터가 최신이면 DB 조회나 직렬화 없이 304를 반환합니다.
+"""
+import hashlib
+
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
+
+from .catalog import current_generation, bump_generation
+from .changes import record_changes
+
+
+def catalog_etag(request, view_name, view_kwargs, version=None):
+    """카탈로그 세대(또는 뷰가 지정한 데이터 버전)와 요청 파라미터로부터 강한(strong) ETag 생성"""
+    query_items = sorted(
+        (key, value)
+        for key in request.GET.keys()
+        for value in request.GET.getlist(key)
+    )
+    parts = [
+        str(current_generation() if version is None else version),
+        view_name,
+        request.path,
+        repr(sorted(view_kwargs.items())),
+        repr(query_items),
+        request.META.get('HTTP_ACCEPT', ''),
+    ]
+    digest = hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()
+    return quote_etag(digest)
+
+
+class CatalogConditionalMixin:
+    """
+    GET/HEAD 요청에 ETag, Cache-Control 헤더를 붙이고 If-None-Match가 일치하면 304 반환.
+    카탈로그 데이터만 응답하는 조회 뷰에만 사용합니다 (외부 API 결과가 섞이는 검색 뷰에는 사용하지 않음).
+    """
+    cache_max_age = None
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+
+        etag = catalog_etag(request, self.__class__.__name__, kwargs, self.get_etag_version())
+
+        # If-None-Match는 약한 비교 (압축 미들웨어가 붙인 W/ 접두사 무시)
+        client_etags = [tag.removeprefix('W/') for tag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))]
+        if etag in client_etags:
+            response = HttpResponseNotModified()
+            self._set_cache_headers(response, etag)
+            return response
+
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200:
+            self._set_cache_headers(response, etag)
+        return response
+
+    def get_etag_version(self):
+        """ETag에 넣을 데이터 버전 - 응답이 카탈로그 세대가 아닌 다른 버전을 따르면 재정의"""
+        return current_generation()
+
+    def _set_cache_headers(self, response, etag):
+        max_age = self.cache_max_age if self.cache_max_age is not None else settings.CATALOG_CACHE_MAX_AGE
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, max_age=max_age)
+
+
+class CatalogWriteMixin:
+    """
+    generic 뷰에서 카탈로그 모델을 실제로 생성/수정/삭제했을 때만 카탈로그 세대를 올리고 변경 로그에 기록
+    (기존 ETag와 세대별 파생 인덱스 무효화, 변경 피드 클라이언트에 전달)
+    """
+
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            super().perform_create(serializer)
+            self._record_write('create', upserted=[serializer.instance])
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            super().perform_update(serializer)
+            self._record_write('update', upserted=[serializer.instance])
+
+    def perform_destroy(self, instance):
+        contentid = instance.contentid
+        with transaction.atomic():
+            super().perform_destroy(instance)
+            self._record_write('destroy', deleted=[contentid])
+
+    def _record_write(self, action, upserted=(), deleted=()):
+        generation = bump_generation(reason=f'{self.__class__.__name__} {action}')
+        record_changes(generation, upserted, deleted)
@@ -0,0 +1,58 @@
+"""
+카탈로그 전체 스트리밍 내보내기
+
+MySQL 드라이버는 서버 측 커서를 지원하지 않아 QuerySet.iterator()도 결과 전체를 메모리에 올리므로,
+id 기준 키셋 조회(`id > 마지막 id LIMIT n`)를 반복해 테이블 크기와 무관하게 일정한 메모리로 읽습니다.
+"""
+import orjson
+
+EXPORT_CHUNK_SIZE = 1000
+
+
+def export_field_names(model):
+    """내보내기 가능한 필드 이름 목록"""
+    return [field.attname for field in model._meta.concrete_fields]
+
+
+def iter_rows(queryset, fields, chunk_size=EXPORT_CHUNK_SIZE):
+    """id 키셋 페이지 단위로 행(dict)을 하나씩 반환"""
+    value_fields = list(fields)
+    if 'id' not in value_fields:
+        value_fields.append('id')
+
+    last_id = None
+    while True:
+        chunk = queryset.order_by('id')
+        if last_id is not None:
+            chunk = chunk.filter(id__gt=last_id)
+        rows = list(chunk.values(*value_fields)[:chunk_size])
+        if not rows:
+            return
+
+        last_id = rows[-1]['id']
+        for row in rows:
+            if 'id' not in fields:
+                del row['id']
+            yield row
+
+        if len(rows) < chunk_size:
+            return
+
+
+def iter_ndjson(rows):
+    """한 줄에 한 행씩 NDJSON 바이트 생성"""
+    for row in rows:
+        yield orjson.dumps(row) + b'\n'
+
+
+def iter_json_array(rows):
+    """JSON 배열을 조각 단위로 생성"""
+    yield b'['
+    first = True
+    for row in rows:
+        if first:
+            first = False
+            yield orjson.dumps(row)
+        else:
+            yield b',' + orjson.dumps(row)
+    yield b']'
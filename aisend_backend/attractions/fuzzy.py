@@ -0,0 +1,125 @@
+"""
+오타 허용 장소명 검색 (자모 n-gram 인덱스)
+
+장소명을 자모 단위로 풀어쓴 뒤 3-gram 역색인을 만들고,
+검색어와 공유하는 n-gram 수로 후보를 추린 다음 편집 거리로 순위를 매깁니다.
+"제주숩길"처럼 받침/모음 하나가 틀린 검색어도 "제주 숲길"을 찾습니다.
+
+- 편집 거리는 검색어가 장소명의 일부와 일치하는 정도(부분 문자열 편집 거리)로 계산
+- q-gram 보조정리로 최소 공유 n-gram 수를 정해, 거리 계산 대상 후보 수를 제한
+"""
+import heapq
+from collections import Counter, defaultdict
+
+from .catalog import GenerationCache
+from .hangul import decompose
+from .models import PetTourSpot
+from .resolution import normalize_name
+
+NGRAM_SIZE = 3
+# 편집 거리를 계산할 최대 후보 수
+MAX_CANDIDATES = 64
+
+
+def to_jamo_key(text):
+    """비교용 자모 문자열 (정규화된 이름을 자모로 풀어씀)"""
+    return decompose(normalize_name(text))
+
+
+def ngrams(jamo):
+    if len(jamo) < NGRAM_SIZE:
+        return {jamo} if jamo else set()
+    return {jamo[i:i + NGRAM_SIZE] for i in range(len(jamo) - NGRAM_SIZE + 1)}
+
+
+def max_distance_for(jamo):
+    """검색어 길이에 따른 허용 오타 수 (자모 기준)"""
+    if len(jamo) <= 6:
+        return 1
+    if len(jamo) <= 15:
+        return 2
+    return 3
+
+
+def substring_distance(query, text, max_distance):
+    """
+    query가 text의 어느 부분과 가장 가깝게 일치할 때의 편집 거리
+    max_distance를 넘는 것이 확실해지면 중단하고 max_distance + 1 반환
+    """
+    # 행: query 위치, 열: text 위치 (첫 행 0 → text 어디서든 일치 시작 가능)
+    previous = [0] * (len(text) + 1)
+    for i, q_char in enumerate(query, 1):
+        current = [i]
+        for j, t_char in enumerate(text, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (q_char != t_char),
+            ))
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return min(previous)
+
+
+class FuzzyIndex:
+    def __init__(self, entries):
+        """entries: (키, 이름, 가중치) 목록"""
+        self.keys = []
+        self.jamo = []
+        self.weights = []
+        self._postings = defaultdict(list)
+
+        for key, name, weight in entries:
+            jamo = to_jamo_key(name)
+            if not jamo:
+                continue
+            entry_id = len(self.keys)
+            self.keys.append(key)
+            self.jamo.append(jamo)
+            self.weights.append(weight)
+            for gram in ngrams(jamo):
+                self._postings[gram].append(entry_id)
+
+    def search(self, query, limit=10):
+        """(키, 편집 거리) 목록 - 거리가 가까운 순, 같으면 가중치 높은 순"""
+        query_jamo = to_jamo_key(query)
+        if not query_jamo:
+            return []
+
+        max_distance = max_distance_for(query_jamo)
+        query_grams = ngrams(query_jamo)
+        # 오타 하나는 최대 NGRAM_SIZE개의 n-gram을 깨뜨림
+        min_shared = max(1, len(query_grams) - max_distance * NGRAM_SIZE)
+
+        shared = Counter()
+        for gram in query_grams:
+            shared.update(self._postings.get(gram, ()))
+
+        candidates = heapq.nlargest(
+            MAX_CANDIDATES,
+            (entry_id for entry_id, count in shared.items() if count >= min_shared),
+            key=lambda entry_id: (shared[entry_id], self.weights[entry_id]),
+        )
+
+        matches = []
+        for entry_id in candidates:
+            distance = substring_distance(query_jamo, self.jamo[entry_id], max_distance)
+            if distance <= max_distance:
+                matches.append((distance, -self.weights[entry_id], entry_id))
+
+        matches.sort()
+        return [(self.keys[entry_id], distance) for distance, _, entry_id in matches[:limit]]
+
+
+def build_fuzzy_index():
+    rows = PetTourSpot.objects.values_list('id', 'title', 'score').iterator(chunk_size=2000)
+    return FuzzyIndex(rows)
+
+
+_fuzzy_index = GenerationCache(build_fuzzy_index)
+
+
+def fuzzy_search_spots(query, limit=10):
+    """오타를 허용해 PetTourSpot ID 목록 검색 (가까운 순)"""
+    return [spot_id for spot_id, _ in _fuzzy_index.get().search(query, limit)]
@@ -0,0 +1,205 @@
+"""
+오프라인 지명 사전(gazetteer)
+
+자유 입력 지역명("서귀포", "제주특별자치도 서귀포시", "부산 해운대")을
+TourAPI areacode / sigungucode와 좌표 범위(bbox), 중심점으로 변환합니다.
+
+- 시/도(areacode) 이름과 별칭은 고정 테이블
+- 시/군/구(sigungucode) 이름, bbox, 중심점은 카탈로그 주소/좌표에서 학습
+- 카탈로그 세대가 바뀌면 처음 조회할 때 다시 만듭니다 (조회 자체는 dict 조회)
+"""
+import math
+from collections import Counter, defaultdict, namedtuple
+
+from .catalog import GenerationCache
+from .models import PetTourSpot
+
+# bbox를 신뢰하기 위한 최소 좌표 수
+MIN_POINTS_FOR_BBOX = 5
+
+# TourAPI 지역코드 → (정식 명칭, 별칭들)
+AREA_CODES = {
+    '1': ('서울특별시', ('서울', '서울시')),
+    '2': ('인천광역시', ('인천', '인천시')),
+    '3': ('대전광역시', ('대전', '대전시')),
+    '4': ('대구광역시', ('대구', '대구시')),
+    '5': ('광주광역시', ('광주', '광주시')),
+    '6': ('부산광역시', ('부산', '부산시')),
+    '7': ('울산광역시', ('울산', '울산시')),
+    '8': ('세종특별자치시', ('세종', '세종시')),
+    '31': ('경기도', ('경기',)),
+    '32': ('강원특별자치도', ('강원', '강원도')),
+    '33': ('충청북도', ('충북',)),
+    '34': ('충청남도', ('충남',)),
+    '35': ('경상북도', ('경북',)),
+    '36': ('경상남도', ('경남',)),
+    '37': ('전북특별자치도', ('전북', '전라북도')),
+    '38': ('전라남도', ('전남',)),
+    '39': ('제주특별자치도', ('제주', '제주도')),
+}
+
+Region = namedtuple('Region', ['areacode', 'sigungucode', 'name', 'bbox', 'centroid'])
+# bbox: (min_lat, min_lng, max_lat, max_lng), centroid: (lat, lng) - 좌표가 부족하면 None
+
+
+def _compact(text):
+    return ''.join((text or '').split())
+
+
+def _sigungu_aliases(name):
+    """'서귀포시' → ['서귀포시', '서귀포'] (접미사 시/군/구 제거 별칭 포함)"""
+    aliases = [name]
+    if len(name) > 2 and name[-1] in '시군구':
+        aliases.append(name[:-1])
+    return aliases
+
+
+class _Bounds:
+    """좌표 범위/중심 누적"""
+
+    def __init__(self):
+        self.count = 0
+        self.lat_sum = self.lng_sum = 0.0
+        self.min_lat = self.min_lng = math.inf
+        self.max_lat = self.max_lng = -math.inf
+
+    def add(self, lat, lng):
+        self.count += 1
+        self.lat_sum += lat
+        self.lng_sum += lng
+        self.min_lat = min(self.min_lat, lat)
+        self.max_lat = max(self.max_lat, lat)
+        self.min_lng = min(self.min_lng, lng)
+        self.max_lng = max(self.max_lng, lng)
+
+    def bbox(self):
+        if self.count < MIN_POINTS_FOR_BBOX:
+            return None
+        return (self.min_lat, self.min_lng, self.max_lat, self.max_lng)
+
+    def centroid(self):
+        if self.count == 0:
+            return None
+        return (self.lat_sum / self.count, self.lng_sum / self.count)
+
+
+class Gazetteer:
+    def __init__(self, rows):
+        """rows: (areacode, sigungucode, addr1, lat, lng) 목록"""
+        area_bounds = defaultdict(_Bounds)
+        sigungu_bounds = defaultdict(_Bounds)
+        sigungu_names = defaultdict(Counter)
+
+        for areacode, sigungucode, addr1, lat, lng in rows:
+            if not areacode:
+                continue
+            has_coords = bool(lat and lng)
+            if has_coords:
+                area_bounds[areacode].add(lat, lng)
+            if not sigungucode:
+                continue
+            tokens = (addr1 or '').split()
+            if len(tokens) >= 2:
+                sigungu_names[(areacode, sigungucode)][tokens[1]] += 1
+            if has_coords:
+                sigungu_bounds[(areacode, sigungucode)].add(lat, lng)
+
+        self.areas = {}
+        self._area_aliases = {}
+        for areacode, (name, aliases) in AREA_CODES.items():
+            bounds = area_bounds.get(areacode, _Bounds())
+            self.areas[areacode] = Region(areacode, None, name, bounds.bbox(), bounds.centroid())
+            for alias in (name, *aliases):
+                self._area_aliases[alias] = areacode
+
+        self.sigungus = {}
+        # 별칭 → [(areacode, sigungucode)] (중구/동구처럼 여러 시도에 같은 이름이 있을 수 있음)
+        self._sigungu_aliases = defaultdict(list)
+        for (areacode, sigungucode), names in sigungu_names.items():
+            name = names.most_common(1)[0][0]
+            bounds = sigungu_bounds.get((areacode, sigungucode), _Bounds())
+            self.sigungus[(areacode, sigungucode)] = Region(areacode, sigungucode, name, bounds.bbox(), bounds.centroid())
+            for alias in _sigungu_aliases(name):
+                self._sigungu_aliases[alias].append((areacode, sigungucode))
+
+        # 공백 없는 입력("부산해운대")용 별칭 목록 (긴 것 우선)
+        self._all_aliases = sorted(set(self._area_aliases) | set(self._sigungu_aliases), key=len, reverse=True)
+
+    def _match_sigungu(self, alias, areacode):
+        candidates = self._sigungu_aliases.get(alias, [])
+        if areacode:
+            candidates = [c for c in candidates if c[0] == areacode]
+        # 시도 없이 여러 곳에 해당하는 이름은 판단하지 않음
+        return candidates[0] if len(candidates) == 1 else None
+
+    def resolve(self, text):
+        """지역명을 Region으로 변환 (알 수 없으면 None)"""
+        tokens = (text or '').split()
+        if len(tokens) == 1:
+            tokens = self._split_compact(tokens[0])
+
+        areacode = None
+        sigungu_key = None
+        for token in tokens:
+            if areacode is None and token in self._area_aliases:
+                areacode = self._area_aliases[token]
+                continue
+            if sigungu_key is None:
+                sigungu_key = self._match_sigungu(token, areacode)
+
+        if sigungu_key is not None:
+            if areacode is None or areacode == sigungu_key[0]:
+                return self.sigungus[sigungu_key]
+        if areacode is not None:
+            return self.areas[areacode]
+        return None
+
+    def _split_compact(self, text):
+        """공백 없는 입력을 알려진 별칭 단위로 분리 ("부산해운대" → ["부산", "해운대"])"""
+        tokens = []
+        rest = _compact(text)
+        while rest:
+            for alias in self._all_aliases:
+                if rest.startswith(alias):
+                    tokens.append(alias)
+                    rest = rest[len(alias):]
+                    break
+            else:
+                # 알려진 별칭으로 시작하지 않으면 원문 그대로 사용
+                return tokens + [rest] if tokens else [text]
+        return tokens
+
+
+def build_gazetteer():
+    rows = PetTourSpot.objects.values_list('areacode', 'sigungucode', 'addr1', 'mapy', 'mapx').iterator(chunk_size=2000)
+    return Gazetteer(rows)
+
+
+_gazetteer = GenerationCache(build_gazetteer)
+
+
+def get_gazetteer():
+    """현재 카탈로그 세대의 지명 사전 (세대가 바뀌었으면 다시 생성)"""
+    return _gazetteer.get()
+
+
+def resolve_location(text):
+    """지역명 → Region (알 수 없으면 None)"""
+    return get_gazetteer().resolve(text)
+
+
+def radius_for_region(region, max_radius=20000):
+    """Region bbox를 덮는 카카오 검색 반경 (m, 카카오 최대 20km)"""
+    if region.bbox is None:
+        return max_radius
+    min_lat, min_lng, max_lat, max_lng = region.bbox
+    half_height = (max_lat - min_lat) * 111000 / 2
+    half_width = (max_lng - min_lng) * 111000 * math.cos(math.radians((min_lat + max_lat) / 2)) / 2
+    return int(min(max(math.hypot(half_height, half_width), 1000), max_radius))
+
+
+def code_filter(region):
+    """Region 지역코드 조건 (areacode/sigungucode 동등 비교 kwargs)"""
+    if region.sigungucode:
+        return {'areacode': region.areacode, 'sigungucode': region.sigungucode}
+    return {'areacode': region.areacode}
@@ -0,0 +1,51 @@
+"""
+한글 자모 처리 유틸리티
+
+완성형 음절(가~힣)을 초성/중성/종성으로 분해합니다.
+초성 검색("ㅈㅈ" → 제주)과 오타 허용 검색(자모 n-gram)에 사용합니다.
+"""
+
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+JUNGSEONG_COUNT = 21
+JONGSEONG_COUNT = 28
+
+# 호환 자모 (키보드 입력과 같은 문자)
+CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+JUNGSEONG = 'ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ'
+JONGSEONG = ' ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ'
+
+_CHOSEONG_SET = frozenset(CHOSEONG)
+
+
+def is_syllable(char):
+    return HANGUL_BASE <= ord(char) <= HANGUL_LAST
+
+
+def split_syllable(char):
+    """완성형 음절 → (초성, 중성, 종성) 호환 자모 (종성이 없으면 '')"""
+    offset = ord(char) - HANGUL_BASE
+    cho, rest = divmod(offset, JUNGSEONG_COUNT * JONGSEONG_COUNT)
+    jung, jong = divmod(rest, JONGSEONG_COUNT)
+    return CHOSEONG[cho], JUNGSEONG[jung], JONGSEONG[jong].strip()
+
+
+def to_choseong(text):
+    """음절을 초성으로 바꾼 문자열 ("제주 카페" → "ㅈㅈ ㅋㅍ"), 한글이 아닌 문자는 그대로"""
+    return ''.join(split_syllable(char)[0] if is_syllable(char) else char for char in text)
+
+
+def is_choseong_query(text):
+    """초성만으로 이루어진 입력인지 여부"""
+    return bool(text) and all(char in _CHOSEONG_SET for char in text)
+
+
+def decompose(text):
+    """음절을 자모 단위로 풀어쓴 문자열 ("제주" → "ㅈㅔㅈㅜ")"""
+    jamo = []
+    for char in text:
+        if is_syllable(char):
+            jamo.extend(split_syllable(char))
+        else:
+            jamo.append(char)
+    return ''.join(jamo)
@@ -0,0 +1,162 @@
+"""
+카카오 장소 검색 결과 write-through 저장소
+
+카카오 API 응답 문서를 KakaoPlace(카카오 ID 기준)로 upsert하고,
+검색어별 결과 ID 목록을 KakaoSearch에 신선도(fetched_at)와 함께 저장합니다.
+
+- 저장된 적 없는 검색: 카카오 API 호출 후 저장
+- 신선한 검색: DB에서 바로 응답
+- 오래된 검색: DB 결과로 먼저 응답하고 백그라운드에서 카카오 결과 갱신
+"""
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .models import KakaoPlace, KakaoSearch, PetTourSpot
+from .resolution import EntityIndex, GRID_CELL_DEG
+from .scoring import score_kakao_document
+from .upsert import bulk_upsert
+
+logger = logging.getLogger(__name__)
+
+# 카카오 문서 ↔ KakaoPlace 필드 매핑
+DOCUMENT_FIELDS = (
+    'place_name', 'category_name', 'category_group_code', 'phone',
+    'address_name', 'road_address_name', 'place_url',
+)
+
+_refresh_executor = ThreadPoolExecutor(max_workers=settings.KAKAO_REFRESH_WORKERS, thread_name_prefix='kakao-refresh')
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+def make_query_key(query, x=None, y=None, radius=None, size=15):
+    """검색 조건 키 (좌표는 약 100m 단위로 반올림해 근접 요청을 같은 키로 묶음)"""
+    if x is not None and y is not None:
+        location = f'{round(float(x), 3)},{round(float(y), 3)},{radius}'
+    else:
+        location = ''
+    raw = f'{query.strip()}|{location}|{size}'
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def upsert_documents(documents, fetched_at=None):
+    """카카오 문서를 KakaoPlace로 저장 (이미 있으면 갱신)"""
+    fetched_at = fetched_at or timezone.now()
+    places = []
+    for document in documents:
+        if not (document.get('id') and document.get('x') and document.get('y')):
+            continue
+        places.append(KakaoPlace(
+            kakao_id=document['id'],
+            x=float(document['x']),
+            y=float(document['y']),
+            score=score_kakao_document(document),
+            fetched_at=fetched_at,
+            **{field: (document.get(field) or '')[:255] for field in DOCUMENT_FIELDS},
+        ))
+
+    _resolve_catalog_matches(places)
+
+    bulk_upsert(
+        KakaoPlace,
+        places,
+        unique_field='kakao_id',
+        update_fields=[*DOCUMENT_FIELDS, 'x', 'y', 'score', 'fetched_at', 'matched_contentid'],
+    )
+    return [place.kakao_id for place in places]
+
+
+def _resolve_catalog_matches(places):
+    """저장 시점에 카카오 장소와 같은 카탈로그 장소(PetTourSpot)를 찾아 matched_contentid 기록"""
+    if not places:
+        return
+
+    margin = GRID_CELL_DEG * 2
+    spots = PetTourSpot.objects.filter(
+        mapy__gte=min(p.y for p in places) - margin,
+        mapy__lte=max(p.y for p in places) + margin,
+        mapx__gte=min(p.x for p in places) - margin,
+        mapx__lte=max(p.x for p in places) + margin,
+    ).values_list('contentid', 'title', 'mapy', 'mapx')
+
+    index = EntityIndex()
+    for contentid, title, lat, lng in spots:
+        index.add(contentid, title, lat, lng)
+
+    for place in places:
+        place.matched_contentid = index.find(place.place_name, place.y, place.x) or ''
+
+
+def place_to_document(place):
+    """KakaoPlace를 카카오 API 응답 문서 형태로 변환"""
+    document = {field: getattr(place, field) for field in DOCUMENT_FIELDS}
+    document.update({
+        'id': place.kakao_id,
+        'x': str(place.x),
+        'y': str(place.y),
+    })
+    return document
+
+
+def _stored_documents(place_ids):
+    places = {p.kakao_id: p for p in KakaoPlace.objects.filter(kakao_id__in=place_ids)}
+    return [place_to_document(places[pid]) for pid in place_ids if pid in places]
+
+
+def _fetch_and_store(kakao_service, query_key, query, params):
+    """카카오 API 호출 후 결과 저장, 응답 반환"""
+    result = kakao_service.search_places(query=query, **params)
+
+    # 정상 응답(meta 포함)만 저장 - 오류 시 빈 결과가 캐시되지 않도록
+    if 'meta' in result:
+        now = timezone.now()
+        place_ids = upsert_documents(result.get('documents', []), fetched_at=now)
+        KakaoSearch.objects.update_or_create(
+            query_key=query_key,
+            defaults={'query': query[:255], 'place_ids': place_ids, 'fetched_at': now},
+        )
+    return result
+
+
+def _refresh_in_background(kakao_service, query_key, query, params):
+    with _refreshing_lock:
+        if query_key in _refreshing:
+            return
+        _refreshing.add(query_key)
+
+    def task():
+        try:
+            _fetch_and_store(kakao_service, query_key, query, params)
+        except Exception as e:
+            logger.error(f"카카오 검색 결과 갱신 오류: {str(e)}")
+        finally:
+            close_old_connections()
+            with _refreshing_lock:
+                _refreshing.discard(query_key)
+
+    _refresh_executor.submit(task)
+
+
+def search_places_cached(kakao_service, query, x=None, y=None, radius=20000, size=15):
+    """
+    KakaoApiService.search_places와 같은 형태의 결과를 반환하되,
+    저장된 결과가 있으면 DB에서 응답하고 오래된 결과는 백그라운드에서 갱신
+    """
+    params = {'x': x, 'y': y, 'radius': radius, 'size': size}
+    query_key = make_query_key(query, x=x, y=y, radius=radius, size=size)
+
+    stored = KakaoSearch.objects.filter(query_key=query_key).first()
+    if stored is None:
+        return _fetch_and_store(kakao_service, query_key, query, params)
+
+    if stored.fetched_at < timezone.now() - timedelta(hours=settings.KAKAO_STORE_TTL_HOURS):
+        _refresh_in_background(kakao_service, query_key, query, params)
+
+    return {'documents': _stored_documents(stored.place_ids)}
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attractions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pettourspot',
+            name='score',
+            field=models.FloatField(db_index=True, default=0.0),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attractions', '0003_catalog_generation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('generation', models.IntegerField(db_index=True)),
+                ('contentid', models.CharField(max_length=32)),
+                ('op', models.CharField(choices=[('upsert', '추가/수정'), ('delete', '삭제')], max_length=10)),
+                ('modifiedtime', models.CharField(blank=True, db_index=True, max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attractions', '0004_catalog_change'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KakaoPlace',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kakao_id', models.CharField(max_length=32, unique=True)),
+                ('place_name', models.CharField(max_length=255)),
+                ('category_name', models.CharField(blank=True, max_length=255)),
+                ('category_group_code', models.CharField(blank=True, max_length=10)),
+                ('phone', models.CharField(blank=True, max_length=100)),
+                ('address_name', models.CharField(blank=True, max_length=255)),
+                ('road_address_name', models.CharField(blank=True, max_length=255)),
+                ('place_url', models.CharField(blank=True, max_length=255)),
+                ('x', models.FloatField()),
+                ('y', models.FloatField()),
+                ('score', models.FloatField(db_index=True, default=0.0)),
+                ('fetched_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='KakaoSearch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('query_key', models.CharField(max_length=40, unique=True)),
+                ('query', models.CharField(max_length=255)),
+                ('place_ids', models.JSONField(default=list)),
+                ('fetched_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attractions', '0005_kakao_place_store'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='kakaoplace',
+            name='matched_contentid',
+            field=models.CharField(blank=True, db_index=True, max_length=32),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attractions', '0006_kakaoplace_matched_contentid'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pettourspot',
+            index=models.Index(fields=['areacode', 'sigungucode'], name='spot_area_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pettourspot',
+            index=models.Index(fields=['mapy', 'mapx'], name='spot_coords_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attractions', '0007_pettourspot_region_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpotNeighbors',
+            fields=[
+                ('spot', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='neighbors', serialize=False, to='attractions.pettourspot')),
+                ('generation', models.IntegerField()),
+                ('neighbors', models.JSONField(default=dict)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -1,6 +1,10 @@
 from django.db import models
 
 class PetTourSpot(models.Model):
+    # TourAPI 콘텐츠 타입 (contenttypeid)
+    CONTENT_TYPE_ATTRACTION = '12'
+    CONTENT_TYPE_FOOD = '39'
+
     contentid = models.CharField(max_length=32, unique=True)
     title = models.CharField(max_length=255)
     addr1 = models.CharField(max_length=255, blank=True)
@@ -18,6 +22,119 @@ class PetTourSpot(models.Model):
     overview = models.TextField(blank=True)
     createdtime = models.CharField(max_length=20, blank=True)
     modifiedtime = models.CharField(max_length=20, blank=True)
+    # 동기화 시 미리 계산되는 인기도/품질 점수 (attractions.scoring 참고)
+    score = models.FloatField(default=0.0, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['areacode', 'sigungucode'], name='spot_area_idx'),
+            models.Index(fields=['mapy', 'mapx'], name='spot_coords_idx'),
+        ]
 
     def __str__(self):
         return f'{self.title} ({self.contentid})'
+
+
+class CatalogGeneration(models.Model):
+    """카탈로그 세대 (동기화나 데이터 변경 시마다 1씩 증가, pk가 세대 번호)"""
+    reason = models.CharField(max_length=50, blank=True)
+    spot_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'generation {self.pk} ({self.reason})'
+
+
+class CatalogChange(models.Model):
+    """카탈로그 변경 로그 (동기화 시 upsert/삭제를 기록, 클라이언트 증분 동기화용)"""
+    OP_UPSERT = 'upsert'
+    OP_DELETE = 'delete'
+    OP_CHOICES = [
+        (OP_UPSERT, '추가/수정'),
+        (OP_DELETE, '삭제'),
+    ]
+
+    generation = models.IntegerField(db_index=True)
+    contentid = models.CharField(max_length=32)
+    op = models.CharField(max_length=10, choices=OP_CHOICES)
+    modifiedtime = models.CharField(max_length=20, blank=True, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f'{self.generation} {self.op} {self.contentid}'
+
+
+class KakaoPlace(models.Model):
+    """카카오 장소 검색 결과 로컬 저장소 (카카오 장소 ID 기준 upsert)"""
+    kakao_id = models.CharField(max_length=32, unique=True)
+    place_name = models.CharField(max_length=255)
+    category_name = models.CharField(max_length=255, blank=True)
+    category_group_code = models.CharField(max_length=10, blank=True)
+    phone = models.CharField(max_length=100, blank=True)
+    address_name = models.CharField(max_length=255, blank=True)
+    road_address_name = models.CharField(max_length=255, blank=True)
+    place_url = models.CharField(max_length=255, blank=True)
+    x = models.FloatField()
+    y = models.FloatField()
+    score = models.FloatField(default=0.0, db_index=True)
+    fetched_at = models.DateTimeField(db_index=True)
+    # 같은 장소로 판별된 PetTourSpot.contentid (attractions.resolution 참고)
+    matched_contentid = models.CharField(max_length=32, blank=True, db_index=True)
+
+    def __str__(self):
+        return f'{self.place_name} ({self.kakao_id})'
+
+
+class KakaoSearch(models.Model):
+    """카카오 검색 요청별 결과 (검색어+좌표+반경 → 카카오 장소 ID 목록)"""
+    query_key = models.CharField(max_length=40, unique=True)
+    query = models.CharField(max_length=255)
+    place_ids = models.JSONField(default=list)
+    fetched_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f'{self.query} ({len(self.place_ids)}건)'
+
+
+class SpotNeighbors(models.Model):
+    """
+    장소별 카테고리(contenttypeid)별 가까운 장소 목록 (야간 배치로 미리 계산, attractions.neighbors 참고)
+    neighbors: {"<contenttypeid>": [[PetTourSpot pk, 거리(m)], ...]} - 가까운 순
+    """
+    spot = models.OneToOneField(PetTourSpot, on_delete=models.CASCADE, primary_key=True, related_name='neighbors')
+    generation = models.IntegerField()
+    neighbors = models.JSONField(default=dict)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.spot_id} neighbors (generation {self.generation})'
+
+
+class TripPlanJob(models.Model):
+    """
+    비동기 여행 계획 작업 (attractions.plan_jobs 참고)
+    ID는 계획 키(요청 값 + 카탈로그 세대 해시)라서 같은 요청을 다시 보내면 같은 작업을 돌려받음
+    progress: {"step": 단계, "completed_days": n, "total_days": n, "days": [완성된 일별 계획, ...]}
+    """
+    STATUS_CHOICES = [
+        ('pending', '대기'),
+        ('running', '진행 중'),
+        ('done', '완료'),
+        ('failed', '실패'),
+    ]
+
+    id = models.CharField(max_length=64, primary_key=True)
+    kind = models.CharField(max_length=20)
+    params = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending', db_index=True)
+    progress = models.JSONField(default=dict)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.kind} {self.id} ({self.status})'
@@ -0,0 +1,165 @@
+"""
+장소별 근접 장소(k-최근접 이웃) 목록 미리 계산
+
+모든 PetTourSpot에 대해 카테고리(contenttypeid)별로 가장 가까운 k곳을 계산해
+SpotNeighbors에 저장합니다 (야간 배치: compute_spot_neighbors 명령).
+조회는 장소 pk로 한 행만 읽으면 되므로 카카오 재검색이나 후보 전체 스캔이 필요 없습니다.
+
+계산은 카테고리별 격자(밀도에 맞춘 셀 크기) 셀 단위로 묶어서 합니다.
+같은 셀의 장소들에 대해 주변 (2r+1)x(2r+1) 셀의 후보와의 거리를 한 번에 계산하고,
+k번째 거리가 r셀 거리 이내로 확정되지 않은 장소만 범위를 두 배로 넓혀 다시 계산합니다.
+"""
+import math
+from collections import defaultdict
+
+import numpy as np
+from django.db import transaction
+
+from .models import PetTourSpot, SpotNeighbors
+from .spatial import METERS_PER_DEG_LAT, METERS_PER_DEG_LNG_EQUATOR
+from .upsert import bulk_upsert
+
+NEIGHBOR_K = 10
+# 이보다 먼 장소는 근처로 보지 않음 (m)
+NEIGHBOR_MAX_DISTANCE_M = 20000
+# 카테고리별 격자 셀 크기 범위 (도)
+MIN_CELL_DEG = 0.005
+MAX_CELL_DEG = 0.5
+
+UNKNOWN_CATEGORY = '0'
+
+
+def _distance_matrix(lat1, lng1, lat2, lng2):
+    """근거리용 근사 거리 행렬 (m, 등장방형 투영)"""
+    mean_lat = np.radians((lat1[:, None] + lat2[None, :]) / 2)
+    dx = (lng1[:, None] - lng2[None, :]) * METERS_PER_DEG_LNG_EQUATOR * np.cos(mean_lat)
+    dy = (lat1[:, None] - lat2[None, :]) * METERS_PER_DEG_LAT
+    return np.hypot(dx, dy)
+
+
+def _cell_size_deg(lat, lng, count, k):
+    """카테고리 밀도에 맞춘 셀 크기 - 주변 3x3 셀에 평균 k곳 정도가 들어가도록"""
+    area = max((lat.max() - lat.min()) * (lng.max() - lng.min()), MIN_CELL_DEG ** 2)
+    return float(min(max(math.sqrt(area * k / (9 * count)), MIN_CELL_DEG), MAX_CELL_DEG))
+
+
+def compute_neighbors(points, k=NEIGHBOR_K, max_distance_m=NEIGHBOR_MAX_DISTANCE_M):
+    """
+    points: (pk, lat, lng, category) 목록
+    결과: {pk: {category: [[이웃 pk, 거리 m], ...]}} (자기 자신 제외, 가까운 순)
+    """
+    points = [p for p in points if p[1] and p[2]]
+    if not points:
+        return {}
+    pks = np.array([p[0] for p in points], dtype=np.int64)
+    lat = np.array([p[1] for p in points], dtype=np.float64)
+    lng = np.array([p[2] for p in points], dtype=np.float64)
+    categories = np.array([p[3] or UNKNOWN_CATEGORY for p in points])
+    max_abs_lat = float(np.abs(lat).max())
+
+    result = {int(pk): {} for pk in pks}
+    for category in np.unique(categories):
+        members = np.nonzero(categories == category)[0]
+        cell_deg = _cell_size_deg(lat[members], lng[members], len(members), k)
+        # r셀 떨어진 장소까지의 최소 거리는 r * cell_min_m
+        cell_min_m = cell_deg * min(METERS_PER_DEG_LAT,
+                                    METERS_PER_DEG_LNG_EQUATOR * math.cos(math.radians(max_abs_lat + cell_deg)))
+        max_ring = max(1, math.ceil(max_distance_m / cell_min_m))
+
+        cell_row = np.floor(lat / cell_deg).astype(np.int64)
+        cell_col = np.floor(lng / cell_deg).astype(np.int64)
+
+        category_cells = defaultdict(list)
+        for i in members.tolist():
+            category_cells[(cell_row[i], cell_col[i])].append(i)
+        category_cells = {cell: np.array(indices) for cell, indices in category_cells.items()}
+
+        query_cells = defaultdict(list)
+        for i, cell in enumerate(zip(cell_row.tolist(), cell_col.tolist())):
+            query_cells[cell].append(i)
+
+        for (row, col), query_indices in query_cells.items():
+            pending = np.array(query_indices)
+            ring = 1
+            while len(pending):
+                blocks = [
+                    category_cells[(row + d_row, col + d_col)]
+                    for d_row in range(-ring, ring + 1)
+                    for d_col in range(-ring, ring + 1)
+                    if (row + d_row, col + d_col) in category_cells
+                ]
+                candidates = np.concatenate(blocks) if blocks else np.empty(0, dtype=np.int64)
+                distances = _distance_matrix(lat[pending], lng[pending], lat[candidates], lng[candidates])
+                distances[pending[:, None] == candidates[None, :]] = np.inf
+
+                # k번째 이웃이 확정 범위(ring 셀) 안에 있는 장소는 완료, 나머지는 범위를 두 배로
+                limit = min(k, len(candidates))
+                if ring >= max_ring:
+                    settled = np.ones(len(pending), dtype=bool)
+                elif limit < k:
+                    settled = np.zeros(len(pending), dtype=bool)
+                else:
+                    settled = np.partition(distances, limit - 1, axis=1)[:, limit - 1] <= ring * cell_min_m
+
+                settled_rows = np.nonzero(settled)[0]
+                if len(settled_rows) and len(candidates):
+                    settled_distances = distances[settled_rows]
+                    order = np.argsort(settled_distances, axis=1, kind='stable')[:, :k]
+                    nearest_distances = np.take_along_axis(settled_distances, order, axis=1)
+                    nearest_pks = pks[candidates[order]]
+                    for row_index, row_pks, row_distances in zip(settled_rows, nearest_pks.tolist(), nearest_distances.tolist()):
+                        neighbors = [
+                            [neighbor_pk, int(round(distance))]
+                            for neighbor_pk, distance in zip(row_pks, row_distances)
+                            if distance <= max_distance_m
+                        ]
+                        if neighbors:
+                            result[int(pks[pending[row_index]])][str(category)] = neighbors
+
+                pending = pending[~settled]
+                ring = min(ring * 2, max_ring)
+    return result
+
+
+def store_neighbors(generation, neighbors_by_pk, batch_size=1000):
+    """계산 결과를 SpotNeighbors로 저장 (있으면 갱신)"""
+    rows = [
+        SpotNeighbors(spot_id=pk, generation=generation, neighbors=neighbors)
+        for pk, neighbors in neighbors_by_pk.items()
+    ]
+    with transaction.atomic():
+        bulk_upsert(
+            SpotNeighbors,
+            rows,
+            unique_field='spot',
+            update_fields=['generation', 'neighbors', 'computed_at'],
+            batch_size=batch_size,
+        )
+        # 좌표가 없어진 장소의 이전 결과 제거
+        SpotNeighbors.objects.exclude(generation=generation).delete()
+    return len(rows)
+
+
+def rebuild_neighbors(generation):
+    """현재 카탈로그 전체의 근접 장소 목록을 다시 계산해 저장"""
+    points = PetTourSpot.objects.values_list('id', 'mapy', 'mapx', 'contenttypeid').iterator(chunk_size=2000)
+    return store_neighbors(generation, compute_neighbors(points))
+
+
+def neighbors_generation(spot_pk):
+    """장소의 근접 장소 목록을 계산한 카탈로그 세대 (계산된 적 없으면 None)"""
+    return SpotNeighbors.objects.filter(spot_id=spot_pk).values_list('generation', flat=True).first()
+
+
+def get_neighbors(spot_pk, category=None, limit=NEIGHBOR_K):
+    """
+    미리 계산된 근접 장소 [[pk, 거리 m], ...] (가까운 순)
+    category가 없으면 모든 카테고리를 합쳐 가까운 순으로 반환
+    """
+    neighbors = SpotNeighbors.objects.filter(spot_id=spot_pk).values_list('neighbors', flat=True).first()
+    if not neighbors:
+        return []
+    if category is not None:
+        return neighbors.get(category, [])[:limit]
+    merged = [item for items in neighbors.values() for item in items]
+    return sorted(merged, key=lambda item: (item[1], item[0]))[:limit]
@@ -0,0 +1,52 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+from .catalog import current_generation
+
+
+def cached_count(queryset):
+    """
+    쿼리셋 COUNT(*) 결과를 카탈로그 세대별로 캐시
+    동일한 필터의 총 개수는 세대가 바뀌기 전까지 한 번만 계산합니다.
+    """
+    sql_hash = hashlib.sha1(str(queryset.query).encode('utf-8')).hexdigest()
+    cache_key = f'catalog:count:{current_generation()}:{sql_hash}'
+
+    count = cache.get(cache_key)
+    if count is None:
+        count = queryset.count()
+        cache.set(cache_key, count, settings.CATALOG_COUNT_CACHE_SECONDS)
+    return count
+
+
+class CatalogCursorPagination(CursorPagination):
+    """
+    id 기준 키셋(cursor) 페이지네이션
+    OFFSET 없이 `id > 마지막 id` 조건으로 조회하므로 깊은 페이지도 일정한 시간에 응답합니다.
+    총 개수는 `with_count=true` 요청 시에만 캐시된 값으로 함께 반환합니다.
+    """
+    ordering = 'id'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    count_query_param = 'with_count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = None
+        if request.query_params.get(self.count_query_param) == 'true':
+            self.count = cached_count(queryset)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        payload = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.count is not None:
+            payload['count'] = self.count
+        return Response(payload)
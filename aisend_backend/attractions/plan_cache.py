@@ -0,0 +1,84 @@
+"""
+여행 계획 결과 캐시와 내용 기반 계획 ID
+
+여행 계획은 (정규화된 요청 값, 카탈로그 세대)가 같으면 항상 같은 결과를 만들도록 결정적으로 생성하고,
+그 조합의 해시를 계획 ID와 캐시 키로 사용합니다.
+- 같은 요청을 다시 보내거나 타임아웃 후 재시도하면 캐시된 계획을 바로 반환
+- 같은 요청이 동시에 들어오면 먼저 온 요청만 계획을 만들고 나머지는 그 결과를 기다림
+- 카탈로그 세대가 바뀌면 키가 달라지므로 따로 무효화할 필요가 없음
+"""
+import hashlib
+import threading
+
+import orjson
+from django.core.cache import caches
+
+from .catalog import current_generation
+
+PLAN_CACHE_ALIAS = 'plans'
+PLAN_ID_LENGTH = 16
+
+
+def _normalize_text(value):
+    return ' '.join(str(value or '').split())
+
+
+def normalize_plan_request(data):
+    """계획 요청 값 정규화 (공백, 선호도 순서/중복 차이를 같은 요청으로 취급)"""
+    preferences = data.get('preferences') or []
+    if isinstance(preferences, str):
+        preferences = [preferences]
+    return {
+        'location': _normalize_text(data.get('location')),
+        'preferences': sorted({_normalize_text(p) for p in preferences if _normalize_text(p)}),
+        'duration_days': max(int(data.get('duration_days', 1)), 1),
+        'travel_style': _normalize_text(data.get('travel_style') or '일반'),
+        'with_who': _normalize_text(data.get('with_who') or '혼자'),
+    }
+
+
+def plan_key(kind, params, generation=None):
+    """(계획 종류, 정규화된 요청 값, 카탈로그 세대)의 해시"""
+    generation = current_generation() if generation is None else generation
+    payload = orjson.dumps({'kind': kind, 'params': params, 'generation': generation}, option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(payload).hexdigest()
+
+
+def plan_id_from_key(key):
+    return key[:PLAN_ID_LENGTH]
+
+
+def get_cached_plan(key):
+    return caches[PLAN_CACHE_ALIAS].get(key)
+
+
+def store_plan(key, plan):
+    caches[PLAN_CACHE_ALIAS].set(key, plan)
+
+
+_inflight_locks = {}
+_inflight_guard = threading.Lock()
+
+
+def get_or_build_plan(key, builder):
+    """
+    캐시된 계획을 반환하고, 없으면 builder()로 만들어 저장
+    같은 키의 동시 요청은 한 번만 만듭니다 (프로세스 내).
+    """
+    plan = get_cached_plan(key)
+    if plan is not None:
+        return plan
+
+    with _inflight_guard:
+        lock = _inflight_locks.setdefault(key, threading.Lock())
+    try:
+        with lock:
+            plan = get_cached_plan(key)
+            if plan is None:
+                plan = builder()
+                store_plan(key, plan)
+            return plan
+    finally:
+        with _inflight_guard:
+            if _inflight_locks.get(key) is lock and not lock.locked():
+                del _inflight_locks[key]
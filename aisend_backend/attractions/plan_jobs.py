@@ -0,0 +1,73 @@
+"""
+비동기 여행 계획 작업
+
+여러 날짜 계획 + 카카오 보조 검색은 수 초가 걸릴 수 있어 동기 API는 그동안 웹 워커를 붙잡습니다.
+작업 API는 TripPlanJob 행을 만들고 바로 작업 ID를 돌려준 뒤, 계획은 작업 스레드 풀에서 만듭니다.
+진행 상황(단계, 완성된 일별 계획)과 결과는 작업 행에 기록하므로 어느 웹 프로세스에서든 조회할 수 있습니다.
+
+- 같은 ID의 작업이 진행 중이거나 완료됐으면 새로 실행하지 않고 그 작업을 반환
+- 실패했거나 PLAN_JOB_TIMEOUT_SECONDS 동안 갱신이 없는(프로세스 재시작 등) 작업은 다시 실행
+- PLAN_JOB_RETENTION_HOURS가 지난 작업은 새 작업 제출 시 정리
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .models import TripPlanJob
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=settings.PLAN_JOB_WORKERS, thread_name_prefix='trip-plan')
+
+
+def _is_active(job):
+    if job.status not in ('pending', 'running'):
+        return False
+    return job.updated_at >= timezone.now() - timedelta(seconds=settings.PLAN_JOB_TIMEOUT_SECONDS)
+
+
+def _remove_expired_jobs():
+    cutoff = timezone.now() - timedelta(hours=settings.PLAN_JOB_RETENTION_HOURS)
+    TripPlanJob.objects.filter(created_at__lt=cutoff).delete()
+
+
+def submit_plan_job(job_id, kind, params, build):
+    """
+    작업을 만들어 작업 풀에 제출하고 TripPlanJob 반환
+    build(report)는 계획 dict를 반환하며, 중간에 report(**progress)로 진행 상황을 기록할 수 있음
+    """
+    _remove_expired_jobs()
+    job, created = TripPlanJob.objects.get_or_create(id=job_id, defaults={'kind': kind, 'params': params})
+    if not created:
+        if job.status == 'done' or _is_active(job):
+            return job
+        # 실패/중단된 작업 재실행 - 동시에 다시 제출돼도 한 요청만 실행하도록 조건부 갱신
+        claimed = TripPlanJob.objects.filter(pk=job_id, status=job.status, updated_at=job.updated_at).update(
+            status='pending', progress={}, result=None, error='', updated_at=timezone.now())
+        job.refresh_from_db()
+        if not claimed:
+            return job
+
+    _executor.submit(_run, job_id, build)
+    return job
+
+
+def _run(job_id, build):
+    jobs = TripPlanJob.objects.filter(pk=job_id)
+
+    def report(**progress):
+        jobs.update(progress=progress, updated_at=timezone.now())
+
+    try:
+        jobs.update(status='running', updated_at=timezone.now())
+        result = build(report)
+        jobs.update(status='done', result=result, updated_at=timezone.now())
+    except Exception as e:
+        logger.error(f"여행 계획 작업 오류 ({job_id}): {str(e)}")
+        jobs.update(status='failed', error=str(e), updated_at=timezone.now())
+    finally:
+        close_old_connections()
@@ -0,0 +1,125 @@
+"""
+경로 탐색 프로세스 풀 실행 (선택 사항)
+
+경로 개선(attractions.anytime)은 순수 파이썬 CPU 연산이라 후보가 많으면 GIL을 오래 잡아
+같은 스레드형 워커의 다른 요청을 멈추게 합니다.
+PLAN_PROCESS_WORKERS > 0이면 후보 수가 PLAN_PROCESS_MIN_CANDIDATES 이상인 탐색을 별도 프로세스에서 실행합니다.
+
+- 입력은 dict 목록 대신 numpy 배열(방문 시간, 평점, uint16 이동 시간 행렬)로 넘겨 직렬화 비용을 줄임
+- 마감 시간은 남은 시간(초)으로 넘기고 작업 프로세스에서 다시 계산
+- 작은 입력, 풀 비활성, 작업 프로세스 시작 전, 풀 오류/시간 초과 시에는 현재 프로세스에서 실행
+- 시간 초과 시에는 그 요청의 작업만 취소하고(공용 풀은 유지), 풀 자체가 깨졌을 때만 풀을 다시 만듦
+"""
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+from django.conf import settings
+
+from .anytime import improve_route
+
+logger = logging.getLogger(__name__)
+
+# 작업 프로세스 전달/반환 여유 시간 (초) - 이 시간까지 결과가 없으면 현재 프로세스에서 다시 실행
+_RESULT_GRACE_SECONDS = 0.5
+# 풀에서 결과를 받지 못해 현재 프로세스에서 다시 실행할 때의 최소 탐색 시간 (초)
+# 실제 후보 수(30곳 안팎)에서는 국소 최적까지 수 ms면 충분
+_FALLBACK_SECONDS = 0.05
+
+_pool = None
+_pool_warmup = []
+_pool_lock = threading.Lock()
+
+
+def _warmup():
+    return True
+
+
+def _get_ready_pool():
+    """작업 프로세스가 모두 시작된 풀 (처음 호출 시 백그라운드로 시작하고, 준비 전에는 None)"""
+    global _pool, _pool_warmup
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # spawn: 웹 워커의 스레드/DB 연결 상태를 복제하지 않음 (작업 모듈은 Django에 의존하지 않음)
+                _pool = ProcessPoolExecutor(max_workers=settings.PLAN_PROCESS_WORKERS,
+                                            mp_context=multiprocessing.get_context('spawn'))
+                # 프로세스 시작(모듈 import) 비용을 요청이 기다리지 않도록 미리 시작
+                _pool_warmup = [_pool.submit(_warmup) for _ in range(settings.PLAN_PROCESS_WORKERS)]
+    if not all(future.done() for future in _pool_warmup):
+        return None
+    return _pool
+
+
+def _reset_pool(broken_pool):
+    """깨진 풀 정리 (동시에 같은 오류를 받은 다른 요청이 이미 새로 만든 풀은 건드리지 않음)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not broken_pool:
+            return
+        _pool = None
+    broken_pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _improve_route_task(route, visit, rating, matrix, budget, remaining, candidates, pinned, max_stops, groups):
+    """작업 프로세스에서 실행 - 배열을 리스트로 바꿔 탐색 (원소 단위 접근은 리스트가 빠름)"""
+    return improve_route(
+        route=route,
+        visit=visit.tolist(),
+        rating=rating.tolist(),
+        matrix=matrix.tolist(),
+        budget=budget,
+        deadline=time.perf_counter() + remaining,
+        candidates=candidates.tolist(),
+        pinned=pinned,
+        max_stops=max_stops,
+        groups=None if groups is None else groups.tolist(),
+    )
+
+
+def optimize_route(route, visit, rating, matrix, budget, deadline, candidates, pinned=(), max_stops=5, groups=None):
+    """improve_route와 같은 인자/결과, 큰 입력은 프로세스 풀에서 실행 (통계에 backend 표시)"""
+    candidates = list(candidates)
+    pool = None
+    if settings.PLAN_PROCESS_WORKERS > 0 and len(visit) >= settings.PLAN_PROCESS_MIN_CANDIDATES:
+        pool = _get_ready_pool()
+    if pool is not None:
+        remaining = max(deadline - time.perf_counter(), 0)
+        future = None
+        try:
+            future = pool.submit(
+                _improve_route_task,
+                list(route),
+                np.asarray(visit, dtype=np.int32),
+                np.asarray(rating, dtype=np.float64),
+                np.asarray(matrix, dtype=np.uint16),
+                budget,
+                remaining,
+                np.asarray(candidates, dtype=np.int32),
+                list(pinned),
+                max_stops,
+                None if groups is None else np.asarray(groups, dtype=np.int32),
+            )
+            route, stats = future.result(timeout=remaining + _RESULT_GRACE_SECONDS)
+            stats['backend'] = 'process'
+            return route, stats
+        except TimeoutError:
+            # 다른 요청이 풀을 쓰고 있어 늦어진 것 - 이 요청의 작업만 취소 (이미 실행 중이면 결과를 버림)
+            future.cancel()
+            logger.warning("경로 탐색 프로세스 풀 응답 시간 초과, 현재 프로세스에서 실행")
+        except BrokenProcessPool as e:
+            logger.warning(f"경로 탐색 프로세스 풀 오류, 풀을 다시 만들고 현재 프로세스에서 실행: {e!r}")
+            _reset_pool(pool)
+        except Exception as e:
+            logger.warning(f"경로 탐색 프로세스 풀 작업 오류, 현재 프로세스에서 실행: {e!r}")
+        # 풀을 기다리느라 마감 시간이 지났어도 현재 프로세스 탐색이 최소한은 돌도록
+        deadline = max(deadline, time.perf_counter() + _FALLBACK_SECONDS)
+
+    route, stats = improve_route(route, visit, rating, matrix, budget, deadline, candidates,
+                                 pinned=pinned, max_stops=max_stops, groups=groups)
+    stats['backend'] = 'inline'
+    return route, stats
@@ -0,0 +1,149 @@
+"""
+여행 계획 후보 점수 계산과 일별 장소 배정 (numpy)
+
+후보 장소 dict 목록을 카테고리 코드/평점/좌표 배열로 한 번 바꾼 뒤 점수 벡터를 계산합니다.
+    점수 = 평점 + 선호 카테고리 가산점 + 여행 스타일별 카테고리 가중치 - 거리 가중치 × 중심점까지 거리(km)
+카테고리별로 필요한 개수(일별 할당량 × 일수)만 argpartition으로 골라 정렬하고,
+일별 배정은 카테고리별 포인터와 사용 여부 배열로 진행하므로 일수에 대해 선형입니다.
+
+일별 할당량은 기존 규칙과 같습니다: 관광지 2, 음식점 2, 카페 1(선호 시), 반려동물 동반 1(선호 시),
+나머지는 기타 → 전체 점수 순으로 채움. 이미 다른 날에 쓴 장소는 후보가 모자랄 때만 다시 씁니다.
+"""
+import numpy as np
+
+CATEGORIES = ('관광지', '음식점', '카페', '반려동물 동반', '쇼핑', '기타')
+_CATEGORY_CODES = {name: code for code, name in enumerate(CATEGORIES)}
+OTHER = _CATEGORY_CODES['기타']
+
+# 선호도 값 → 가산점을 받을 카테고리 (앱이 보내는 영문 값 pet/food/cafe와 한글 값)
+PREFERENCE_CATEGORIES = {
+    'pet': '반려동물 동반',
+    'food': '음식점',
+    'cafe': '카페',
+    '반려동물': '반려동물 동반',
+    '관광': '관광지',
+    '관광지': '관광지',
+    '맛집': '음식점',
+    '음식점': '음식점',
+    '카페': '카페',
+    '쇼핑': '쇼핑',
+}
+PREFERENCE_BONUS = 0.5
+
+# 여행 스타일별 (카테고리 가중치, 중심점 거리 1km당 감점)
+STYLE_WEIGHTS = {
+    '여유': ({'카페': 0.3, '반려동물 동반': 0.1}, 0.05),
+    '효율': ({'관광지': 0.3, '쇼핑': 0.1}, 0.01),
+}
+DEFAULT_STYLE_WEIGHTS = ({}, 0.02)
+
+KM_PER_DEG_LAT = 110.574
+KM_PER_DEG_LNG_EQUATOR = 111.320
+
+
+class CandidateArrays:
+    """후보 장소 dict 목록의 배열 표현 (카테고리 코드, 평점, 좌표)"""
+
+    def __init__(self, places):
+        # dict 목록은 한 번만 순회
+        codes = _CATEGORY_CODES
+        rows = np.array([
+            (codes.get(p.get('category'), OTHER), p.get('rating') or 0, p.get('latitude') or 0, p.get('longitude') or 0)
+            for p in places
+        ], dtype=np.float64).reshape(-1, 4)
+        self.category = rows[:, 0].astype(np.int8)
+        self.rating, self.lat, self.lng = rows[:, 1], rows[:, 2], rows[:, 3]
+
+    def __len__(self):
+        return len(self.rating)
+
+    def centroid_distance_km(self):
+        """좌표 중앙값(중심점)까지 거리 - 좌표가 없는 장소는 가장 먼 장소와 같은 거리로 취급"""
+        has_coords = (self.lat != 0) & (self.lng != 0)
+        distance = np.zeros(len(self))
+        if has_coords.any():
+            center_lat = np.median(self.lat[has_coords])
+            center_lng = np.median(self.lng[has_coords])
+            dx = (self.lng - center_lng) * KM_PER_DEG_LNG_EQUATOR * np.cos(np.radians(center_lat))
+            dy = (self.lat - center_lat) * KM_PER_DEG_LAT
+            distance = np.hypot(dx, dy)
+            distance[~has_coords] = distance[has_coords].max()
+        return distance
+
+
+def score_candidates(candidates, preferences, travel_style):
+    """후보 점수 벡터"""
+    category_weights, distance_weight = STYLE_WEIGHTS.get(travel_style, DEFAULT_STYLE_WEIGHTS)
+    weights = np.zeros(len(CATEGORIES))
+    for name, weight in category_weights.items():
+        weights[_CATEGORY_CODES[name]] += weight
+    for preference in preferences:
+        category = PREFERENCE_CATEGORIES.get(preference)
+        if category is not None:
+            weights[_CATEGORY_CODES[category]] += PREFERENCE_BONUS
+    return candidates.rating + weights[candidates.category] - distance_weight * candidates.centroid_distance_km()
+
+
+def top_k(indices, scores, k):
+    """indices 중 점수 상위 k개 (점수 내림차순, 같으면 앞선 인덱스 먼저) - 전체 정렬 대신 부분 선택"""
+    indices = np.asarray(indices)
+    if k < len(indices):
+        indices = indices[np.argpartition(-scores[indices], k - 1)[:k]]
+    return indices[np.lexsort((indices, -scores[indices]))]
+
+
+class _Ranked:
+    """점수 순 후보 목록 + 아직 확인하지 않은 위치"""
+
+    def __init__(self, indices):
+        self.indices = indices.tolist()
+        self.position = 0
+
+    def take(self, count, used):
+        taken = []
+        while len(taken) < count and self.position < len(self.indices):
+            index = self.indices[self.position]
+            self.position += 1
+            if not used[index]:
+                taken.append(index)
+        return taken
+
+
+def iter_day_selections(places, preferences, duration_days, travel_style, places_per_day):
+    """일별 장소 인덱스 목록을 하루씩 생성 (배정 순서: 관광지, 음식점, 카페, 반려동물 동반, 기타, 전체)"""
+    candidates = CandidateArrays(places)
+    n = len(candidates)
+    scores = score_candidates(candidates, preferences, travel_style)
+
+    quotas = [('관광지', 2), ('음식점', 2)]
+    if '카페' in preferences:
+        quotas.append(('카페', 1))
+    if 'pet' in preferences:
+        quotas.append(('반려동물 동반', 1))
+
+    # 카테고리별/전체 상위 후보만 부분 선택 (다른 날 배정·채우기에 쓰인 만큼 여유를 둠)
+    depth = (max([quota for _, quota in quotas] + [places_per_day]) + places_per_day) * duration_days
+    ranked = {
+        name: _Ranked(top_k(np.nonzero(candidates.category == _CATEGORY_CODES[name])[0], scores, depth))
+        for name, _ in quotas + [('기타', 0)]
+    }
+    overall = top_k(np.arange(n), scores, depth).tolist()
+    overall_ranked = _Ranked(np.array(overall, dtype=np.int64))
+
+    used = np.zeros(n, dtype=bool)
+    for _ in range(duration_days):
+        day = []
+        for name, quota in quotas:
+            day.extend(ranked[name].take(quota, used))
+            used[day] = True
+        day.extend(ranked['기타'].take(places_per_day - len(day), used))
+        used[day] = True
+        day.extend(overall_ranked.take(places_per_day - len(day), used))
+        used[day] = True
+
+        # 후보가 모자라면 다른 날에 쓴 장소를 점수 순으로 다시 사용
+        if len(day) < places_per_day:
+            in_day = set(day)
+            day.extend([i for i in overall if i not in in_day][:places_per_day - len(day)])
+
+        yield day
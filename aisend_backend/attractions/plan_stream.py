@@ -0,0 +1,46 @@
+"""
+여행 계획 스트리밍 응답 형식
+
+일별 계획이 완성될 때마다 (이벤트 이름, 데이터) 하나씩 보내고, 마지막에 전체 계획(summary)을 보냅니다.
+- sse: Server-Sent Events (text/event-stream)
+    event: day
+    data: {...}
+- ndjson: 한 줄에 이벤트 하나 ({"event": "day", "data": {...}})
+
+이벤트 순서: start → day × N → summary (중간 오류 시 error로 종료)
+"""
+import orjson
+
+
+def format_sse(event, data):
+    return b'event: ' + event.encode('utf-8') + b'\ndata: ' + orjson.dumps(data) + b'\n\n'
+
+
+def format_ndjson(event, data):
+    return orjson.dumps({'event': event, 'data': data}) + b'\n'
+
+
+# output 값 → (이벤트 직렬화 함수, Content-Type)
+STREAM_FORMATS = {
+    'sse': (format_sse, 'text/event-stream; charset=utf-8'),
+    'ndjson': (format_ndjson, 'application/x-ndjson; charset=utf-8'),
+}
+
+
+def stream_output(request):
+    """
+    output 파라미터가 없으면 Accept 헤더로 고른 렌더러로 결정
+    (EventSource는 text/event-stream, 그 외 application/x-ndjson 또는 application/json은 ndjson)
+    """
+    output = request.query_params.get('output')
+    if output:
+        return output
+    renderer_format = request.accepted_renderer.format
+    return renderer_format if renderer_format in STREAM_FORMATS else 'ndjson'
+
+
+def iter_stream(events, output):
+    """(이벤트 이름, 데이터) 이터레이터 → 응답 바이트 조각"""
+    formatter = STREAM_FORMATS[output][0]
+    for event, data in events:
+        yield formatter(event, data)
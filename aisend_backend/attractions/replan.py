@@ -0,0 +1,83 @@
+"""
+여행 계획 부분 수정(재계획)
+
+사용자가 계획에서 장소를 빼거나(remove), 고정하거나(pin), 추가(add)하면
+계획 전체를 다시 만들지 않고 기존 경로를 삽입/제거 이동으로만 고칩니다.
+후보 장소와 이동 시간 행렬은 처음 계획할 때 계획 캐시에 저장해 둔 것을 재사용합니다.
+
+경로는 후보 목록의 인덱스 리스트이고, 비용은 방문 시간 합 + 연속한 장소 간 이동 시간 합(분)입니다.
+1. 제거: 뺀 장소를 경로에서 지움
+2. 추가: 추가한 장소를 비용이 가장 적게 늘어나는 위치에 삽입 (추가한 장소는 고정으로 취급)
+3. 시간 초과: 고정되지 않은 장소 중 줄어드는 시간 대비 평점이 가장 낮은 장소부터 제거
+4. 시간 여유: 남은 후보를 주어진 순서(평점 순)대로, 가장 싼 위치에 들어가면 삽입 (최대 장소 수까지)
+"""
+
+
+def route_minutes(route, visit, matrix):
+    """경로 비용 (분)"""
+    return sum(visit[i] for i in route) + sum(matrix[a][b] for a, b in zip(route, route[1:]))
+
+
+def _insertion_cost(route, candidate, position, visit, matrix):
+    prev = route[position - 1] if position > 0 else None
+    nxt = route[position] if position < len(route) else None
+    cost = visit[candidate]
+    if prev is not None:
+        cost += matrix[prev][candidate]
+    if nxt is not None:
+        cost += matrix[candidate][nxt]
+    if prev is not None and nxt is not None:
+        cost -= matrix[prev][nxt]
+    return cost
+
+
+def cheapest_insertion(route, candidate, visit, matrix):
+    """(늘어나는 비용, 삽입 위치) - 비용이 같으면 앞쪽 위치"""
+    return min((_insertion_cost(route, candidate, position, visit, matrix), position)
+               for position in range(len(route) + 1))
+
+
+def removal_saving(route, position, visit, matrix):
+    """position의 장소를 빼면 줄어드는 비용"""
+    rest = route[:position] + route[position + 1:]
+    return _insertion_cost(rest, route[position], position, visit, matrix)
+
+
+def repair_route(route, visit, rating, matrix, budget, remove=(), pin=(), add=(), fill_order=(), max_stops=5):
+    """
+    편집을 반영해 경로를 고치고 (경로, 비용) 반환
+    route/remove/pin/add/fill_order는 후보 인덱스, fill_order는 빈자리를 채울 후보 순서
+    """
+    removed = set(remove)
+    route = [i for i in route if i not in removed]
+    pinned = set(pin) | set(add)
+
+    for candidate in add:
+        if candidate not in route:
+            _, position = cheapest_insertion(route, candidate, visit, matrix)
+            route.insert(position, candidate)
+
+    total = route_minutes(route, visit, matrix)
+    while total > budget:
+        removable = [
+            (rating[stop] / max(removal_saving(route, position, visit, matrix), 1), position)
+            for position, stop in enumerate(route)
+            if stop not in pinned
+        ]
+        if not removable:
+            break
+        _, position = min(removable)
+        total -= removal_saving(route, position, visit, matrix)
+        route.pop(position)
+
+    used = set(route) | removed
+    for candidate in fill_order:
+        if len(route) >= max_stops:
+            break
+        if candidate in used:
+            continue
+        cost, position = cheapest_insertion(route, candidate, visit, matrix)
+        if total + cost <= budget:
+            route.insert(position, candidate)
+            total += cost
+    return route, total
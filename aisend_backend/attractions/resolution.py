@@ -0,0 +1,113 @@
+"""
+출처 간 장소 동일성 판별(entity resolution) 및 중복 제거 인덱스
+
+TourAPI / 카카오 등 서로 다른 출처의 같은 장소를
+정규화된 이름 + 좌표 근접도(격자 버킷)로 판별합니다.
+격자 셀 단위로 후보를 모으므로 후보 목록의 중복 제거가 선형 시간에 끝납니다.
+조회 시에는 최대 거리를 덮는 만큼의 주변 셀을 확인하므로 셀 경계 위치와 관계없이 같은 결과가 나옵니다.
+"""
+import math
+import re
+import unicodedata
+from collections import defaultdict
+
+# 같은 장소로 볼 최대 거리 (m)
+MATCH_DISTANCE_M = 150
+# 위도 1도의 거리 (m)
+METERS_PER_DEG_LAT = 111320.0
+# 격자 셀 크기 (도) - 위도 방향으로 최대 거리와 같은 크기, 경도 방향은 cos(위도)만큼 좁아져 조회 시 더 넓게 확인
+GRID_CELL_DEG = MATCH_DISTANCE_M / METERS_PER_DEG_LAT
+# 부분 일치를 허용할 최소 이름 길이
+MIN_CONTAINED_NAME_LENGTH = 3
+
+_BRACKETS_RE = re.compile(r'[\(\[\{（【][^\)\]\}）】]*[\)\]\}）】]')
+_NON_WORD_RE = re.compile(r'[\W_]+', re.UNICODE)
+
+
+def normalize_name(name):
+    """비교용 이름 정규화 (괄호 내용, 공백, 특수문자 제거 및 소문자화)"""
+    name = unicodedata.normalize('NFKC', name or '')
+    name = _BRACKETS_RE.sub('', name)
+    return _NON_WORD_RE.sub('', name).lower()
+
+
+def approx_distance_m(lat1, lng1, lat2, lng2):
+    """근거리용 근사 거리 (m, 등장방형 투영)"""
+    x = math.radians(lng2 - lng1) * math.cos(math.radians((lat1 + lat2) / 2))
+    y = math.radians(lat2 - lat1)
+    return 6371000.0 * math.hypot(x, y)
+
+
+def names_match(a, b):
+    """정규화된 두 이름이 같은 장소를 가리키는지 판별"""
+    if not a or not b:
+        return False
+    if a == b:
+        return True
+    shorter, longer = (a, b) if len(a) <= len(b) else (b, a)
+    return len(shorter) >= MIN_CONTAINED_NAME_LENGTH and shorter in longer
+
+
+class EntityIndex:
+    """
+    이름 + 좌표 격자 기반 장소 동일성 인덱스
+    add() 한 번, 조회 시 최대 거리 안에 걸치는 주변 셀만 확인하므로 항목당 상수 시간입니다.
+    """
+
+    def __init__(self, cell_deg=GRID_CELL_DEG, max_distance_m=MATCH_DISTANCE_M):
+        self.cell_deg = cell_deg
+        self.max_distance_m = max_distance_m
+        self._cells = defaultdict(list)
+        self._ids = set()
+
+    def _cell(self, lat, lng):
+        return (math.floor(lat / self.cell_deg), math.floor(lng / self.cell_deg))
+
+    def _ring_sizes(self, lat):
+        """최대 거리를 덮는 데 필요한 (위도, 경도) 방향 주변 셀 수"""
+        cell_m = self.cell_deg * METERS_PER_DEG_LAT
+        lat_rings = math.ceil(self.max_distance_m / cell_m)
+        # 확인 범위 안에서 가장 고위도(경도 셀이 가장 좁은 곳) 기준
+        far_lat = min(abs(lat) + lat_rings * self.cell_deg, 89.0)
+        lng_rings = math.ceil(self.max_distance_m / (cell_m * math.cos(math.radians(far_lat))))
+        return lat_rings, lng_rings
+
+    def find(self, name, lat, lng):
+        """같은 장소로 판별되는 기존 항목의 키 반환 (없으면 None)"""
+        if not (lat and lng):
+            return None
+        normalized = normalize_name(name)
+        row, col = self._cell(lat, lng)
+        lat_rings, lng_rings = self._ring_sizes(lat)
+        for d_row in range(-lat_rings, lat_rings + 1):
+            for d_col in range(-lng_rings, lng_rings + 1):
+                for key, other_name, other_lat, other_lng in self._cells.get((row + d_row, col + d_col), ()):
+                    if (names_match(normalized, other_name)
+                            and approx_distance_m(lat, lng, other_lat, other_lng) <= self.max_distance_m):
+                        return key
+        return None
+
+    def add(self, key, name, lat, lng):
+        self._ids.add(key)
+        if lat and lng:
+            self._cells[self._cell(lat, lng)].append((key, normalize_name(name), lat, lng))
+
+    def add_if_new(self, key, name, lat, lng):
+        """새 장소면 추가 후 True, 이미 있는 장소(같은 키 또는 동일 장소)면 False"""
+        if key in self._ids or self.find(name, lat, lng) is not None:
+            return False
+        self.add(key, name, lat, lng)
+        return True
+
+
+def dedupe_places(places):
+    """
+    장소 dict 목록의 출처 간 중복 제거 (앞쪽 항목 우선)
+    각 항목은 id, name, latitude, longitude 키를 가집니다.
+    """
+    index = EntityIndex()
+    unique_places = []
+    for place in places:
+        if index.add_if_new(place['id'], place.get('name', ''), place.get('latitude', 0), place.get('longitude', 0)):
+            unique_places.append(place)
+    return unique_places
@@ -0,0 +1,84 @@
+"""
+장소 인기도/품질 점수 계산
+
+요청마다 랜덤 별점을 만들던 방식 대신, 저장된 신호(대표 이미지, 개요 길이,
+연락처, 좌표 등)로부터 결정적인 점수(0.0 ~ 1.0)를 계산합니다.
+점수는 동기화 시점에 미리 계산되어 PetTourSpot.score 에 인덱스와 함께 저장됩니다.
+"""
+import zlib
+
+# 개요 길이 만점 기준 (글자 수)
+OVERVIEW_FULL_LENGTH = 600
+
+# 신호별 가중치 (합계 1.0)
+IMAGE_WEIGHT = 0.35
+OVERVIEW_WEIGHT = 0.35
+TEL_WEIGHT = 0.15
+COORDS_WEIGHT = 0.15
+
+# 점수 → 별점 변환 범위
+MIN_RATING = 3.5
+MAX_RATING = 5.0
+
+
+def score_place(image_url='', overview='', tel='', has_coords=False):
+    """보유 신호로부터 장소 점수 계산 (0.0 ~ 1.0)"""
+    score = 0.0
+
+    if image_url:
+        score += IMAGE_WEIGHT
+
+    if overview:
+        score += OVERVIEW_WEIGHT * min(len(overview) / OVERVIEW_FULL_LENGTH, 1.0)
+
+    if tel:
+        score += TEL_WEIGHT
+
+    if has_coords:
+        score += COORDS_WEIGHT
+
+    return round(score, 4)
+
+
+def score_spot(spot):
+    """PetTourSpot 인스턴스 점수 계산"""
+    return score_place(
+        image_url=spot.firstimage,
+        overview=spot.overview,
+        tel=spot.tel,
+        has_coords=bool(spot.mapx and spot.mapy),
+    )
+
+
+def score_kakao_document(document):
+    """카카오 장소 검색 결과 문서 점수 계산"""
+    category_depth = len([c for c in document.get('category_name', '').split('>') if c.strip()])
+
+    score = 0.0
+    if document.get('phone'):
+        score += 0.3
+    if document.get('road_address_name'):
+        score += 0.3
+    if document.get('place_url'):
+        score += 0.1
+    # 카테고리가 세분화될수록 정보가 풍부한 장소로 간주
+    score += 0.3 * min(category_depth / 4, 1.0)
+
+    return round(score, 4)
+
+
+def rating_from_score(score):
+    """점수를 화면 표시용 별점(3.5 ~ 5.0)으로 변환"""
+    score = min(max(score or 0.0, 0.0), 1.0)
+    return round(MIN_RATING + (MAX_RATING - MIN_RATING) * score, 1)
+
+
+def review_count_from_score(score):
+    """점수 기반 임시 리뷰 수 (실제 리뷰 데이터 연동 전까지 사용)"""
+    score = min(max(score or 0.0, 0.0), 1.0)
+    return int(10 + 190 * score)
+
+
+def stable_bucket(key, low, high):
+    """문자열 키로부터 항상 같은 정수(low ~ high)를 반환"""
+    return low + zlib.crc32(str(key).encode('utf-8')) % (high - low + 1)
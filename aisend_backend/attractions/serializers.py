@@ -1,9 +1,10 @@
 from rest_framework import serializers
-from .models import Attraction
+from .models import PetTourSpot
 
 class AttractionSerializer(serializers.ModelSerializer):
+    """관광 명소(PetTourSpot) 시리얼라이저"""
     class Meta:
-        model = Attraction
+        model = PetTourSpot
         fields = '__all__'
         
 class TripPlanPlaceSerializer(serializers.Serializer):
@@ -28,6 +29,8 @@ class TripPlanSerializer(serializers.Serializer):
     duration = serializers.IntegerField()
     tags = serializers.ListField(child=serializers.CharField(), required=False)
     places = TripPlanPlaceSerializer(many=True)
+    # 경로 탐색 통계 (반복 횟수, 목적 함수 값 등, attractions.anytime 참고)
+    solver = serializers.DictField(required=False)
 
 class PlaceSerializer(serializers.Serializer):
     """장소 정보 시리얼라이저"""
@@ -0,0 +1,127 @@
+"""
+카탈로그 좌표 배열과 격자 인덱스 (numpy)
+
+PetTourSpot 좌표를 numpy 배열로 보관하고, 약 1km 격자 셀 키로 정렬해 두어
+위경도 범위 안의 후보를 셀 행마다 이진 탐색 한 번으로 모읍니다.
+경로(폴리라인) 주변 장소 검색(corridor)처럼 거리 계산이 많은 조회는
+격자로 (후보, 구간) 쌍을 추린 뒤 벡터 연산으로 한 번에 계산합니다.
+"""
+import math
+
+import numpy as np
+
+from .catalog import GenerationCache
+from .models import PetTourSpot
+
+# 격자 셀 크기 (위도 기준 약 1.1km)
+CELL_DEG = 0.01
+# 셀 키 = 행 * _ROW_STRIDE + 열 (열 번호가 이 값보다 작아야 함)
+_ROW_STRIDE = 1 << 20
+
+METERS_PER_DEG_LAT = 110574.0
+METERS_PER_DEG_LNG_EQUATOR = 111320.0
+
+
+def _cell_rows_cols(lat, lng):
+    return np.floor(lat / CELL_DEG).astype(np.int64), np.floor((lng + 180.0) / CELL_DEG).astype(np.int64)
+
+
+class SpotArrays:
+    """좌표가 있는 장소의 배열 (pk, 위경도, 점수)과 셀 키 정렬 인덱스"""
+
+    def __init__(self, rows):
+        """rows: (pk, lat, lng, score) 목록"""
+        rows = [row for row in rows if row[1] and row[2]]
+        self.pks = np.array([row[0] for row in rows], dtype=np.int64)
+        self.lat = np.array([row[1] for row in rows], dtype=np.float64)
+        self.lng = np.array([row[2] for row in rows], dtype=np.float64)
+        self.score = np.array([row[3] for row in rows], dtype=np.float64)
+
+        cell_rows, cell_cols = _cell_rows_cols(self.lat, self.lng)
+        keys = cell_rows * _ROW_STRIDE + cell_cols
+        self._order = np.argsort(keys, kind='stable')
+        self._keys = keys[self._order]
+
+    def __len__(self):
+        return len(self.pks)
+
+    def indices_in_bbox(self, min_lat, min_lng, max_lat, max_lng):
+        """bbox와 겹치는 셀의 장소 인덱스 (셀 단위라 bbox 밖 장소가 일부 포함될 수 있음)"""
+        (row0, row1), (col0, col1) = _cell_rows_cols(np.array([min_lat, max_lat]), np.array([min_lng, max_lng]))
+        rows = np.arange(row0, row1 + 1, dtype=np.int64) * _ROW_STRIDE
+        # 같은 행의 연속된 열은 정렬된 키에서 연속 구간
+        starts = np.searchsorted(self._keys, rows + col0, side='left')
+        ends = np.searchsorted(self._keys, rows + col1, side='right')
+        if not len(starts):
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([self._order[start:end] for start, end in zip(starts, ends)])
+
+
+def build_spot_arrays():
+    rows = PetTourSpot.objects.values_list('id', 'mapy', 'mapx', 'score').iterator(chunk_size=2000)
+    return SpotArrays(rows)
+
+
+_spot_arrays = GenerationCache(build_spot_arrays)
+
+
+def get_spot_arrays():
+    """현재 카탈로그 세대의 좌표 배열"""
+    return _spot_arrays.get()
+
+
+def _local_xy(lat, lng, origin_lat):
+    """origin_lat 기준 등장방형 투영 평면 좌표 (m)"""
+    scale_x = METERS_PER_DEG_LNG_EQUATOR * math.cos(math.radians(origin_lat))
+    return np.stack([np.asarray(lng) * scale_x, np.asarray(lat) * METERS_PER_DEG_LAT], axis=-1)
+
+
+def corridor_search(spots, path, buffer_m, limit=None):
+    """
+    경로(path: [(lat, lng), ...]) 에서 buffer_m 이내인 장소를 경로 진행 순으로 반환
+    결과: (장소 인덱스 배열, 경로와의 거리 m, 경로 시작점부터 진행 거리 m)
+    """
+    path = np.asarray(path, dtype=np.float64)
+    empty = (np.empty(0, dtype=np.int64), np.empty(0), np.empty(0))
+    if len(path) < 2 or len(spots) == 0:
+        return empty
+
+    # 1. 구간별 bbox(+버퍼)로 격자 후보 수집 → (후보, 구간) 쌍
+    buffer_lat = buffer_m / METERS_PER_DEG_LAT
+    buffer_lng = buffer_m / (METERS_PER_DEG_LNG_EQUATOR * math.cos(math.radians(float(np.abs(path[:, 0]).max()))))
+    seg_min = np.minimum(path[:-1], path[1:])
+    seg_max = np.maximum(path[:-1], path[1:])
+    candidate_chunks = [
+        spots.indices_in_bbox(lo[0] - buffer_lat, lo[1] - buffer_lng, hi[0] + buffer_lat, hi[1] + buffer_lng)
+        for lo, hi in zip(seg_min, seg_max)
+    ]
+    pair_spot = np.concatenate(candidate_chunks)
+    if not len(pair_spot):
+        return empty
+    pair_seg = np.repeat(np.arange(len(candidate_chunks)), [len(chunk) for chunk in candidate_chunks])
+
+    # 2. 평면 좌표에서 점-선분 거리를 쌍 단위 벡터 연산으로 계산
+    origin_lat = float(path[:, 0].mean())
+    vertices = _local_xy(path[:, 0], path[:, 1], origin_lat)
+    starts, deltas = vertices[:-1], vertices[1:] - vertices[:-1]
+    seg_len2 = np.maximum((deltas ** 2).sum(axis=1), 1e-9)
+    seg_len = np.sqrt(seg_len2)
+    seg_offset = np.concatenate([[0.0], np.cumsum(seg_len)[:-1]])
+
+    points = _local_xy(spots.lat[pair_spot], spots.lng[pair_spot], origin_lat)
+    rel = points - starts[pair_seg]
+    t = np.clip((rel * deltas[pair_seg]).sum(axis=1) / seg_len2[pair_seg], 0.0, 1.0)
+    distance = np.sqrt(((rel - t[:, None] * deltas[pair_seg]) ** 2).sum(axis=1))
+    along = seg_offset[pair_seg] + t * seg_len[pair_seg]
+
+    # 장소마다 가장 가까운 구간 하나만 남김
+    order = np.lexsort((distance, pair_spot))
+    pair_spot, distance, along = pair_spot[order], distance[order], along[order]
+    _, first = np.unique(pair_spot, return_index=True)
+    candidates, distance, along = pair_spot[first], distance[first], along[first]
+
+    # 3. 버퍼 안의 장소를 경로 진행 순(같으면 경로에 가까운 순)으로 정렬
+    inside = distance <= buffer_m
+    candidates, distance, along = candidates[inside], distance[inside], along[inside]
+    order = np.lexsort((distance, along))[:limit]
+    return candidates[order], distance[order], along[order]
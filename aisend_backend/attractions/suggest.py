@@ -0,0 +1,114 @@
+"""
+검색어 자동완성(typeahead) 인덱스
+
+장소명과 지역명을 정렬된 배열로 보관하고 이진 탐색으로 접두사 범위를 찾습니다.
+- 장소명의 각 단어 시작 위치부터의 접미사를 키로 넣어 "카페" → "애월 카페거리"도 찾습니다.
+- 초성 키를 별도 배열로 두어 "ㅈㅈ" → "제주" 같은 초성 검색을 지원합니다.
+- 결과는 인기도(점수) 순 top-k이며, 범위가 넓은 1~2글자 접두사는 빌드 시 top-k를 미리 계산합니다.
+"""
+import heapq
+from bisect import bisect_left
+from collections import Counter
+
+from .catalog import GenerationCache
+from .gazetteer import get_gazetteer
+from .hangul import to_choseong, is_choseong_query
+from .models import PetTourSpot
+
+# 미리 top-k를 계산할 접두사 최대 길이와 k
+PRECOMPUTED_PREFIX_LENGTH = 2
+MAX_SUGGESTIONS = 20
+
+_KEY_END = '\U0010ffff'
+
+
+def normalize_query(text):
+    return ''.join((text or '').split()).lower()
+
+
+def _entry_keys(text):
+    """단어 시작 위치마다의 접미사 키 ("애월 카페거리" → ["애월카페거리", "카페거리"])"""
+    words = text.lower().split()
+    return [''.join(words[i:]) for i in range(len(words))]
+
+
+class _PrefixArray:
+    """정렬된 (키, 항목 번호) 배열과 짧은 접두사 top-k 캐시"""
+
+    def __init__(self, pairs, weights):
+        pairs.sort()
+        self.keys = [key for key, _ in pairs]
+        self.ids = [entry_id for _, entry_id in pairs]
+        self.weights = weights
+        self.top = {}
+
+        prefixes = {key[:length] for key in self.keys for length in range(1, PRECOMPUTED_PREFIX_LENGTH + 1)}
+        for prefix in prefixes:
+            self.top[prefix] = self._scan(prefix, MAX_SUGGESTIONS)
+
+    def _scan(self, prefix, limit):
+        lo = bisect_left(self.keys, prefix)
+        hi = bisect_left(self.keys, prefix + _KEY_END, lo)
+        entry_ids = set(self.ids[lo:hi])
+        return heapq.nlargest(limit, entry_ids, key=lambda i: (self.weights[i], -i))
+
+    def search(self, prefix, limit):
+        if prefix in self.top:
+            return self.top[prefix][:limit]
+        return self._scan(prefix, limit)
+
+
+class SuggestIndex:
+    def __init__(self, entries):
+        """entries: {'text', 'type', 'id', 'weight'} 목록"""
+        self.entries = entries
+        weights = [entry['weight'] for entry in entries]
+
+        pairs = []
+        choseong_pairs = []
+        for entry_id, entry in enumerate(entries):
+            for key in _entry_keys(entry['text']):
+                pairs.append((key, entry_id))
+                choseong_pairs.append((to_choseong(key), entry_id))
+
+        self._text = _PrefixArray(pairs, weights)
+        self._choseong = _PrefixArray(choseong_pairs, weights)
+
+    def suggest(self, query, limit=10):
+        prefix = normalize_query(query)
+        if not prefix:
+            return []
+        limit = min(limit, MAX_SUGGESTIONS)
+        array = self._choseong if is_choseong_query(prefix) else self._text
+        return [self.entries[entry_id] for entry_id in array.search(prefix, limit)]
+
+
+def build_suggest_index():
+    entries = []
+    region_counts = Counter()
+
+    for contentid, title, score, areacode, sigungucode in PetTourSpot.objects.values_list(
+            'contentid', 'title', 'score', 'areacode', 'sigungucode').iterator(chunk_size=2000):
+        if title:
+            entries.append({'text': title, 'type': 'place', 'id': contentid, 'weight': score})
+        region_counts[(areacode, None)] += 1
+        region_counts[(areacode, sigungucode)] += 1
+
+    # 지역명은 장소보다 우선하고, 장소가 많은 지역일수록 앞에 노출 (가중치 1.0 ~ 2.0)
+    max_count = max(region_counts.values(), default=1)
+    gazetteer = get_gazetteer()
+    regions = list(gazetteer.areas.values()) + list(gazetteer.sigungus.values())
+    for region in regions:
+        weight = 1.0 + region_counts.get((region.areacode, region.sigungucode), 0) / max_count
+        region_id = f'{region.areacode}-{region.sigungucode}' if region.sigungucode else region.areacode
+        entries.append({'text': region.name, 'type': 'region', 'id': region_id, 'weight': round(weight, 4)})
+
+    return SuggestIndex(entries)
+
+
+_suggest_index = GenerationCache(build_suggest_index)
+
+
+def suggest(query, limit=10):
+    """현재 카탈로그 세대의 자동완성 결과"""
+    return _suggest_index.get().suggest(query, limit)
@@ -1,19 +1,1148 @@
-from django.test import TestCase
-from .models import Attraction
+import gzip
+import math
+import os
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import Future
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock, skipIf
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import orjson
+from django.conf import settings
+from django.contrib import admin
+from django.core.cache import cache, caches
+from django.db import connection
+from django.test import TestCase, SimpleTestCase, override_settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+from backend.middleware import CompressionMiddleware, brotli, choose_encoding
+from backend.renderers import ORJSONRenderer
+from .models import PetTourSpot, CatalogGeneration, CatalogChange, KakaoPlace, KakaoSearch, SpotNeighbors
+from .scoring import score_place, rating_from_score
+from .catalog import bump_generation, current_generation
+from .admin import PetTourSpotAdmin
+from .bundles import export_region_bundles
+from .changes import record_changes
+from .export import iter_rows
+from .kakao_store import search_places_cached, upsert_documents
+from .resolution import normalize_name, dedupe_places, GRID_CELL_DEG
+from .gazetteer import Gazetteer
+from .hangul import to_choseong, decompose
+from .suggest import SuggestIndex
+from .fuzzy import FuzzyIndex, substring_distance
+from .clustering import ClusterIndex
+from .tiles import encode_tile, decode_tile, tile_bounds, _tile_position, get_tile
+from .spatial import SpotArrays, corridor_search
+from .neighbors import compute_neighbors, rebuild_neighbors
+from . import travel_times
+from .travel_times import travel_minutes, travel_time_matrix, TravelTimeStore
+from .plan_cache import normalize_plan_request, plan_key, plan_id_from_key, get_or_build_plan
+from .plan_stream import format_sse, format_ndjson
+from .replan import repair_route, route_minutes
+from .anytime import improve_route
+from .plan_pool import optimize_route
+from .plan_scoring import CandidateArrays, score_candidates, top_k, iter_day_selections
+from .views import AITripPlannerView, AITripPlanBatchView, AITripPlanStreamView, AITripPlanJobView, AITripPlanJobDetailView, LocationBasedTripView, CatalogExportView, AttractionListView, RegionBundleView, RegionBundleFileView, CatalogChangesView, AttractionDetailView, NearbyPlacesView, ClusterView, CorridorSearchView
+
+class ORJSONRendererTests(SimpleTestCase):
+    def test_renders_utf8_without_escaping(self):
+        body = ORJSONRenderer().render({'name': '제주', 'score': Decimal('1.5'), 1: None})
+        self.assertEqual(body, '{"name":"제주","score":1.5,"1":null}'.encode('utf-8'))
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+
+@override_settings(COMPRESSION_MIN_SIZE=100)
+class CompressionMiddlewareTests(SimpleTestCase):
+    body = ('{"name": "제주 관광지"}' * 50).encode('utf-8')
+
+    def _get(self, response, accept_encoding='gzip, deflate, br'):
+        request = APIRequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_chooses_gzip_without_brotli(self):
+        with mock.patch('backend.middleware.brotli', None):
+            self.assertEqual(choose_encoding('gzip, deflate, br'), 'gzip')
+            self.assertEqual(choose_encoding('*'), 'gzip')
+            self.assertIsNone(choose_encoding('br'))
+        self.assertIsNone(choose_encoding('identity'))
+        self.assertIsNone(choose_encoding('gzip;q=0, br;q=0'))
+
+    @skipIf(brotli is None, 'brotli 미설치')
+    def test_chooses_brotli_by_q_value(self):
+        self.assertEqual(choose_encoding('gzip, deflate, br'), 'br')
+        self.assertEqual(choose_encoding('gzip;q=1.0, br;q=0.5'), 'gzip')
+        self.assertEqual(choose_encoding('*'), 'br')
+
+        response = self._get(HttpResponse(self.body))
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), self.body)
+
+    def test_compresses_above_threshold_with_vary(self):
+        response = self._get(HttpResponse(self.body), accept_encoding='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), self.body)
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_small_response_not_compressed(self):
+        response = self._get(HttpResponse(self.body[:99]))
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content, self.body[:99])
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_skips_streaming_and_encoded_responses(self):
+        response = self._get(StreamingHttpResponse(iter([self.body])))
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(b''.join(response.streaming_content), self.body)
+
+        encoded = HttpResponse(gzip.compress(self.body))
+        encoded['Content-Encoding'] = 'gzip'
+        response = self._get(encoded, accept_encoding='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), self.body)
+
+    def test_strong_etag_weakened_after_compression(self):
+        response = HttpResponse(self.body)
+        response['ETag'] = '"abc"'
+        self.assertEqual(self._get(response)['ETag'], 'W/"abc"')
+
+        response = HttpResponse(self.body[:99])
+        response['ETag'] = '"abc"'
+        self.assertEqual(self._get(response)['ETag'], '"abc"')
+
 
 class AttractionModelTests(TestCase):
     def setUp(self):
-        Attraction.objects.create(
-            name="테스트 장소",
-            description="테스트 설명",
-            latitude=37.5665,
-            longitude=126.9780,
-            address="서울시 중구",
-            rating=4.5,
+        PetTourSpot.objects.create(
+            contentid="1001",
+            title="테스트 장소",
+            overview="테스트 설명",
+            mapy=37.5665,
+            mapx=126.9780,
+            addr1="서울시 중구",
+            contenttypeid=PetTourSpot.CONTENT_TYPE_ATTRACTION,
         )
     
     def test_attraction_creation(self):
         """관광 명소 생성 테스트"""
-        attraction = Attraction.objects.get(name="테스트 장소")
-        self.assertEqual(attraction.rating, 4.5)
-        self.assertEqual(attraction.address, "서울시 중구")
+        attraction = PetTourSpot.objects.get(title="테스트 장소")
+        self.assertEqual(attraction.contenttypeid, "12")
+        self.assertEqual(attraction.addr1, "서울시 중구")
+
+
+class ScoringTests(SimpleTestCase):
+    def test_score_is_deterministic(self):
+        """같은 신호는 항상 같은 점수"""
+        first = score_place(image_url='http://img', overview='가' * 300, tel='064', has_coords=True)
+        second = score_place(image_url='http://img', overview='가' * 300, tel='064', has_coords=True)
+        self.assertEqual(first, second)
+
+    def test_richer_place_scores_higher(self):
+        """이미지/개요가 있는 장소가 더 높은 점수"""
+        rich = score_place(image_url='http://img', overview='가' * 600, tel='064', has_coords=True)
+        poor = score_place(has_coords=True)
+        self.assertGreater(rich, poor)
+        self.assertEqual(rating_from_score(rich), 5.0)
+        self.assertEqual(rating_from_score(0.0), 3.5)
+
+
+class CatalogConditionalTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = APIRequestFactory()
+
+    def test_not_modified_until_write(self):
+        """같은 세대에서는 304, 생성이 성공하면 세대가 올라 ETag가 바뀜"""
+        etag = AttractionListView.as_view()(self.factory.get('/attractions/'))['ETag']
+        response = AttractionListView.as_view()(self.factory.get('/attractions/', HTTP_IF_NONE_MATCH=etag))
+        self.assertEqual(response.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = AttractionListView.as_view()(self.factory.post('/attractions/', {'contentid': '1', 'title': '새 장소'}))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(CatalogGeneration.objects.count(), 1)
+        response = AttractionListView.as_view()(self.factory.get('/attractions/', HTTP_IF_NONE_MATCH=etag))
+        self.assertEqual(response.status_code, 200)
+
+    def test_failed_write_keeps_generation(self):
+        response = AttractionListView.as_view()(self.factory.post('/attractions/', {'title': '장소'}))
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(CatalogGeneration.objects.exists())
+
+
+class CatalogAdminWriteTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = PetTourSpotAdmin(PetTourSpot, admin.site)
+        self.request = APIRequestFactory().post('/admin/')
+
+    def test_admin_save_and_delete_bump_generation(self):
+        """관리자 수정/삭제도 세대를 올리고 변경 로그에 기록"""
+        spot = PetTourSpot(contentid='a1', title='관리자 장소')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.admin.save_model(self.request, spot, form=None, change=False)
+        self.assertEqual(current_generation(), 1)
+
+        PetTourSpot.objects.create(contentid='a2', title='장소2')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.admin.delete_queryset(self.request, PetTourSpot.objects.all())
+        self.assertEqual(current_generation(), 2)
+        self.assertEqual(
+            list(CatalogChange.objects.order_by('generation', 'contentid').values_list('generation', 'contentid', 'op')),
+            [(1, 'a1', CatalogChange.OP_UPSERT), (2, 'a1', CatalogChange.OP_DELETE), (2, 'a2', CatalogChange.OP_DELETE)],
+        )
+
+
+class CatalogCursorPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = APIRequestFactory()
+        PetTourSpot.objects.bulk_create([PetTourSpot(contentid=f'c{i}', title=f'장소{i}') for i in range(120)])
+
+    def _get(self, **params):
+        return AttractionListView.as_view()(self.factory.get('/attractions/', params))
+
+    def test_cursor_stable_across_inserts(self):
+        """다음 페이지 커서는 마지막 id 기준이라 사이에 추가된 행 때문에 중복/누락되지 않음"""
+        first = self._get(page_size=50)
+        PetTourSpot.objects.create(contentid='new', title='새 장소')
+        cursor = parse_qs(urlsplit(first.data['next']).query)['cursor'][0]
+        second = self._get(page_size=50, cursor=cursor)
+        first_ids = [row['id'] for row in first.data['results']]
+        second_ids = [row['id'] for row in second.data['results']]
+        self.assertEqual(len(set(first_ids) | set(second_ids)), 100)
+        self.assertLess(max(first_ids), min(second_ids))
+
+    def test_page_size_capped(self):
+        self.assertEqual(len(self._get(page_size=500).data['results']), 100)
+
+    def test_count_cached_per_generation(self):
+        """총 개수는 with_count=true일 때만, 같은 세대에서는 캐시된 값"""
+        self.assertNotIn('count', self._get().data)
+        self.assertEqual(self._get(with_count='true').data['count'], 120)
+        PetTourSpot.objects.create(contentid='new', title='새 장소')
+        with self.assertNumQueries(1):
+            self.assertEqual(self._get(with_count='true').data['count'], 120)
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_generation(reason='test')
+        self.assertEqual(self._get(with_count='true').data['count'], 121)
+
+
+class RegionBundleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = APIRequestFactory()
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        self.enterContext(override_settings(BUNDLE_ROOT=root.name))
+        PetTourSpot.objects.create(contentid='a', title='제주 장소', areacode='39', mapx=126.5, mapy=33.5, firstimage='http://img')
+        PetTourSpot.objects.create(contentid='b', title='서울 장소', areacode='1')
+
+    def test_export_writes_bundle_per_area(self):
+        manifest = export_region_bundles(1)
+        self.assertEqual([(b['areacode'], b['count']) for b in manifest['bundles']], [('1', 1), ('39', 1)])
+        path = os.path.join(settings.BUNDLE_ROOT, '1', manifest['bundles'][1]['filename'])
+        conn = sqlite3.connect(path)
+        try:
+            self.assertEqual(conn.execute('SELECT id, lat, flags FROM places').fetchall(), [('a', 33.5, 3)])
+            self.assertEqual(dict(conn.execute('SELECT key, value FROM meta'))['generation'], '1')
+        finally:
+            conn.close()
+
+    def test_etag_follows_exported_generation(self):
+        """카탈로그 세대가 올라가도 번들을 다시 내보내기 전까지는 이전 매니페스트의 ETag 유지"""
+        export_region_bundles(1)
+        first = RegionBundleView.as_view()(self.factory.get('/bundles/'))
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_generation(reason='test')
+        stale = RegionBundleView.as_view()(self.factory.get('/bundles/', HTTP_IF_NONE_MATCH=first['ETag']))
+        self.assertEqual(stale.status_code, 304)
+
+        export_region_bundles(2)
+        second = RegionBundleView.as_view()(self.factory.get('/bundles/', HTTP_IF_NONE_MATCH=first['ETag']))
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.data['bundles'][0]['url'], 'http://testserver/bundles/2/area_1.sqlite')
+
+    def test_serve_bundle_file(self):
+        export_region_bundles(1)
+        response = RegionBundleFileView.as_view()(self.factory.get('/bundles/1/area_39.sqlite'), generation=1, filename='area_39.sqlite')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('immutable', response['Cache-Control'])
+        response.close()
+        response = RegionBundleFileView.as_view()(self.factory.get('/bundles/1/manifest.json'), generation=1, filename='../1/manifest.json')
+        self.assertEqual(response.status_code, 404)
+
+
+class CatalogChangesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = APIRequestFactory()
+        self.spot = PetTourSpot.objects.create(contentid='b', title='새 장소', modifiedtime='29991231000000')
+
+    def _bump(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return bump_generation(reason='test')
+
+    def _get(self, since):
+        return CatalogChangesView.as_view()(self.factory.get('/changes/', {'since': since}))
+
+    def test_changes_since_generation_include_deletes(self):
+        first = self._bump()
+        record_changes(first, [PetTourSpot(contentid='a', modifiedtime='20240101000000')], [])
+        second = self._bump()
+        record_changes(second, [self.spot], ['a'])
+
+        response = self._get(first)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([(c['op'], c['contentid']) for c in response.data['changes']], [('upsert', 'b'), ('delete', 'a')])
+        self.assertEqual(response.data['changes'][0]['place']['title'], '새 장소')
+
+    def test_timestamp_uses_generation_clock(self):
+        """시각은 그 시각까지의 마지막 세대로 바꿔 조회 (upsert의 TourAPI modifiedtime과 무관)"""
+        generation = self._bump()
+        record_changes(generation, [self.spot], ['a'])
+        before = (CatalogGeneration.objects.get(pk=generation).created_at - timedelta(seconds=1))
+        since = timezone.localtime(before).strftime('%Y%m%d%H%M%S')
+        self.assertEqual(len(self._get(since).data['changes']), 2)
+        self.assertEqual(self._get('29991231235959').data['changes'], [])
+
+    @override_settings(CATALOG_CHANGE_RETENTION_GENERATIONS=1)
+    def test_expired_cursor_gone_on_both_paths(self):
+        for _ in range(3):
+            self._bump()
+        self.assertEqual(self._get('0').status_code, 410)
+        self.assertEqual(self._get('20000101000000').status_code, 410)
+        self.assertEqual(self._get('2').status_code, 200)
+
+    def test_api_delete_recorded(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = AttractionDetailView.as_view()(self.factory.delete(f'/{self.spot.pk}/'), pk=self.spot.pk)
+        self.assertEqual(response.status_code, 204)
+        change = CatalogChange.objects.get()
+        self.assertEqual((change.op, change.contentid, change.generation), ('delete', 'b', 1))
+
+
+class FakeKakaoService:
+    """search_places 호출 횟수를 세는 카카오 API 대역"""
+
+    def __init__(self, name='애월 카페'):
+        self.calls = 0
+        self.name = name
+
+    def search_places(self, query, **params):
+        self.calls += 1
+        return {'meta': {}, 'documents': [{'id': '900', 'place_name': self.name, 'x': '126.31', 'y': '33.46'}]}
+
+
+@mock.patch('attractions.kakao_store.close_old_connections')
+@mock.patch('attractions.kakao_store._refresh_executor')
+class KakaoStoreTests(TestCase):
+    def test_miss_fetches_then_hit_reads_store(self, executor, _):
+        service = FakeKakaoService()
+        first = search_places_cached(service, '애월 카페', x=126.31, y=33.46)
+        second = search_places_cached(service, '애월 카페', x=126.3101, y=33.4601)
+        self.assertEqual(service.calls, 1)
+        self.assertEqual(first['documents'][0]['place_name'], '애월 카페')
+        self.assertEqual(second['documents'][0]['id'], '900')
+        executor.submit.assert_not_called()
+
+    def test_stale_served_then_refreshed_once(self, executor, _):
+        """오래된 결과는 저장된 값으로 응답하고, 동시에 들어온 요청도 갱신 작업은 하나만 예약"""
+        search_places_cached(FakeKakaoService(), '애월 카페')
+        KakaoSearch.objects.update(fetched_at=timezone.now() - timedelta(hours=settings.KAKAO_STORE_TTL_HOURS + 1))
+
+        service = FakeKakaoService(name='애월 카페 본점')
+        for _ in range(3):
+            self.assertEqual(search_places_cached(service, '애월 카페')['documents'][0]['place_name'], '애월 카페')
+        self.assertEqual(executor.submit.call_count, 1)
+        self.assertEqual(service.calls, 0)
+
+        executor.submit.call_args.args[0]()
+        self.assertEqual(service.calls, 1)
+        self.assertEqual(KakaoPlace.objects.get(kakao_id='900').place_name, '애월 카페 본점')
+        self.assertEqual(search_places_cached(service, '애월 카페')['documents'][0]['place_name'], '애월 카페 본점')
+        self.assertEqual(executor.submit.call_count, 1)
+
+    def test_error_response_not_stored(self, executor, _):
+        service = FakeKakaoService()
+        service.search_places = lambda query, **params: {'documents': []}
+        search_places_cached(service, '애월 카페')
+        self.assertFalse(KakaoSearch.objects.exists())
+
+    def test_upsert_without_conflict_target(self, executor, _):
+        """MySQL처럼 충돌 대상 지정이 안 되는 DB에서도 추가/갱신"""
+        with mock.patch.object(connection.features, 'supports_update_conflicts_with_target', False):
+            upsert_documents([{'id': '900', 'place_name': '애월 카페', 'x': '126.31', 'y': '33.46'}])
+            upsert_documents([
+                {'id': '900', 'place_name': '애월 카페 본점', 'x': '126.31', 'y': '33.46'},
+                {'id': '901', 'place_name': '협재 카페', 'x': '126.24', 'y': '33.39'},
+            ])
+        self.assertEqual(KakaoPlace.objects.count(), 2)
+        self.assertEqual(KakaoPlace.objects.get(kakao_id='900').place_name, '애월 카페 본점')
+
+
+class RegionFilterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        # 경기도 장소들의 좌표 범위 안에 서울 장소가 있음
+        for i, (lat, lng) in enumerate([(37.2, 126.8), (37.8, 127.3), (37.4, 127.1), (37.6, 126.9), (37.3, 127.2)]):
+            PetTourSpot.objects.create(contentid=f'g{i}', title=f'경기 장소{i}', areacode='31', sigungucode='1',
+                                       addr1='경기도 고양시', mapy=lat, mapx=lng)
+        PetTourSpot.objects.create(contentid='s0', title='서울 장소', areacode='1', sigungucode='1',
+                                   addr1='서울특별시 중구', mapy=37.56, mapx=126.97)
+
+    def test_province_excludes_neighbouring_regions(self):
+        """도 단위 검색은 지역코드로 걸러 좌표 범위가 겹치는 서울 장소를 포함하지 않음"""
+        request = APIRequestFactory().get('/attractions/', {'location': '경기'})
+        results = AttractionListView.as_view()(request).data['results']
+        self.assertEqual(sorted(row['contentid'] for row in results), [f'g{i}' for i in range(5)])
+
+
+class CatalogExportTests(TestCase):
+    def setUp(self):
+        for i, contenttypeid in enumerate(['12', '39', '12', '12', '39']):
+            PetTourSpot.objects.create(contentid=f'c{i}', title=f'장소{i}', contenttypeid=contenttypeid)
+
+    def test_keyset_chunks(self):
+        """chunk_size씩 id 순으로 끊어 읽고, 요청하지 않은 id는 빼고 반환"""
+        with self.assertNumQueries(3):
+            rows = list(iter_rows(PetTourSpot.objects.all(), ['contentid'], chunk_size=2))
+        self.assertEqual(rows, [{'contentid': f'c{i}'} for i in range(5)])
+
+    def test_stream_attractions_source(self):
+        """attractions 대상은 관광지 콘텐츠 타입만 NDJSON으로 스트리밍"""
+        request = APIRequestFactory().get('/export/attractions/', {'fields': 'contentid,contenttypeid'})
+        response = CatalogExportView.as_view()(request, source='attractions')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).splitlines()
+        self.assertEqual(lines, [b'{"contentid":"c0","contenttypeid":"12"}',
+                                 b'{"contentid":"c2","contenttypeid":"12"}',
+                                 b'{"contentid":"c3","contenttypeid":"12"}'])
+
+    def test_unknown_source(self):
+        request = APIRequestFactory().get('/export/foods/')
+        self.assertEqual(CatalogExportView.as_view()(request, source='foods').status_code, 404)
+
+
+class EntityResolutionTests(SimpleTestCase):
+    def test_normalize_name(self):
+        """공백/괄호/특수문자 차이는 같은 이름으로 정규화"""
+        self.assertEqual(normalize_name('성산일출봉 (UNESCO 세계자연유산)'), normalize_name('성산 일출봉'))
+
+    def test_dedupe_across_sources(self):
+        """이름이 같고 가까운 장소는 출처가 달라도 하나만 남김"""
+        places = [
+            {'id': 'pet_1', 'name': '애월 카페거리', 'latitude': 33.4630, 'longitude': 126.3100},
+            {'id': 'kakao_9', 'name': '애월카페거리', 'latitude': 33.4633, 'longitude': 126.3102},
+            {'id': 'kakao_10', 'name': '애월카페거리', 'latitude': 33.5000, 'longitude': 126.5000},
+            {'id': 'pet_1', 'name': '애월 카페거리', 'latitude': 33.4630, 'longitude': 126.3100},
+        ]
+        self.assertEqual([p['id'] for p in dedupe_places(places)], ['pet_1', 'kakao_10'])
+
+    def test_dedupe_independent_of_cell_boundaries(self):
+        """130m 떨어진 같은 이름의 두 장소는 격자 셀 경계를 어디서 넘든 하나로 합쳐짐"""
+        lat = 33.5
+        lng_step = 130 / (111320 * math.cos(math.radians(lat)))
+        for offset in (0.01, 0.3, 0.6, 0.99):
+            lng = (math.floor(126.5 / GRID_CELL_DEG) + offset) * GRID_CELL_DEG
+            for d_lat, d_lng in ((0, lng_step), (130 / 111320, 0)):
+                places = [
+                    {'id': 'pet_1', 'name': '성산일출봉', 'latitude': lat, 'longitude': lng},
+                    {'id': 'kakao_1', 'name': '성산일출봉', 'latitude': lat + d_lat, 'longitude': lng + d_lng},
+                ]
+                self.assertEqual([p['id'] for p in dedupe_places(places)], ['pet_1'])
+
+
+class GazetteerTests(SimpleTestCase):
+    def setUp(self):
+        rows = [('39', '3', '제주특별자치도 서귀포시 성산읍', 33.45 + i * 0.01, 126.9 - i * 0.05) for i in range(5)]
+        rows += [('39', '4', '제주특별자치도 제주시 애월읍', 33.46, 126.31)]
+        rows += [('6', '16', '부산광역시 해운대구 우동', 35.16, 129.16)]
+        rows += [('6', '15', '부산광역시 중구 남포동', 35.10, 129.03), ('4', '5', '대구광역시 중구 동인동', 35.87, 128.60)]
+        self.gazetteer = Gazetteer(rows)
+
+    def test_resolve_alias_and_full_name(self):
+        """별칭과 정식 주소가 같은 시군구로 해석"""
+        short = self.gazetteer.resolve('서귀포')
+        full = self.gazetteer.resolve('제주특별자치도 서귀포시')
+        self.assertEqual((short.areacode, short.sigungucode), ('39', '3'))
+        self.assertEqual(short, full)
+        self.assertIsNotNone(short.bbox)
+
+    def test_resolve_area_and_compact_input(self):
+        self.assertEqual(self.gazetteer.resolve('제주').sigungucode, None)
+        self.assertEqual(self.gazetteer.resolve('부산해운대').sigungucode, '16')
+
+    def test_ambiguous_or_unknown(self):
+        """여러 시도에 있는 구 이름은 시도가 있어야 해석"""
+        self.assertIsNone(self.gazetteer.resolve('중구'))
+        self.assertEqual(self.gazetteer.resolve('부산 중구').sigungucode, '15')
+        self.assertIsNone(self.gazetteer.resolve('애월읍'))
+
+
+class SuggestTests(SimpleTestCase):
+    def setUp(self):
+        self.index = SuggestIndex([
+            {'text': '애월 카페거리', 'type': 'place', 'id': '1', 'weight': 0.4},
+            {'text': '제주 반려견 해변', 'type': 'place', 'id': '2', 'weight': 0.9},
+            {'text': '제주 숲길', 'type': 'place', 'id': '3', 'weight': 0.2},
+            {'text': '제주특별자치도', 'type': 'region', 'id': '39', 'weight': 1.5},
+        ])
+
+    def test_hangul(self):
+        self.assertEqual(to_choseong('제주 카페'), 'ㅈㅈ ㅋㅍ')
+        self.assertEqual(decompose('강'), 'ㄱㅏㅇ')
+
+    def test_prefix_ranked_by_weight(self):
+        """지역명이 먼저, 장소는 점수 순"""
+        ids = [entry['id'] for entry in self.index.suggest('제주')]
+        self.assertEqual(ids, ['39', '2', '3'])
+        self.assertEqual([e['id'] for e in self.index.suggest('제주 반')], ['2'])
+
+    def test_word_start_and_choseong(self):
+        self.assertEqual([e['id'] for e in self.index.suggest('카페')], ['1'])
+        self.assertEqual([e['id'] for e in self.index.suggest('ㅈㅈ', limit=2)], ['39', '2'])
+        self.assertEqual(self.index.suggest(''), [])
+
+
+class FuzzySearchTests(SimpleTestCase):
+    def setUp(self):
+        self.index = FuzzyIndex([
+            (1, '제주 숲길', 0.2),
+            (2, '애월 카페거리', 0.4),
+            (3, '해운대 해수욕장', 0.9),
+            (4, '제주 숲속 캠핑장', 0.5),
+        ])
+
+    def test_substring_distance(self):
+        self.assertEqual(substring_distance('abc', 'xxabcxx', 2), 0)
+        self.assertEqual(substring_distance('abd', 'xxabcxx', 2), 1)
+        self.assertEqual(substring_distance('zzzz', 'abc', 1), 2)
+
+    def test_typo_matches(self):
+        """받침/모음 오타와 띄어쓰기 차이를 허용"""
+        self.assertEqual(self.index.search('제주숩길')[0], (1, 1))
+        self.assertEqual(self.index.search('해운데 해수욕장')[0][0], 3)
+        self.assertEqual(self.index.search('애윌카페')[0][0], 2)
+
+    def test_unrelated_query(self):
+        self.assertEqual(self.index.search('서울역'), [])
+        self.assertEqual(self.index.search(''), [])
+
+
+class ClusterIndexTests(SimpleTestCase):
+    def setUp(self):
+        # 제주 시내 3곳(서로 수십 m), 서귀포 1곳, 좌표 없는 1곳
+        self.index = ClusterIndex([
+            ('a', 33.4996, 126.5312, 0.3),
+            ('b', 33.4997, 126.5313, 0.8),
+            ('c', 33.4998, 126.5311, 0.1),
+            ('d', 33.2541, 126.5601, 0.5),
+            ('e', None, None, 0.9),
+        ])
+        self.jeju_bbox = (33.1, 126.1, 33.6, 127.0)
+
+    def test_low_zoom_merges_with_representative(self):
+        clusters = self.index.clusters(*self.jeju_bbox, zoom=3)
+        self.assertEqual(len(clusters), 1)
+        self.assertEqual(clusters[0]['count'], 4)
+        self.assertEqual(clusters[0]['id'], 'b')
+
+    def test_high_zoom_splits(self):
+        clusters = self.index.clusters(*self.jeju_bbox, zoom=10)
+        self.assertEqual(sorted(c['count'] for c in clusters), [1, 3])
+        self.assertEqual(sum(c['count'] for c in self.index.clusters(*self.jeju_bbox, zoom=20)), 4)
+
+    def test_bbox_excludes_outside(self):
+        self.assertEqual(self.index.clusters(37.4, 126.8, 37.7, 127.2, zoom=10), [])
+
+
+class ClusterViewTests(TestCase):
+    def test_rejects_non_finite_or_out_of_range_bbox(self):
+        factory = APIRequestFactory()
+        for bbox in ('nan,nan,nan,nan', '-inf,-inf,inf,inf', '126.1,33.1,127.0,95.0', '126.1,33.1,200.0,33.6'):
+            with mock.patch('attractions.views.get_clusters') as get_clusters:
+                response = ClusterView.as_view()(factory.get('/clusters/', {'bbox': bbox, 'zoom': 10}))
+            self.assertEqual(response.status_code, 400, bbox)
+            get_clusters.assert_not_called()
+
+
+class MapTileTests(SimpleTestCase):
+    def test_encode_decode_roundtrip(self):
+        points = [(1, 10, 0, 65535, 12, 3), (2, 4000000000, 32768, 1, 39, 4)]
+        data = encode_tile(7, points)
+        self.assertEqual(len(data), 13 + 11 * len(points))
+        self.assertEqual(decode_tile(data), (7, points))
+
+    def test_position_inside_tile_bounds(self):
+        """장소가 투영된 타일의 범위 안에 들어감"""
+        lat, lng = 33.4996, 126.5312
+        tile_x, tile_y, local_x, local_y = _tile_position(lat, lng, 12)
+        min_lat, min_lng, max_lat, max_lng = tile_bounds(12, tile_x, tile_y)
+        self.assertTrue(min_lat <= lat <= max_lat and min_lng <= lng <= max_lng)
+        self.assertTrue(0 <= local_x <= 65535 and 0 <= local_y <= 65535)
+
+
+class MapTileCacheTests(TestCase):
+    lat, lng = 33.4996, 126.5312
+
+    def setUp(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        self.enterContext(override_settings(TILE_ROOT=root.name, TILE_PRERENDER_MAX_ZOOM=12, TILE_KEEP_GENERATIONS=2))
+        self.spot = PetTourSpot.objects.create(contentid='a', title='장소', mapy=self.lat, mapx=self.lng, contenttypeid='12')
+        KakaoPlace.objects.create(kakao_id='k', place_name='카카오 장소', x=self.lng, y=self.lat, fetched_at=timezone.now())
+
+    def _stored_files(self):
+        return sorted(os.path.relpath(os.path.join(d, f), settings.TILE_ROOT)
+                      for d, _, files in os.walk(settings.TILE_ROOT) for f in files)
+
+    def test_catalog_points_only_stored_up_to_prerender_zoom(self):
+        for z in (12, 14):
+            tile_x, tile_y, _, _ = _tile_position(self.lat, self.lng, z)
+            generation, points = decode_tile(get_tile(1, z, tile_x, tile_y))
+            self.assertEqual([(p[0], p[1]) for p in points], [(1, self.spot.pk)])
+        tile_x, tile_y, _, _ = _tile_position(self.lat, self.lng, 12)
+        self.assertEqual(self._stored_files(), [f'1/12/{tile_x}/{tile_y}.bin'])
+
+    def test_empty_tile_not_stored(self):
+        self.assertEqual(decode_tile(get_tile(1, 12, 0, 0)), (1, []))
+        self.assertEqual(self._stored_files(), [])
+
+    def test_lazy_write_prunes_old_generations(self):
+        tile_x, tile_y, _, _ = _tile_position(self.lat, self.lng, 10)
+        for generation in (1, 2, 3):
+            get_tile(generation, 10, tile_x, tile_y)
+        self.assertEqual(sorted(os.listdir(settings.TILE_ROOT)), ['2', '3'])
+        get_tile(1, 10, tile_x, tile_y)
+        self.assertEqual(sorted(os.listdir(settings.TILE_ROOT)), ['2', '3'])
+
+
+class CorridorSearchTests(SimpleTestCase):
+    def setUp(self):
+        # 동서 방향 경로(위도 33.40) 주변 장소
+        self.spots = SpotArrays([
+            (1, 33.401, 126.60, 0.5),   # 경로 후반, 약 110m
+            (2, 33.399, 126.52, 0.5),   # 경로 초반, 약 110m
+            (3, 33.450, 126.55, 0.5),   # 약 5.5km 떨어짐
+            (4, 33.400, 126.90, 0.5),   # 경로 끝 너머
+            (5, None, None, 0.5),
+        ])
+        self.path = [(33.40, 126.50), (33.40, 126.70)]
+
+    def test_orders_by_position_along_route(self):
+        indices, distances, alongs = corridor_search(self.spots, self.path, 1000)
+        self.assertEqual(list(self.spots.pks[indices]), [2, 1])
+        self.assertTrue(all(100 < d < 120 for d in distances))
+        self.assertLess(alongs[0], alongs[1])
+
+    def test_buffer_and_limit(self):
+        indices, _, _ = corridor_search(self.spots, self.path, 6000, limit=2)
+        self.assertEqual(list(self.spots.pks[indices]), [2, 3])
+        self.assertEqual(len(corridor_search(self.spots, self.path[:1], 1000)[0]), 0)
+
+
+class CorridorSearchViewTests(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        spots = PetTourSpot.objects.bulk_create([
+            PetTourSpot(contentid='r1', title='경로 장소1', mapy=33.399, mapx=126.52),
+            PetTourSpot(contentid='r2', title='경로 장소2', mapy=33.401, mapx=126.60),
+        ])
+        self.spots = SpotArrays([(spot.pk, spot.mapy, spot.mapx, 0.5) for spot in spots])
+
+    def _post(self, **data):
+        with mock.patch('attractions.views.get_spot_arrays', return_value=self.spots):
+            return CorridorSearchView.as_view()(self.factory.post('/corridor/', data, format='json'))
+
+    def test_limit_lower_bound(self):
+        path = [[33.40, 126.50], [33.40, 126.70]]
+        self.assertEqual(self._post(path=path).data['count'], 2)
+        for limit in (0, -1):
+            response = self._post(path=path, limit=limit)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([row['contentid'] for row in response.data['results']], ['r1'])
+
+    def test_rejects_invalid_path_points(self):
+        for point in (['nan', 126.5], [33.4, 'inf'], [91, 126.5], [33.4, 181]):
+            response = self._post(path=[[33.40, 126.50], point])
+            self.assertEqual(response.status_code, 400, point)
+
+
+class SpotNeighborTests(SimpleTestCase):
+    def test_neighbors_per_category(self):
+        points = [
+            (1, 33.5000, 126.5000, '12'),
+            (2, 33.5010, 126.5000, '12'),   # 약 110m
+            (3, 33.5100, 126.5000, '12'),   # 약 1.1km
+            (4, 33.5005, 126.5000, '39'),   # 약 55m, 다른 카테고리
+            (5, 35.1000, 129.0000, '12'),   # 20km 밖
+        ]
+        neighbors = compute_neighbors(points, k=2)
+        self.assertEqual([pk for pk, _ in neighbors[1]['12']], [2, 3])
+        self.assertEqual([pk for pk, _ in neighbors[1]['39']], [4])
+        self.assertTrue(100 < neighbors[1]['12'][0][1] < 120)
+        self.assertEqual(neighbors[5], {})
+
+
+class SpotNeighborStoreTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = APIRequestFactory()
+        self.spots = PetTourSpot.objects.bulk_create([
+            PetTourSpot(contentid='n1', title='장소1', mapy=33.5000, mapx=126.5000, contenttypeid='12'),
+            PetTourSpot(contentid='n2', title='장소2', mapy=33.5010, mapx=126.5000, contenttypeid='12'),
+        ])
+
+    def _get(self, pk, **headers):
+        return NearbyPlacesView.as_view()(self.factory.get(f'/nearby/{pk}/', **headers), pk=pk)
+
+    def test_store_without_conflict_target(self):
+        """MySQL처럼 충돌 대상 지정이 안 되는 DB에서도 다시 계산한 결과로 갱신"""
+        with mock.patch.object(connection.features, 'supports_update_conflicts_with_target', False):
+            self.assertEqual(rebuild_neighbors(1), 2)
+            self.assertEqual(rebuild_neighbors(2), 2)
+        self.assertEqual(set(SpotNeighbors.objects.values_list('generation', flat=True)), {2})
+
+    def test_etag_changes_after_rebuild(self):
+        """근접 장소 계산은 카탈로그 세대를 올리지 않지만 이전 ETag로 304를 받지 않음"""
+        pk = self.spots[0].pk
+        response = self._get(pk)
+        self.assertEqual(response.data['count'], 0)
+
+        rebuild_neighbors(0)
+        response = self._get(pk, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(self._get(pk, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+
+class TravelTimeMatrixTests(SimpleTestCase):
+    def test_travel_minutes(self):
+        """직선 거리 / 60km/h (서울시청 ↔ 부산시청 약 325km)"""
+        minutes = travel_minutes([37.5665, 35.1796], [126.9780, 129.0756], [37.5665, 35.1796], [126.9780, 129.0756])
+        self.assertEqual(minutes.dtype, np.uint16)
+        self.assertEqual(minutes[0, 0], 0)
+        self.assertEqual(minutes[0, 1], minutes[1, 0])
+        self.assertTrue(320 <= minutes[0, 1] <= 330)
+
+    def test_store_locate_and_slice(self):
+        with tempfile.TemporaryDirectory() as root, override_settings(TRAVEL_TIME_ROOT=root):
+            os.makedirs(os.path.join(root, '3'))
+            np.savez(os.path.join(root, '3', 'index.npz'),
+                     pks=np.array([10, 20, 30]), regions=np.array([0, 0, 1]), rows=np.array([0, 1, 0]))
+            np.savez(os.path.join(root, '3', 'region_0.npz'),
+                     pks=np.array([10, 20]), minutes=np.array([[0, 7], [7, 0]], dtype=np.uint16))
+            store = TravelTimeStore(3)
+            regions, rows = store.locate([20, 99, 10])
+            self.assertEqual(regions.tolist(), [0, -1, 0])
+            self.assertEqual(rows.tolist(), [1, -1, 0])
+            self.assertEqual(store.region_matrix(0)[1, 0], 7)
+
+    def test_matrix_slices_stored_pairs_and_computes_rest(self):
+        """같은 지역 카탈로그 장소 쌍은 저장된 값(7분), 나머지 쌍만 계산"""
+        places = [
+            {'id': 'pet_10', 'latitude': 33.45, 'longitude': 126.50},
+            {'id': 'kakao_1', 'latitude': 33.50, 'longitude': 126.55},
+            {'id': 'pet_20', 'latitude': 33.30, 'longitude': 126.30},
+            {'id': 'pet_30', 'latitude': 33.25, 'longitude': 126.60},
+        ]
+        lat = [p['latitude'] for p in places]
+        lng = [p['longitude'] for p in places]
+        expected = travel_minutes(lat, lng, lat, lng).astype(int)
+        expected[0, 2] = expected[2, 0] = 7
+
+        with tempfile.TemporaryDirectory() as root, override_settings(TRAVEL_TIME_ROOT=root):
+            os.makedirs(os.path.join(root, '3'))
+            np.savez(os.path.join(root, '3', 'index.npz'),
+                     pks=np.array([10, 20, 30]), regions=np.array([0, 0, 1]), rows=np.array([0, 1, 0]))
+            np.savez(os.path.join(root, '3', 'region_0.npz'),
+                     pks=np.array([10, 20]), minutes=np.array([[0, 7], [7, 0]], dtype=np.uint16))
+            np.savez(os.path.join(root, '3', 'region_1.npz'), pks=np.array([30]), minutes=np.zeros((1, 1), dtype=np.uint16))
+            with mock.patch.object(travel_times, 'get_store', return_value=TravelTimeStore(3)), \
+                    mock.patch.object(travel_times, 'travel_minutes', wraps=travel_minutes) as computed:
+                matrix = travel_time_matrix(places)
+        self.assertEqual(matrix, expected.tolist())
+        # 계산한 쌍: 묶이지 않은 kakao_1 행(4) + 지역 0(2곳)과 지역 1(1곳) 사이(2)
+        self.assertEqual(sum(call.args[0].size * call.args[2].size for call in computed.call_args_list), 6)
+
+    @mock.patch.object(travel_times, '_exported_generations', return_value=[3])
+    def test_store_lookup_cached_per_generation(self, exported):
+        with mock.patch.object(travel_times, 'current_generation', return_value=3), \
+                mock.patch.object(travel_times, '_store', None), mock.patch.object(travel_times, '_store_checked', (None, 0.0)):
+            for _ in range(3):
+                self.assertEqual(travel_times.get_store().generation, 3)
+        self.assertEqual(exported.call_count, 1)
+
+
+class PlanCacheTests(SimpleTestCase):
+    def test_equivalent_requests_share_key(self):
+        a = normalize_plan_request({'location': ' 제주  시', 'preferences': ['카페', 'pet', '카페'], 'duration_days': '2'})
+        b = normalize_plan_request({'location': '제주 시', 'preferences': ['pet', '카페'], 'duration_days': 2})
+        self.assertEqual(a, b)
+        self.assertEqual(plan_key('ai-trip', a, generation=1), plan_key('ai-trip', b, generation=1))
+        self.assertNotEqual(plan_key('ai-trip', a, generation=1), plan_key('ai-trip', a, generation=2))
+
+    def test_plan_built_once(self):
+        calls = []
+
+        def builder():
+            calls.append(1)
+            return {'id': 'plan'}
+
+        key = plan_key('test', {'n': len(calls)}, generation=0)
+        self.assertEqual(get_or_build_plan(key, builder), {'id': 'plan'})
+        self.assertEqual(get_or_build_plan(key, builder), {'id': 'plan'})
+        self.assertEqual(len(calls), 1)
+
+
+PLAN_TEST_PLACES = [
+    {'id': f'pet_{i}', 'name': f'장소 {i}', 'latitude': 33.5, 'longitude': 126.5,
+     'rating': 4.0, 'category': '관광지', 'visit_duration': 60}
+    for i in range(6)
+]
+
+
+class PlanJobProgressTests(TestCase):
+    def test_build_plan_reports_each_day(self):
+        places = PLAN_TEST_PLACES
+        reports = []
+        view = AITripPlannerView()
+        with mock.patch.object(AITripPlannerView, '_collect_place_data', return_value=places):
+            plan = view._build_plan('abc', '제주', [], 2, '일반', '혼자', report=lambda **p: reports.append(p))
+        self.assertEqual(plan['id'], 'ai-trip-abc')
+        self.assertEqual([(r['step'], r['completed_days']) for r in reports],
+                         [('collecting', 0), ('planning', 1), ('planning', 2)])
+
+
+@mock.patch('attractions.plan_jobs.close_old_connections')
+@mock.patch('attractions.plan_jobs._executor')
+class PlanJobViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches['plans'].clear()
+        self.factory = APIRequestFactory()
+
+    def _submit(self):
+        request = self.factory.post('/ai-trip/jobs/', {'location': '강릉', 'duration_days': 2}, format='json')
+        return AITripPlanJobView.as_view()(request)
+
+    def _poll(self, job_id):
+        return AITripPlanJobDetailView.as_view()(self.factory.get(f'/ai-trip/jobs/{job_id}/'), job_id=job_id)
+
+    def _run_submitted(self, executor):
+        task, *args = executor.submit.call_args.args
+        task(*args)
+
+    def test_submit_then_poll_until_done(self, executor, _):
+        response = self._submit()
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response['Retry-After'], '1')
+        job_id = response.data['job_id']
+        self.assertTrue(response.data['status_url'].endswith(f'/ai-trip/jobs/{job_id}/'))
+        self.assertEqual(self._poll(job_id).data['status'], 'pending')
+
+        with mock.patch.object(AITripPlannerView, '_collect_place_data', return_value=PLAN_TEST_PLACES):
+            self._run_submitted(executor)
+        response = self._poll(job_id)
+        self.assertEqual(response.data['status'], 'done')
+        self.assertEqual(response.data['result']['id'], f'ai-trip-{job_id}')
+        self.assertEqual(response.data['progress']['completed_days'], 2)
+
+        # 같은 요청은 완료된 작업을 바로 돌려받음
+        response = self._submit()
+        self.assertEqual((response.data['job_id'], response.data['status']), (job_id, 'done'))
+        self.assertFalse(response.has_header('Retry-After'))
+        self.assertEqual(executor.submit.call_count, 1)
+
+    def test_failed_job_reported(self, executor, _):
+        job_id = self._submit().data['job_id']
+        with mock.patch.object(AITripPlannerView, '_collect_place_data', side_effect=RuntimeError('카카오 오류')):
+            self._run_submitted(executor)
+        response = self._poll(job_id)
+        self.assertEqual(response.data['status'], 'failed')
+        self.assertIn('카카오 오류', response.data['error'])
+        self.assertNotIn('result', response.data)
+
+    def test_unknown_job_404(self, executor, _):
+        self.assertEqual(self._poll('missing').status_code, 404)
+
+
+class PlanStreamFormatTests(SimpleTestCase):
+    def test_sse_event(self):
+        self.assertEqual(format_sse('day', {'day': 1}), b'event: day\ndata: {"day":1}\n\n')
+
+    def test_ndjson_event(self):
+        self.assertEqual(format_ndjson('summary', {'id': 'x'}), b'{"event":"summary","data":{"id":"x"}}\n')
+
+
+@mock.patch('attractions.views.current_generation', return_value=7)
+class PlanStreamViewTests(TestCase):
+    def setUp(self):
+        caches['plans'].clear()
+
+    def _stream(self, accept):
+        request = APIRequestFactory().post('/ai-trip/stream/', {'location': '강릉', 'duration_days': 2},
+                                           format='json', HTTP_ACCEPT=accept)
+        with mock.patch.object(AITripPlannerView, '_collect_place_data', return_value=PLAN_TEST_PLACES):
+            response = AITripPlanStreamView.as_view()(request)
+            return response, b''.join(response.streaming_content)
+
+    def test_ndjson_by_accept(self, _):
+        response, body = self._stream('application/x-ndjson')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        events = [orjson.loads(line) for line in body.splitlines()]
+        self.assertEqual([e['event'] for e in events], ['start', 'day', 'day', 'summary'])
+        self.assertEqual([e['data']['day'] for e in events[1:3]], [1, 2])
+
+    def test_sse_by_accept(self, _):
+        response, body = self._stream('text/event-stream')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream; charset=utf-8')
+        chunks = body.decode('utf-8').strip().split('\n\n')
+        self.assertEqual([c.split('\n')[0] for c in chunks],
+                         ['event: start', 'event: day', 'event: day', 'event: summary'])
+
+
+class PlanBatchTests(TestCase):
+    @mock.patch('attractions.views.current_generation', return_value=7)
+    def test_variants_share_candidates(self, _):
+        request = APIRequestFactory().post('/ai-trip/batch/', {
+            'location': '강릉', 'duration_days': 2,
+            'variants': [{'travel_style': '여유'}, {'travel_style': '효율', 'with_who': '가족'}],
+        }, format='json')
+        with mock.patch.object(AITripPlannerView, '_collect_place_data', return_value=PLAN_TEST_PLACES) as collect:
+            response = AITripPlanBatchView.as_view()(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(collect.call_count, 1)
+        plans = response.data['plans']
+        self.assertEqual(len(plans), 2)
+        self.assertNotEqual(plans[0]['id'], plans[1]['id'])
+        self.assertLess(len(plans[0]['places']), len(plans[1]['places']))
+
+    @mock.patch('attractions.views.current_generation', return_value=7)
+    def test_duration_days_defaults_like_single_plan(self, _):
+        request = APIRequestFactory().post('/ai-trip/batch/', {
+            'location': '강릉', 'variants': [{'travel_style': '여유'}],
+        }, format='json')
+        with mock.patch.object(AITripPlannerView, '_collect_place_data', return_value=PLAN_TEST_PLACES):
+            response = AITripPlanBatchView.as_view()(request)
+        self.assertEqual(response.status_code, 200)
+        params = normalize_plan_request({'location': '강릉', 'travel_style': '여유'})
+        self.assertEqual(response.data['plans'][0]['id'], f"ai-trip-{plan_id_from_key(plan_key('ai-trip', params, 7))}")
+
+
+class ReplanTests(SimpleTestCase):
+    # 일직선 위 장소 0~4 (이웃한 장소 간 10분)
+    matrix = [[abs(a - b) * 10 for b in range(5)] for a in range(5)]
+    visit = [30] * 5
+    rating = [5.0, 4.0, 3.0, 2.0, 1.0]
+
+    def test_add_inserted_at_cheapest_position(self):
+        route, total = repair_route([0, 2], self.visit, self.rating, self.matrix, budget=500, add=[1])
+        self.assertEqual(route, [0, 1, 2])
+        self.assertEqual(total, route_minutes(route, self.visit, self.matrix))
+
+    def test_remove_then_fill_within_budget(self):
+        route, total = repair_route([0, 1, 2], self.visit, self.rating, self.matrix, budget=120,
+                                    remove=[1], fill_order=range(5))
+        self.assertNotIn(1, route)
+        self.assertEqual(route, [0, 2, 3])
+        self.assertLessEqual(total, 120)
+
+    def test_over_budget_drops_lowest_rating_per_saved_minute(self):
+        route, total = repair_route([0, 3, 4], self.visit, self.rating, self.matrix, budget=100, pin=[4])
+        self.assertEqual(route, [0, 4])
+        self.assertEqual(total, 100)
+
+
+class AnytimeRouteTests(SimpleTestCase):
+    matrix = ReplanTests.matrix
+    visit = ReplanTests.visit
+
+    def test_improves_until_local_optimum_within_budget(self):
+        rating = [1.0, 1.0, 5.0, 1.0, 5.0]
+        route, stats = improve_route([4, 0], self.visit, rating, self.matrix, budget=120,
+                                     deadline=time.perf_counter() + 1, candidates=range(5), max_stops=3)
+        self.assertTrue(stats['converged'])
+        self.assertGreater(stats['objective'], stats['initial_objective'])
+        self.assertIn(2, route)
+        self.assertLessEqual(route_minutes(route, self.visit, self.matrix), 120)
+
+    def test_groups_keep_order_and_swap_within_group(self):
+        """groups를 주면 순서는 그대로 두고 같은 그룹 후보로만 교체"""
+        groups = [0, 0, 0, 1, 1]
+        route, stats = improve_route([0, 4], self.visit, [1.0] * 5, self.matrix, budget=500,
+                                     deadline=time.perf_counter() + 1, candidates=range(5), groups=groups)
+        self.assertEqual(route, [2, 3])
+        self.assertTrue(stats['converged'])
+        route, _ = improve_route([4, 0], self.visit, [1.0] * 5, self.matrix, budget=500,
+                                 deadline=time.perf_counter() + 1, candidates=range(5), groups=groups, pinned=[0])
+        self.assertEqual(route, [3, 0])
+
+    def test_expired_deadline_returns_start(self):
+        route, stats = improve_route([4, 0], self.visit, ReplanTests.rating, self.matrix, budget=120,
+                                     deadline=time.perf_counter(), candidates=range(5))
+        self.assertEqual(route, [4, 0])
+        self.assertEqual(stats['iterations'], 0)
+
+
+class PlanPoolTests(SimpleTestCase):
+    matrix = ReplanTests.matrix
+    visit = ReplanTests.visit
+
+    def test_threshold_covers_location_trip_candidates(self):
+        # 위치 기반 계획은 검색 3회 × 10곳 = 최대 30곳
+        self.assertLessEqual(settings.PLAN_PROCESS_MIN_CANDIDATES, 30)
+
+    @override_settings(PLAN_PROCESS_WORKERS=2, PLAN_PROCESS_MIN_CANDIDATES=100)
+    def test_small_input_runs_inline(self):
+        route, stats = optimize_route([4, 0], self.visit, ReplanTests.rating, self.matrix, budget=120,
+                                      deadline=time.perf_counter() + 1, candidates=range(5))
+        self.assertEqual(stats['backend'], 'inline')
+        self.assertTrue(stats['converged'])
+
+    @override_settings(PLAN_PROCESS_WORKERS=2, PLAN_PROCESS_MIN_CANDIDATES=1)
+    def test_process_task_keeps_groups(self):
+        def submit(task, *args):
+            future = Future()
+            future.set_result(task(*args))
+            return future
+
+        pool = mock.Mock(submit=submit)
+        with mock.patch('attractions.plan_pool._get_ready_pool', return_value=pool):
+            route, stats = optimize_route([0, 4], self.visit, [1.0] * 5, self.matrix, budget=500,
+                                          deadline=time.perf_counter() + 1, candidates=range(5), groups=[0, 0, 0, 1, 1])
+        self.assertEqual(stats['backend'], 'process')
+        self.assertEqual(route, [2, 3])
+
+    @override_settings(PLAN_PROCESS_WORKERS=2, PLAN_PROCESS_MIN_CANDIDATES=1)
+    def test_timeout_cancels_only_own_future(self):
+        future = Future()
+        pool = mock.Mock()
+        pool.submit.return_value = future
+        with mock.patch('attractions.plan_pool._get_ready_pool', return_value=pool), \
+                mock.patch('attractions.plan_pool._RESULT_GRACE_SECONDS', 0.01), \
+                mock.patch('attractions.plan_pool._reset_pool') as reset_pool:
+            route, stats = optimize_route([4, 0], self.visit, ReplanTests.rating, self.matrix, budget=120,
+                                          deadline=time.perf_counter() + 0.01, candidates=range(5))
+
+        self.assertTrue(future.cancelled())
+        reset_pool.assert_not_called()
+        pool.shutdown.assert_not_called()
+        # 대기로 마감 시간이 지났어도 현재 프로세스 탐색은 끝까지 수행
+        self.assertEqual(stats['backend'], 'inline')
+        self.assertTrue(stats['converged'])
+        self.assertGreater(stats['iterations'], 0)
+
+
+class LocationTripDeadlineTests(SimpleTestCase):
+    places = [
+        {'id': str(i), 'name': f'장소{i}', 'category': '관광명소', 'address': '', 'phone': '', 'place_url': '',
+         'latitude': 33.45 + i * 0.01, 'longitude': 126.5, 'rating': 4.0 + i * 0.1, 'image_url': '',
+         'visit_duration': 30, 'source': 'kakao', 'source_id': str(i)}
+        for i in range(5)
+    ]
+
+    def _post(self, **data):
+        request = APIRequestFactory().post('/location-trip/', dict({'location': '제주', 'duration_hours': 2}, **data), format='json')
+        return LocationBasedTripView.as_view()(request)
+
+    def test_invalid_deadline_is_bad_request(self):
+        for value in ('abc', 'nan'):
+            self.assertEqual(self._post(deadline_ms=value).status_code, 400)
+
+    def test_budget_starts_after_candidate_collection(self):
+        """후보 수집이 예산보다 오래 걸려도 경로 개선은 deadline_ms 동안 실행"""
+        matrix = [[abs(a - b) * 10 for b in range(5)] for a in range(5)]
+
+        def slow_collect(*args):
+            time.sleep(0.1)
+            return self.places, matrix
+
+        with mock.patch.object(LocationBasedTripView, '_collect_candidates', side_effect=slow_collect):
+            response = self._post(deadline_ms=50)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['solver']['converged'])
+
+
+class AITripDeadlineTests(TestCase):
+    # 관광지 4곳(0번만 약 15km 떨어짐), 음식점 2곳
+    places = [
+        {'id': f'pet_{i}', 'name': f'장소{i}', 'category': category, 'rating': rating,
+         'latitude': latitude, 'longitude': 128.9, 'visit_duration': 60}
+        for i, (category, rating, latitude) in enumerate([
+            ('관광지', 4.9, 37.90), ('관광지', 4.8, 37.76), ('관광지', 4.7, 37.761), ('관광지', 4.55, 37.762),
+            ('음식점', 4.5, 37.763), ('음식점', 4.5, 37.764),
+        ])
+    ]
+
+    def setUp(self):
+        cache.clear()
+        caches['plans'].clear()
+
+    def _post(self, **data):
+        request = APIRequestFactory().post('/ai-trip/', dict({'location': '강릉'}, **data), format='json')
+        with mock.patch.object(AITripPlannerView, '_collect_place_data', return_value=self.places):
+            return AITripPlannerView.as_view()(request)
+
+    def test_invalid_deadline_is_bad_request(self):
+        for value in ('abc', 'nan'):
+            self.assertEqual(self._post(deadline_ms=value).status_code, 400)
+
+    def test_far_place_swapped_within_category(self):
+        """시간대 순서와 카테고리 구성은 그대로 두고, 멀리 떨어진 관광지를 가까운 관광지로 교체"""
+        response = self._post(deadline_ms=100)
+        self.assertEqual(response.status_code, 200)
+        places = response.data['places']
+        self.assertNotIn('pet_0', [place['id'] for place in places])
+        self.assertIn('pet_3', [place['id'] for place in places])
+        self.assertEqual(sorted(place['category'] for place in places), ['관광지'] * 3 + ['음식점'] * 2)
+        solver = response.data['solver']
+        self.assertTrue(solver['converged'])
+        self.assertGreater(solver['iterations'], 0)
+        self.assertGreater(solver['objective'], solver['initial_objective'])
+
+
+class PlanScoringTests(SimpleTestCase):
+    def test_top_k_partial_selection_order(self):
+        scores = np.array([1.0, 5.0, 3.0, 5.0, 2.0])
+        self.assertEqual(top_k(np.arange(5), scores, 3).tolist(), [1, 3, 2])
+        self.assertEqual(top_k(np.array([4, 0]), scores, 5).tolist(), [4, 0])
+
+    def test_days_use_distinct_places_by_quota(self):
+        places = [
+            {'id': i, 'category': category, 'rating': 4.0 + i / 100, 'latitude': 37.5, 'longitude': 127.0}
+            for i, category in enumerate(['관광지'] * 4 + ['음식점'] * 4 + ['카페'] * 2 + ['기타'] * 2)
+        ]
+        days = list(iter_day_selections(places, ['카페'], 2, '일반', 5))
+        self.assertEqual(days[0], [3, 2, 7, 6, 9])
+        self.assertEqual(days[1], [1, 0, 5, 4, 8])
+        self.assertEqual(len(set(days[0]) | set(days[1])), 10)
+
+    def test_preference_bonus_outranks_rating(self):
+        places = [
+            {'id': 0, 'category': '카페', 'rating': 4.5, 'latitude': 37.5, 'longitude': 127.0},
+            {'id': 1, 'category': '쇼핑', 'rating': 4.2, 'latitude': 37.5, 'longitude': 127.0},
+        ]
+        self.assertEqual(next(iter_day_selections(places, [], 1, '일반', 1)), [0])
+        self.assertEqual(next(iter_day_selections(places, ['쇼핑'], 1, '일반', 1)), [1])
+
+    def test_app_preference_values_get_bonus(self):
+        """앱이 보내는 영문 선호도 값(food, cafe)도 같은 가산점"""
+        places = [
+            {'id': 0, 'category': '쇼핑', 'rating': 4.5, 'latitude': 37.5, 'longitude': 127.0},
+            {'id': 1, 'category': '음식점', 'rating': 4.4, 'latitude': 37.5, 'longitude': 127.0},
+            {'id': 2, 'category': '카페', 'rating': 4.3, 'latitude': 37.5, 'longitude': 127.0},
+        ]
+        scores = score_candidates(CandidateArrays(places), ['food'], '일반')
+        self.assertEqual(top_k(np.arange(3), scores, 3).tolist(), [1, 0, 2])
+        scores = score_candidates(CandidateArrays(places), ['cafe'], '일반')
+        self.assertEqual(top_k(np.arange(3), scores, 3).tolist(), [2, 0, 1])
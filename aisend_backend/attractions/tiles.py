@@ -0,0 +1,204 @@
+"""
+지도 포인트 타일 (바이너리, 세대별 디스크 캐시)
+
+슬리피 맵 타일 좌표(z/x/y)마다 그 범위의 장소를 작은 바이너리로 인코딩합니다.
+
+    TILE_ROOT/<generation>/<z>/<x>/<y>.bin
+
+동기화 후에는 TILE_PRERENDER_MAX_ZOOM까지 장소가 있는 타일을 한꺼번에 미리 만들고,
+그 줌까지는 요청 시 없는 타일도 만들어 저장합니다(lazy). 더 깊은 줌은 저장하지 않고 요청마다 만들며,
+장소가 없는 타일은 저장하지 않고 세대별 공용 빈 타일을 반환합니다 (임의 좌표 요청으로 디스크가 차지 않도록).
+세대가 바뀌면 새 디렉터리에 쓰므로 기존 파일을 무효화할 필요가 없고, 새 세대 디렉터리를 만들 때 오래된 세대를 정리합니다.
+
+타일에는 카탈로그(PetTourSpot) 장소만 넣습니다. 카카오 장소는 세대와 무관하게 바뀌므로
+세대별로 변하지 않는(immutable) 타일에 넣지 않습니다.
+
+바이너리 형식 (리틀 엔디언):
+    헤더  magic 'PTIL'(4) | format_version u8 | generation u32 | count u32
+    장소  source u8 | id u32 | x u16 | y u16 | category u8 | flags u8   (count개 반복)
+
+- source: 1 = PetTourSpot (id는 pk, 다른 출처용으로 예약된 필드)
+- x, y: 타일 안 위치를 0~65535로 양자화한 값 (y는 북쪽이 0)
+- category: TourAPI contenttypeid (모르면 0)
+- flags: attractions.bundles 의 FLAG_* 비트
+"""
+import math
+import os
+import shutil
+import struct
+import threading
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+
+from .bundles import FLAG_HAS_IMAGE, FLAG_HAS_TEL, FLAG_PET_FRIENDLY
+from .clustering import project
+from .models import PetTourSpot
+
+TILE_FORMAT_VERSION = 1
+TILE_MAGIC = b'PTIL'
+
+SOURCE_PET_TOUR = 1
+
+HEADER = struct.Struct('<4sBII')
+POINT = struct.Struct('<BIHHBB')
+
+_QUANT = 65535
+
+
+class TileOutOfRange(ValueError):
+    pass
+
+
+def check_tile(z, x, y):
+    if not settings.TILE_MIN_ZOOM <= z <= settings.TILE_MAX_ZOOM:
+        raise TileOutOfRange(f'zoom은 {settings.TILE_MIN_ZOOM}~{settings.TILE_MAX_ZOOM} 사이여야 합니다')
+    if not (0 <= x < (1 << z) and 0 <= y < (1 << z)):
+        raise TileOutOfRange('타일 좌표가 범위를 벗어났습니다')
+
+
+def tile_path(generation, z, x, y):
+    return os.path.join(settings.TILE_ROOT, str(generation), str(z), str(x), f'{y}.bin')
+
+
+def _category_code(contenttypeid):
+    return int(contenttypeid) if contenttypeid and contenttypeid.isdigit() and int(contenttypeid) < 256 else 0
+
+
+def iter_points(bounds=None):
+    """타일에 들어갈 장소 (source, id, lat, lng, category, flags), bounds가 있으면 그 범위만"""
+    spots = PetTourSpot.objects.filter(mapx__isnull=False, mapy__isnull=False)
+    if bounds is not None:
+        min_lat, min_lng, max_lat, max_lng = bounds
+        spots = spots.filter(mapy__gte=min_lat, mapy__lte=max_lat, mapx__gte=min_lng, mapx__lte=max_lng)
+
+    rows = spots.values_list('id', 'mapy', 'mapx', 'contenttypeid', 'firstimage', 'tel')
+    for spot_id, lat, lng, contenttypeid, firstimage, tel in rows.iterator(chunk_size=2000):
+        flags = FLAG_PET_FRIENDLY
+        if firstimage:
+            flags |= FLAG_HAS_IMAGE
+        if tel:
+            flags |= FLAG_HAS_TEL
+        yield SOURCE_PET_TOUR, spot_id, lat, lng, _category_code(contenttypeid), flags
+
+
+def _tile_position(lat, lng, z):
+    """(타일 x, 타일 y, 타일 내부 x, 타일 내부 y)"""
+    scale = 1 << z
+    px, py = project(lat, lng)
+    px, py = min(px * scale, scale - 1e-9), min(py * scale, scale - 1e-9)
+    tile_x, tile_y = int(px), int(py)
+    return tile_x, tile_y, int((px - tile_x) * _QUANT), int((py - tile_y) * _QUANT)
+
+
+def encode_tile(generation, points):
+    """points: (source, id, 타일 내부 x, 타일 내부 y, category, flags) 목록"""
+    parts = [HEADER.pack(TILE_MAGIC, TILE_FORMAT_VERSION, generation, len(points))]
+    parts.extend(POINT.pack(*point) for point in points)
+    return b''.join(parts)
+
+
+def decode_tile(data):
+    """encode_tile의 역변환 → (generation, points)"""
+    magic, version, generation, count = HEADER.unpack_from(data)
+    if magic != TILE_MAGIC or version != TILE_FORMAT_VERSION:
+        raise ValueError('지원하지 않는 타일 형식입니다')
+    points = [POINT.unpack_from(data, HEADER.size + i * POINT.size) for i in range(count)]
+    return generation, points
+
+
+@lru_cache(maxsize=8)
+def empty_tile(generation):
+    """장소가 없는 타일 (세대별로 한 번만 인코딩해 공유)"""
+    return encode_tile(generation, [])
+
+
+def _ensure_generation_dir(generation):
+    """
+    세대 디렉터리가 없으면 만들고, 그때 보관 개수를 넘는 오래된 세대 정리
+    이미 정리된 오래된 세대(세대 캐시가 늦게 갱신된 프로세스의 요청)면 False
+    """
+    generation_dir = os.path.join(settings.TILE_ROOT, str(generation))
+    if not os.path.isdir(generation_dir):
+        os.makedirs(generation_dir, exist_ok=True)
+        _remove_old_generations(keep=settings.TILE_KEEP_GENERATIONS)
+    return os.path.isdir(generation_dir)
+
+
+def _write_tile(path, data):
+    """임시 파일에 쓴 뒤 교체 (동시에 같은 타일을 만드는 요청끼리 충돌하지 않도록)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def tile_bounds(z, x, y, margin=1e-6):
+    """타일의 위경도 범위 (min_lat, min_lng, max_lat, max_lng), 경계 오차를 위해 약간 넓힘"""
+    scale = 1 << z
+
+    def lat_of(tile_y):
+        return math.degrees(math.atan(math.sinh(math.pi - 2 * math.pi * tile_y / scale)))
+
+    min_lng = x / scale * 360.0 - 180.0
+    max_lng = (x + 1) / scale * 360.0 - 180.0
+    return lat_of(y + 1) - margin, min_lng - margin, lat_of(y) + margin, max_lng + margin
+
+
+def render_tile(generation, z, x, y):
+    """타일 하나를 DB에서 만들어 바이트 반환 (장소가 있고 미리 만드는 줌 이하면 저장)"""
+    points = []
+    for source, point_id, lat, lng, category, flags in iter_points(tile_bounds(z, x, y)):
+        tile_x, tile_y, local_x, local_y = _tile_position(lat, lng, z)
+        # 경계에 걸친 장소는 투영 결과가 속한 타일 하나에만 포함
+        if (tile_x, tile_y) == (x, y):
+            points.append((source, point_id, local_x, local_y, category, flags))
+
+    if not points:
+        return empty_tile(generation)
+
+    data = encode_tile(generation, sorted(points))
+    if z <= settings.TILE_PRERENDER_MAX_ZOOM and _ensure_generation_dir(generation):
+        _write_tile(tile_path(generation, z, x, y), data)
+    return data
+
+
+def get_tile(generation, z, x, y):
+    """디스크 캐시에 있으면 읽고, 없으면 만듦"""
+    check_tile(z, x, y)
+    path = tile_path(generation, z, x, y)
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return render_tile(generation, z, x, y)
+
+
+def render_tiles(generation, max_zoom=None):
+    """
+    TILE_MIN_ZOOM ~ max_zoom 의 장소가 있는 타일을 한꺼번에 생성 (장소를 한 번만 읽음)
+    생성한 타일 수 반환
+    """
+    max_zoom = settings.TILE_PRERENDER_MAX_ZOOM if max_zoom is None else max_zoom
+    zooms = range(settings.TILE_MIN_ZOOM, max_zoom + 1)
+    tiles = defaultdict(list)
+
+    for source, point_id, lat, lng, category, flags in iter_points():
+        for z in zooms:
+            tile_x, tile_y, local_x, local_y = _tile_position(lat, lng, z)
+            tiles[(z, tile_x, tile_y)].append((source, point_id, local_x, local_y, category, flags))
+
+    _ensure_generation_dir(generation)
+    for (z, x, y), points in tiles.items():
+        _write_tile(tile_path(generation, z, x, y), encode_tile(generation, sorted(points)))
+    return len(tiles)
+
+
+def _remove_old_generations(keep):
+    if not os.path.isdir(settings.TILE_ROOT):
+        return
+    generations = sorted(int(name) for name in os.listdir(settings.TILE_ROOT) if name.isdigit())
+    for generation in generations[:-keep]:
+        shutil.rmtree(os.path.join(settings.TILE_ROOT, str(generation)), ignore_errors=True)
@@ -0,0 +1,251 @@
+"""
+시군구(sigungucode)별 장소 간 이동 시간 행렬
+
+동기화 후 시군구마다 장소 간 이동 시간(분)을 uint16 정방 행렬로 미리 계산해 저장합니다.
+여행 계획 요청은 후보 장소의 행/열만 잘라 쓰므로 매 요청 쌍마다 다시 계산하지 않고,
+같은 장소 쌍은 요청과 관계없이 항상 같은 시간을 받습니다.
+
+    TRAVEL_TIME_ROOT/<generation>/index.npz          pk → (지역 번호, 행 번호)
+    TRAVEL_TIME_ROOT/<generation>/region_<n>.npz     지역 n의 pk 목록과 행렬
+
+이동 시간은 KakaoApiService.calculate_distance와 같은 모델(직선 거리, 평균 60km/h)입니다.
+행렬에 없는 쌍(다른 시군구, 카탈로그 밖 장소)만 같은 모델로 바로 계산합니다.
+"""
+import json
+import os
+import shutil
+import threading
+import time
+from itertools import combinations
+
+import numpy as np
+from django.conf import settings
+
+from .catalog import current_generation
+from .models import KakaoPlace, PetTourSpot
+
+EARTH_RADIUS_KM = 6371.0
+# 평균 이동 속도 (km/h)
+TRAVEL_SPEED_KMH = 60.0
+MAX_MINUTES = np.iinfo(np.uint16).max
+
+
+def travel_minutes(lat1, lng1, lat2, lng2):
+    """좌표 배열 간 이동 시간(분) 행렬 (하버사인 거리 / 평균 속도, 반올림)"""
+    lat1, lng1 = np.radians(np.asarray(lat1, dtype=np.float64))[:, None], np.radians(np.asarray(lng1, dtype=np.float64))[:, None]
+    lat2, lng2 = np.radians(np.asarray(lat2, dtype=np.float64))[None, :], np.radians(np.asarray(lng2, dtype=np.float64))[None, :]
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    distance_km = 2 * EARTH_RADIUS_KM * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return np.minimum(np.round(distance_km / TRAVEL_SPEED_KMH * 60), MAX_MINUTES).astype(np.uint16)
+
+
+def _generation_dir(generation):
+    return os.path.join(settings.TRAVEL_TIME_ROOT, str(generation))
+
+
+def export_travel_times(generation):
+    """시군구별 이동 시간 행렬과 pk 색인 저장, 지역 수 반환"""
+    rows = PetTourSpot.objects.filter(mapx__isnull=False, mapy__isnull=False).exclude(sigungucode='').values_list(
+        'id', 'areacode', 'sigungucode', 'mapy', 'mapx').order_by('areacode', 'sigungucode', 'id')
+
+    regions = {}
+    for pk, areacode, sigungucode, lat, lng in rows.iterator(chunk_size=2000):
+        if lat and lng:
+            regions.setdefault((areacode, sigungucode), []).append((pk, lat, lng))
+
+    # 임시 디렉터리에 모두 쓴 뒤 이름을 바꿔, 읽는 쪽이 만들다 만 세대를 보지 않도록 함
+    generation_dir = _generation_dir(generation)
+    build_dir = f'{generation_dir}.{os.getpid()}.tmp'
+    shutil.rmtree(build_dir, ignore_errors=True)
+    os.makedirs(build_dir)
+
+    index_pks, index_regions, index_rows = [], [], []
+    for region_no, spots in enumerate(regions.values()):
+        pks = np.array([spot[0] for spot in spots], dtype=np.int64)
+        lat = np.array([spot[1] for spot in spots])
+        lng = np.array([spot[2] for spot in spots])
+        np.savez(os.path.join(build_dir, f'region_{region_no}.npz'),
+                 pks=pks, minutes=travel_minutes(lat, lng, lat, lng))
+        index_pks.append(pks)
+        index_regions.append(np.full(len(pks), region_no, dtype=np.int32))
+        index_rows.append(np.arange(len(pks), dtype=np.int32))
+
+    if regions:
+        pks = np.concatenate(index_pks)
+        order = np.argsort(pks)
+        np.savez(os.path.join(build_dir, 'index.npz'),
+                 pks=pks[order], regions=np.concatenate(index_regions)[order], rows=np.concatenate(index_rows)[order])
+
+    with open(os.path.join(build_dir, 'regions.json'), 'w', encoding='utf-8') as f:
+        json.dump([list(key) for key in regions], f)
+
+    shutil.rmtree(generation_dir, ignore_errors=True)
+    os.rename(build_dir, generation_dir)
+
+    _remove_old_generations(keep=settings.TRAVEL_TIME_KEEP_GENERATIONS)
+    return len(regions)
+
+
+def _remove_old_generations(keep):
+    for generation in _exported_generations()[:-keep]:
+        shutil.rmtree(os.path.join(settings.TRAVEL_TIME_ROOT, str(generation)), ignore_errors=True)
+
+
+class TravelTimeStore:
+    """한 세대의 저장된 행렬 (지역 행렬은 처음 필요할 때 읽음)"""
+
+    def __init__(self, generation):
+        self.generation = generation
+        self.generation_dir = _generation_dir(generation)
+        self._regions = {}
+        self._lock = threading.Lock()
+        index_path = os.path.join(self.generation_dir, 'index.npz')
+        if os.path.exists(index_path):
+            with np.load(index_path) as index:
+                self.pks, self.region_of, self.row_of = index['pks'], index['regions'], index['rows']
+        else:
+            self.pks = np.empty(0, dtype=np.int64)
+            self.region_of = self.row_of = np.empty(0, dtype=np.int32)
+
+    def locate(self, pks):
+        """pk 배열 → (지역 번호, 행 번호) 배열 (행렬에 없으면 -1)"""
+        pks = np.asarray(pks, dtype=np.int64)
+        if not len(self.pks):
+            missing = np.full(len(pks), -1)
+            return missing, missing
+        positions = np.minimum(np.searchsorted(self.pks, pks), len(self.pks) - 1)
+        found = self.pks[positions] == pks
+        return np.where(found, self.region_of[positions], -1), np.where(found, self.row_of[positions], -1)
+
+    def region_matrix(self, region_no):
+        matrix = self._regions.get(region_no)
+        if matrix is None:
+            with self._lock:
+                matrix = self._regions.get(region_no)
+                if matrix is None:
+                    with np.load(os.path.join(self.generation_dir, f'region_{region_no}.npz')) as data:
+                        matrix = self._regions[region_no] = data['minutes']
+        return matrix
+
+
+def _exported_generations():
+    root = settings.TRAVEL_TIME_ROOT
+    return sorted(int(name) for name in os.listdir(root) if name.isdigit()) if os.path.isdir(root) else []
+
+
+# 저장된 세대가 카탈로그 세대보다 오래되었을 때 새 행렬이 저장되었는지 다시 확인하는 간격 (초)
+_RESCAN_SECONDS = 30
+
+_store = None
+_store_checked = (None, 0.0)  # (확인 시점의 카탈로그 세대, 확인 시각)
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """
+    가장 최근에 저장된 세대의 행렬 (없으면 None)
+    동기화 직후 새 행렬을 저장하기 전에는 이전 세대 행렬을 사용
+    디렉터리 목록은 카탈로그 세대가 바뀌었거나, 저장된 세대가 뒤처진 동안 _RESCAN_SECONDS마다만 다시 읽음
+    """
+    global _store, _store_checked
+    catalog_generation = current_generation()
+    checked_generation, checked_at = _store_checked
+    stale = _store is None or _store.generation != catalog_generation
+    if checked_generation == catalog_generation and not (stale and time.monotonic() - checked_at > _RESCAN_SECONDS):
+        return _store
+
+    with _store_lock:
+        generations = _exported_generations()
+        if not generations:
+            _store = None
+        elif _store is None or _store.generation != generations[-1]:
+            _store = TravelTimeStore(generations[-1])
+        _store_checked = (catalog_generation, time.monotonic())
+    return _store
+
+
+def catalog_spot_pks(places):
+    """
+    장소 dict 목록 → 카탈로그(PetTourSpot) pk 목록 (모르면 None)
+    'pet_<pk>' ID는 그대로, 카카오 장소는 저장 시 판별된 matched_contentid로 찾음
+    """
+    spot_pks = [None] * len(places)
+    kakao_positions = {}
+    for i, place in enumerate(places):
+        place_id = str(place.get('id', ''))
+        if place_id.startswith('pet_') and place_id[4:].isdigit():
+            spot_pks[i] = int(place_id[4:])
+        elif place.get('source') == 'kakao' and place.get('source_id'):
+            kakao_positions.setdefault(place['source_id'], []).append(i)
+
+    if kakao_positions:
+        matches = dict(KakaoPlace.objects.filter(kakao_id__in=list(kakao_positions)).exclude(matched_contentid='')
+                       .values_list('kakao_id', 'matched_contentid'))
+        spot_ids = dict(PetTourSpot.objects.filter(contentid__in=list(matches.values())).values_list('contentid', 'id'))
+        for kakao_id, contentid in matches.items():
+            for i in kakao_positions[kakao_id]:
+                spot_pks[i] = spot_ids.get(contentid)
+    return spot_pks
+
+
+def travel_time_matrix(places):
+    """
+    장소 dict 목록(latitude, longitude 키)의 이동 시간(분) 행렬 (list of lists)
+    같은 시군구의 카탈로그 장소 쌍은 저장된 행렬에서 잘라 쓰고, 나머지 쌍만 계산
+    """
+    n = len(places)
+    if n == 0:
+        return []
+    lat = np.array([float(place.get('latitude') or 0) for place in places])
+    lng = np.array([float(place.get('longitude') or 0) for place in places])
+
+    # 저장된 행렬이 있는 지역별 위치 묶음 (나머지 장소는 각자 한 묶음)
+    groups = []
+    store = get_store()
+    if store is not None:
+        spot_pks = catalog_spot_pks(places)
+        known = np.array([i for i, pk in enumerate(spot_pks) if pk is not None], dtype=np.int64)
+        if len(known):
+            regions, rows = store.locate([spot_pks[i] for i in known])
+            for region_no in sorted(set(regions.tolist()) - {-1}):
+                members = np.nonzero(regions == region_no)[0]
+                groups.append((known[members], region_no, rows[members]))
+
+    minutes = np.zeros((n, n), dtype=np.uint16)
+    grouped = np.zeros(n, dtype=bool)
+    for positions, region_no, rows in groups:
+        minutes[np.ix_(positions, positions)] = store.region_matrix(region_no)[np.ix_(rows, rows)]
+        grouped[positions] = True
+
+    # 묶이지 않은 장소의 행/열 (대칭이므로 행만 계산해 열에 복사)
+    loose = np.nonzero(~grouped)[0]
+    if len(loose):
+        loose_rows = travel_minutes(lat[loose], lng[loose], lat, lng)
+        minutes[loose, :] = loose_rows
+        minutes[:, loose] = loose_rows.T
+
+    # 서로 다른 지역 묶음 사이
+    for (a, _, _), (b, _, _) in combinations(groups, 2):
+        block = travel_minutes(lat[a], lng[a], lat[b], lng[b])
+        minutes[np.ix_(a, b)] = block
+        minutes[np.ix_(b, a)] = block.T
+
+    np.fill_diagonal(minutes, 0)
+    return minutes.astype(int).tolist()
+
+
+def extend_travel_matrix(travel_times, places):
+    """
+    앞쪽 len(travel_times)개 장소의 행렬이 있을 때, 뒤에 덧붙인 장소까지 포함한 행렬 (list of lists)
+    덧붙인 장소와의 이동 시간은 같은 모델로 바로 계산
+    """
+    known = len(travel_times)
+    if known == len(places):
+        return travel_times
+    lat = [float(place.get('latitude') or 0) for place in places]
+    lng = [float(place.get('longitude') or 0) for place in places]
+    minutes = travel_minutes(lat, lng, lat, lng).astype(int)
+    if known:
+        minutes[:known, :known] = np.asarray(travel_times, dtype=int)
+    np.fill_diagonal(minutes, 0)
+    return minutes.tolist()
@@ -0,0 +1,53 @@
+"""
+고유 필드 기준 일괄 upsert
+
+PostgreSQL/SQLite는 `INSERT ... ON CONFLICT (고유 필드) DO UPDATE`로 한 번에 저장하지만,
+MySQL은 충돌 대상 지정을 지원하지 않아(supports_update_conflicts_with_target=False)
+bulk_create(unique_fields=...)가 NotSupportedError를 냅니다.
+이 경우 이미 있는 행은 bulk_update로 갱신하고 새 행만 bulk_create로 추가합니다.
+"""
+from django.db import connections, router, transaction
+
+
+def bulk_upsert(model, rows, unique_field, update_fields, batch_size=None):
+    """rows(저장 전 인스턴스)를 unique_field 기준으로 추가하거나 update_fields 갱신"""
+    if not rows:
+        return
+    connection = connections[router.db_for_write(model)]
+    if connection.features.supports_update_conflicts_with_target:
+        model.objects.bulk_create(
+            rows,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=[unique_field],
+            update_fields=update_fields,
+        )
+        return
+
+    attname = model._meta.get_field(unique_field).attname
+    keys = [getattr(row, attname) for row in rows]
+    step = batch_size or len(keys)
+    existing = {}
+    for start in range(0, len(keys), step):
+        chunk = keys[start:start + step]
+        existing.update(model.objects.filter(**{f'{attname}__in': chunk}).values_list(attname, 'pk'))
+
+    updated, created = [], []
+    for row in rows:
+        pk = existing.get(getattr(row, attname))
+        if pk is None:
+            created.append(row)
+            continue
+        row.pk = pk
+        # bulk_update는 pre_save를 거치지 않으므로 auto_now 같은 값은 여기서 채움
+        for name in update_fields:
+            field = model._meta.get_field(name)
+            setattr(row, field.attname, field.pre_save(row, add=False))
+        updated.append(row)
+
+    with transaction.atomic(using=connection.alias):
+        if updated:
+            model.objects.bulk_update(updated, update_fields, batch_size=batch_size)
+        if created:
+            # 조회 이후 다른 요청이 먼저 추가한 행은 건너뜀
+            model.objects.bulk_create(created, batch_size=batch_size, ignore_conflicts=True)
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import AttractionListView, AttractionDetailView, PlaceSearchView, LocationBasedTripView, AITripPlannerView, DbSearchPlacesView
+from .views import AttractionListView, AttractionDetailView, PlaceSearchView, LocationBasedTripView, LocationTripReplanView, AITripPlannerView, AITripPlanJobView, AITripPlanJobDetailView, AITripPlanStreamView, AITripPlanBatchView, DbSearchPlacesView, RegionBundleView, RegionBundleFileView, CatalogChangesView, CatalogExportView, SuggestView, ClusterView, MapTileView, CorridorSearchView, NearbyPlacesView
 
 app_name = 'attractions'
 
@@ -12,13 +12,53 @@ urlpatterns = [
     path('search/', PlaceSearchView.as_view(), name='place-search'),
     path('location-trip/', LocationBasedTripView.as_view(), name='location-based-trip'),
     
+    # 위치 기반 여행 계획 부분 수정(재계획) API
+    path('location-trip/replan/', LocationTripReplanView.as_view(), name='location-trip-replan'),
+    
     # AI 여행 계획 생성 API
     path('ai-trip/', AITripPlannerView.as_view(), name='ai-trip-planner'),
     
+    # 비동기 AI 여행 계획 작업 API (작업 생성 / 진행 상황·결과 조회)
+    path('ai-trip/jobs/', AITripPlanJobView.as_view(), name='ai-trip-jobs'),
+    path('ai-trip/jobs/<str:job_id>/', AITripPlanJobDetailView.as_view(), name='ai-trip-job-detail'),
+    
+    # 일별 AI 여행 계획 스트리밍 API (SSE / NDJSON)
+    path('ai-trip/stream/', AITripPlanStreamView.as_view(), name='ai-trip-stream'),
+    
+    # 여행 스타일/동행 변형 일괄 AI 여행 계획 API
+    path('ai-trip/batch/', AITripPlanBatchView.as_view(), name='ai-trip-batch'),
+    
     # 데이터베이스 기반 장소 검색 API
     path('places/search/', DbSearchPlacesView.as_view(), name='db-search-places'),
     
     # 플러터 앱에서 사용하는 추가 API 엔드포인트
     path('attractions/search/', DbSearchPlacesView.as_view(), name='attractions-search'),
     path('foods/search/', DbSearchPlacesView.as_view(), name='foods-search'),
+    
+    # 오프라인 지역 번들 매니페스트 API
+    path('bundles/', RegionBundleView.as_view(), name='region-bundles'),
+    
+    # 오프라인 지역 번들 파일 다운로드 API
+    path('bundles/<int:generation>/<str:filename>', RegionBundleFileView.as_view(), name='region-bundle-file'),
+    
+    # 카탈로그 변경분(증분 동기화) API
+    path('changes/', CatalogChangesView.as_view(), name='catalog-changes'),
+    
+    # 카탈로그 전체 스트리밍 내보내기 API
+    path('export/<str:source>/', CatalogExportView.as_view(), name='catalog-export'),
+    
+    # 검색어 자동완성 API
+    path('suggest/', SuggestView.as_view(), name='suggest'),
+    
+    # 지도 마커 클러스터 API
+    path('clusters/', ClusterView.as_view(), name='map-clusters'),
+    
+    # 지도 포인트 타일 API
+    path('tiles/<int:z>/<int:x>/<int:y>/', MapTileView.as_view(), name='map-tile'),
+    
+    # 경로 주변 장소 검색 API (드라이브 코스)
+    path('corridor/', CorridorSearchView.as_view(), name='corridor-search'),
+    
+    # 근처 장소 추천 API
+    path('nearby/<int:pk>/', NearbyPlacesView.as_view(), name='nearby-places'),
 ]
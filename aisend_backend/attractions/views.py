@@ -1,26 +1,53 @@
 import requests
 import json
+import orjson
 import math
 import logging
-import uuid
-import random
+import time
 from django.conf import settings
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, generics
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from .models import Attraction, Food, PetTour
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import patch_cache_control
+from backend.renderers import ORJSONRenderer, NDJSONRenderer, EventStreamRenderer
+from .models import PetTourSpot, TripPlanJob
 from .serializers import AttractionSerializer, TripPlanSerializer, PlaceSerializer
+from .conditional import CatalogConditionalMixin, CatalogWriteMixin
+from .pagination import CatalogCursorPagination
+from .bundles import latest_bundle_generation, latest_manifest, bundle_path
+from .catalog import current_generation
+from .changes import ChangeLogExpired, fetch_changes, iter_changes, generation_at
+from .export import export_field_names, iter_rows, iter_ndjson, iter_json_array
+from .kakao_store import search_places_cached
+from .resolution import EntityIndex, dedupe_places
+from .gazetteer import resolve_location, radius_for_region, code_filter
+from .suggest import suggest
+from .fuzzy import fuzzy_search_spots
+from .clustering import get_clusters
+from .tiles import TileOutOfRange, get_tile
+from .spatial import get_spot_arrays, corridor_search
+from .neighbors import NEIGHBOR_K, get_neighbors, neighbors_generation
+from .travel_times import travel_time_matrix, extend_travel_matrix
+from .plan_cache import normalize_plan_request, plan_key, plan_id_from_key, get_or_build_plan, get_cached_plan, store_plan
+from .plan_jobs import submit_plan_job
+from .plan_stream import STREAM_FORMATS, stream_output, iter_stream
+from .replan import repair_route
+from .plan_pool import optimize_route
+from .plan_scoring import CandidateArrays, score_candidates, iter_day_selections
+from .scoring import score_kakao_document, rating_from_score, review_count_from_score, stable_bucket
 from django.db import transaction
 
 logger = logging.getLogger(__name__)
 
 
-class AttractionListView(generics.ListCreateAPIView):
+class AttractionListView(CatalogConditionalMixin, CatalogWriteMixin, generics.ListCreateAPIView):
     """관광 명소 목록 및 생성 API"""
-    queryset = Attraction.objects.all().order_by('id')
+    queryset = PetTourSpot.objects.all().order_by('id')
     serializer_class = AttractionSerializer
     permission_classes = [AllowAny]
+    pagination_class = CatalogCursorPagination
     
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -29,14 +56,20 @@ class AttractionListView(generics.ListCreateAPIView):
         location = self.request.query_params.get('location')
         
         if location:
-            queryset = queryset.filter(addr1__icontains=location)
+            # 지명 사전으로 지역코드를 구하면 (areacode, sigungucode) 인덱스 조회, 아니면 주소 부분 일치
+            # 좌표 범위(bbox)는 이웃 지역과 겹치므로 (경기도 bbox ⊃ 서울/인천) 필터로 쓰지 않음
+            region = resolve_location(location)
+            if region is not None:
+                queryset = queryset.filter(**code_filter(region))
+            else:
+                queryset = queryset.filter(addr1__icontains=location)
             
         return queryset
 
 
-class AttractionDetailView(generics.RetrieveUpdateDestroyAPIView):
+class AttractionDetailView(CatalogConditionalMixin, CatalogWriteMixin, generics.RetrieveUpdateDestroyAPIView):
     """관광 명소 상세 정보 API"""
-    queryset = Attraction.objects.all()
+    queryset = PetTourSpot.objects.all()
     serializer_class = AttractionSerializer
     permission_classes = [AllowAny]
 
@@ -218,6 +251,17 @@ class PlaceSearchView(APIView):
         })
     
 
+def _search_budget(request):
+    """
+    경로 개선 시간 예산(초) - deadline_ms 요청 값 또는 PLAN_DEADLINE_MS, 최대 PLAN_MAX_DEADLINE_MS
+    후보 수집(카카오 검색)이 끝나고 경로 개선을 시작할 때부터 잽니다. 숫자가 아니면 ValueError
+    """
+    deadline_ms = float(request.data.get('deadline_ms', settings.PLAN_DEADLINE_MS))
+    if not math.isfinite(deadline_ms):
+        raise ValueError(deadline_ms)
+    return min(max(deadline_ms, 0), settings.PLAN_MAX_DEADLINE_MS) / 1000
+
+
 class LocationBasedTripView(APIView):
     """
     별점 높은 장소 데이터를 활용한 위치 기반 여행 계획 생성 API
@@ -235,8 +279,51 @@ class LocationBasedTripView(APIView):
         if not location and not (latitude and longitude):
             return Response({'error': '위치 정보(장소명 또는 좌표)가 필요합니다'}, 
                             status=status.HTTP_400_BAD_REQUEST)
+        try:
+            search_budget = _search_budget(request)
+        except (TypeError, ValueError):
+            return Response({'error': 'deadline_ms는 숫자여야 합니다'}, status=status.HTTP_400_BAD_REQUEST)
         
         try:
+            # 1~3. 후보 장소와 이동 시간 (같은 조건이면 계획 캐시 재사용)
+            places, travel_times = self._collect_candidates(location, latitude, longitude, duration_hours, min_rating)
+            
+            # 4. 여행 계획 생성
+            trip_plan = self._create_trip_plan(
+                places=places,
+                travel_times=travel_times,
+                duration_hours=duration_hours,
+                location=location,
+                transport=transport,
+                search_budget=search_budget,
+            )
+            
+            # 5. 시리얼라이저로 응답 형식 검증
+            serializer = TripPlanSerializer(data=trip_plan)
+            serializer.is_valid(raise_exception=True)
+            
+            return Response(serializer.validated_data, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            logger.error(f"위치 기반 여행 계획 생성 오류: {str(e)}")
+            return Response({'error': f'여행 계획 생성 중 오류가 발생했습니다: {str(e)}'},
+                         status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    def _collect_candidates(self, location, latitude, longitude, duration_hours, min_rating):
+        """
+        후보 장소(별점 순)와 이동 시간 행렬
+        재계획 요청이 같은 후보를 다시 쓰도록 (검색 조건, 카탈로그 세대) 키로 계획 캐시에 저장
+        """
+        radius = self._get_radius_from_duration(duration_hours)
+        key = plan_key('location-candidates', {
+            'location': ' '.join(str(location or '').split()),
+            'latitude': round(float(latitude), 3) if latitude else None,
+            'longitude': round(float(longitude), 3) if longitude else None,
+            'radius': radius,
+            'min_rating': min_rating,
+        })
+        
+        def build():
             # 1. 장소 데이터 수집
             kakao_service = KakaoApiService()
             
@@ -248,20 +335,22 @@ class LocationBasedTripView(APIView):
             ]
             
             places = []
+            # 출처 간 동일 장소 판별 인덱스 (이름 + 좌표 격자)
+            entity_index = EntityIndex()
             for query in queries:
-                search_result = kakao_service.search_places(
+                search_result = search_places_cached(
+                    kakao_service,
                     query=query,
                     x=longitude,
                     y=latitude,
-                    radius=self._get_radius_from_duration(duration_hours),
+                    radius=radius,
                     size=10
                 )
                 
                 documents = search_result.get('documents', [])
                 for place in documents:
-                    # 임시 별점 설정 (4.0~4.7 사이 랜덤값)
-                    import random
-                    rating = round(4.0 + random.random() * 0.7, 1)
+                    # 카카오 문서 정보량 기반 별점 (요청마다 동일)
+                    rating = rating_from_score(score_kakao_document(place))
                     
                     place_data = {
                         'id': place.get('id', ''),
@@ -281,43 +370,50 @@ class LocationBasedTripView(APIView):
                     
                     # 최소 별점 필터링
                     if place_data['rating'] >= min_rating:
-                        # 중복 제거 (ID 기준)
-                        if not any(p['id'] == place_data['id'] for p in places):
+                        # 중복 제거 (ID 및 이름+근접 좌표 기준, 장소당 상수 시간)
+                        if entity_index.add_if_new(place_data['id'], place_data['name'],
+                                                   place_data['latitude'], place_data['longitude']):
                             places.append(place_data)
             
             # 2. 별점 기준 정렬
             places.sort(key=lambda x: x['rating'], reverse=True)
             
             # 3. 장소 간 이동 시간 계산
-            travel_times = self._calculate_travel_times(places, kakao_service)
+            return {'places': places, 'travel_times': self._calculate_travel_times(places, kakao_service)}
             
-            # 4. 여행 계획 생성
-            trip_plan = self._create_trip_plan(
-                places=places,
-                travel_times=travel_times,
-                duration_hours=duration_hours,
-                location=location,
-                transport=transport
-            )
-            
-            # 5. 시리얼라이저로 응답 형식 검증
-            serializer = TripPlanSerializer(data=trip_plan)
-            serializer.is_valid(raise_exception=True)
-            
-            return Response(serializer.validated_data, status=status.HTTP_200_OK)
-            
-        except Exception as e:
-            logger.error(f"위치 기반 여행 계획 생성 오류: {str(e)}")
-            return Response({'error': f'여행 계획 생성 중 오류가 발생했습니다: {str(e)}'},
-                         status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        candidates = get_cached_plan(key)
+        if candidates is None:
+            candidates = build()
+            # 검색 실패로 비어 있는 후보는 저장하지 않음
+            if candidates['places']:
+                store_plan(key, candidates)
+        return candidates['places'], candidates['travel_times']
     
-    def _create_trip_plan(self, places, travel_times, duration_hours, location, transport):
-        """여행 계획 생성"""
+    def _create_trip_plan(self, places, travel_times, duration_hours, location, transport, search_budget):
+        """여행 계획 생성 (경로 개선은 search_budget초 동안)"""
         # 여행 시간(분)을 기준으로 방문 가능한 장소 선정
         total_minutes = int(duration_hours * 60)
         
-        # 최적의 장소 선정 (간단한 탐욕 알고리즘)
+        # 최적의 장소 선정 (탐욕 알고리즘으로 시작해 마감 시간까지 개선)
         selected_places = self._select_optimal_places(places, travel_times, total_minutes)
+        position = {id(place): i for i, place in enumerate(places)}
+        route, solver = optimize_route(
+            route=[position[id(place)] for place in selected_places],
+            visit=[place['visit_duration'] for place in places],
+            rating=[place['rating'] for place in places],
+            matrix=travel_times,
+            budget=total_minutes,
+            deadline=time.perf_counter() + search_budget,
+            candidates=range(len(places)),
+        )
+        
+        trip_plan = self._format_trip_plan([places[i] for i in route], duration_hours, location)
+        trip_plan['solver'] = solver
+        return trip_plan
+    
+    def _format_trip_plan(self, selected_places, duration_hours, location):
+        """선택된 장소로 여행 계획 객체 생성"""
+        total_minutes = int(duration_hours * 60)
         
         # 여행 계획 객체 생성
         trip_plan = {
@@ -336,7 +432,7 @@ class LocationBasedTripView(APIView):
             trip_plan['places'].append({
                 'id': place['id'],
                 'name': place['name'],
-                'description': f"{place['category']}에 위치한 {place['name']}입니다.",
+                'description': place.get('description') or f"{place['category']}에 위치한 {place['name']}입니다.",
                 'imageUrl': place['image_url'],
                 'latitude': place['latitude'],
                 'longitude': place['longitude'],
@@ -384,29 +480,8 @@ class LocationBasedTripView(APIView):
         return selected_places
     
     def _calculate_travel_times(self, places, kakao_service):
-        """장소 간 이동 시간 계산"""
-        n = len(places)
-        travel_times = [[0 for _ in range(n)] for _ in range(n)]
-        
-        for i in range(n):
-            for j in range(n):
-                if i == j:
-                    travel_times[i][j] = 0
-                else:
-                    # 두 장소 간의 거리 계산
-                    origin_x = places[i]['longitude']
-                    origin_y = places[i]['latitude']
-                    dest_x = places[j]['longitude']
-                    dest_y = places[j]['latitude']
-                    
-                    distance_info = kakao_service.calculate_distance(
-                        origin_x, origin_y, dest_x, dest_y
-                    )
-                    
-                    # 이동 시간 저장 (분 단위)
-                    travel_times[i][j] = distance_info['time']
-        
-        return travel_times
+        """장소 간 이동 시간 계산 (카탈로그 장소 쌍은 미리 계산된 시군구 행렬 사용)"""
+        return travel_time_matrix(places)
     
     def _categorize_place(self, category_name):
         """카테고리 분류"""
@@ -454,37 +529,130 @@ class LocationBasedTripView(APIView):
             return 50000  # 50km
 
 
-class AITripPlannerView(APIView):
+class LocationTripReplanView(LocationBasedTripView):
     """
-    AI를 활용한 맞춤형 여행 계획 생성 API
+    위치 기반 여행 계획 부분 수정 API
+    POST location-trip/replan/ {location-trip 요청 값..., "plan": 기존 계획,
+                                "edits": {"remove": [장소 ID], "pin": [장소 ID], "add": [장소 ID 또는 장소 객체]}}
+    캐시된 후보와 이동 시간 행렬로 기존 경로를 삽입/제거 이동만으로 고칩니다 (attractions.replan 참고).
     """
-    permission_classes = [AllowAny]
     
     def post(self, request):
-        # 요청에서 필요한 데이터 추출
         location = request.data.get('location', '')
-        preferences = request.data.get('preferences', [])
-        duration_days = int(request.data.get('duration_days', 1))
-        travel_style = request.data.get('travel_style', '일반')
-        with_who = request.data.get('with_who', '혼자')
+        latitude = request.data.get('latitude')
+        longitude = request.data.get('longitude')
+        duration_hours = float(request.data.get('duration_hours', 2.0))
+        min_rating = float(request.data.get('min_rating', 3.0))
+        plan = request.data.get('plan') or {}
+        edits = request.data.get('edits') or {}
         
-        if not location:
-            return Response({'error': '여행 지역을 입력해주세요'}, status=status.HTTP_400_BAD_REQUEST)
+        if not location and not (latitude and longitude):
+            return Response({'error': '위치 정보(장소명 또는 좌표)가 필요합니다'}, 
+                            status=status.HTTP_400_BAD_REQUEST)
+        if not isinstance(plan, dict) or not isinstance(plan.get('places'), list) or not isinstance(edits, dict):
+            return Response({'error': 'plan.places와 edits가 필요합니다'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            search_budget = _search_budget(request)
+        except (TypeError, ValueError):
+            return Response({'error': 'deadline_ms는 숫자여야 합니다'}, status=status.HTTP_400_BAD_REQUEST)
         
         try:
-            # 1. 장소 데이터 수집
-            places = self._collect_place_data(location, preferences)
+            places, travel_times = self._collect_candidates(location, latitude, longitude, duration_hours, min_rating)
+            fill_count = len(places)
             
-            # 2. AI 기반 여행 계획 생성
-            trip_plan = self._generate_ai_trip_plan(
-                places=places,
-                location=location,
-                preferences=preferences,
-                duration_days=duration_days,
-                travel_style=travel_style,
-                with_who=with_who
+            # 후보에 없는 장소(기존 계획/추가 요청의 장소 객체)는 후보 목록과 행렬 끝에 덧붙임
+            places = list(places)
+            index_of = {str(place['id']): i for i, place in enumerate(places)}
+            for place in list(plan['places']) + [p for p in edits.get('add', []) if isinstance(p, dict)]:
+                place_id = str(place.get('id', ''))
+                if place_id and place_id not in index_of and place.get('latitude') and place.get('longitude'):
+                    index_of[place_id] = len(places)
+                    places.append(self._candidate_from_plan_place(place))
+            matrix = extend_travel_matrix(travel_times, places)
+            
+            def indices(values):
+                ids = [str(v.get('id', '')) if isinstance(v, dict) else str(v) for v in values or []]
+                return [index_of[place_id] for place_id in ids if place_id in index_of]
+            
+            visit = [place['visit_duration'] for place in places]
+            rating = [place['rating'] for place in places]
+            removed = set(indices(edits.get('remove')))
+            pinned = indices(edits.get('pin')) + indices(edits.get('add'))
+            route, _ = repair_route(
+                route=indices(plan['places']),
+                visit=visit,
+                rating=rating,
+                matrix=matrix,
+                budget=int(duration_hours * 60),
+                remove=removed,
+                pin=pinned,
+                add=indices(edits.get('add')),
+                fill_order=range(fill_count),
+            )
+            
+            # 고친 경로를 마감 시간까지 개선 (뺀 장소는 다시 넣지 않음)
+            route, solver = optimize_route(
+                route=route,
+                visit=visit,
+                rating=rating,
+                matrix=matrix,
+                budget=int(duration_hours * 60),
+                deadline=time.perf_counter() + search_budget,
+                candidates=[i for i in range(fill_count) if i not in removed],
+                pinned=pinned,
             )
             
+            trip_plan = self._format_trip_plan([places[i] for i in route], duration_hours, location)
+            trip_plan['solver'] = solver
+            serializer = TripPlanSerializer(data=trip_plan)
+            serializer.is_valid(raise_exception=True)
+            
+            return Response(serializer.validated_data, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            logger.error(f"여행 계획 수정 오류: {str(e)}")
+            return Response({'error': f'여행 계획 수정 중 오류가 발생했습니다: {str(e)}'},
+                         status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    def _candidate_from_plan_place(self, place):
+        """계획 응답 형식의 장소 → 후보 형식"""
+        return {
+            'id': str(place['id']),
+            'name': place.get('name', ''),
+            'description': place.get('description', ''),
+            'category': place.get('category', ''),
+            'latitude': float(place['latitude']),
+            'longitude': float(place['longitude']),
+            'rating': float(place.get('rating') or 0),
+            'image_url': place.get('imageUrl') or place.get('image_url') or '',
+            'visit_duration': int(place.get('visitDuration') or place.get('visit_duration') or 60),
+        }
+
+
+class AITripPlannerView(APIView):
+    """
+    AI를 활용한 맞춤형 여행 계획 생성 API
+    일별 장소 구성은 deadline_ms(기본 PLAN_DEADLINE_MS) 동안 개선하고 solver 통계를 함께 반환합니다.
+    """
+    permission_classes = [AllowAny]
+    # 하루 일정 시간 (09:00 ~ 21:30, 분)
+    day_minutes = 750
+    
+    def post(self, request):
+        params, error = self._plan_params(request)
+        if error is not None:
+            return error
+        try:
+            search_budget = _search_budget(request)
+        except (TypeError, ValueError):
+            return Response({'error': 'deadline_ms는 숫자여야 합니다'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            # 같은 요청 + 같은 카탈로그 세대 → 같은 계획 ID, 캐시된 계획 반환
+            key = plan_key('ai-trip', params)
+            trip_plan = get_or_build_plan(
+                key, lambda: self._build_plan(plan_id_from_key(key), search_budget=search_budget, **params))
+            
             return Response(trip_plan, status=status.HTTP_200_OK)
             
         except Exception as e:
@@ -492,50 +660,96 @@ class AITripPlannerView(APIView):
             return Response({'error': f'여행 계획 생성 중 오류가 발생했습니다: {str(e)}'},
                          status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
+    def _plan_params(self, request):
+        """요청에서 필요한 데이터 추출 (공백/선호도 순서만 다른 요청은 같은 요청으로 정규화), (params, 오류 응답) 반환"""
+        try:
+            params = normalize_plan_request(request.data)
+        except (TypeError, ValueError):
+            return None, Response({'error': 'duration_days는 정수여야 합니다'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if not params['location']:
+            return None, Response({'error': '여행 지역을 입력해주세요'}, status=status.HTTP_400_BAD_REQUEST)
+        return params, None
+    
+    def _build_plan(self, plan_id, location, preferences, duration_days, travel_style, with_who, report=None,
+                    search_budget=None):
+        """장소 수집 + 계획 생성 (report가 있으면 단계/완성된 일별 계획을 진행 상황으로 기록)"""
+        days = []
+        
+        def on_day(daily_plan):
+            days.append(daily_plan)
+            if report is not None:
+                report(step='planning', completed_days=len(days), total_days=duration_days, days=days)
+        
+        # 1. 장소 데이터 수집
+        if report is not None:
+            report(step='collecting', completed_days=0, total_days=duration_days, days=[])
+        places = self._collect_place_data(location, preferences)
+        
+        # 2. AI 기반 여행 계획 생성
+        return self._generate_ai_trip_plan(
+            places=places,
+            location=location,
+            preferences=preferences,
+            duration_days=duration_days,
+            travel_style=travel_style,
+            with_who=with_who,
+            plan_id=plan_id,
+            on_day=on_day,
+            search_budget=search_budget,
+        )
+    
     def _collect_place_data(self, location, preferences):
-        """장소 데이터 수집"""
+        """장소 데이터 수집 (같은 카탈로그에서는 항상 같은 순서)"""
         places_data = []
         
+        # 지역명 → 지역코드 (사전에 없으면 주소 부분 일치로 대체)
+        region = resolve_location(location)
+        spot_filter = code_filter(region) if region is not None else {'addr1__icontains': location}
+        
         # 관광지 데이터 수집
-        attractions = Attraction.objects.filter(addr1__icontains=location)[:20]
+        attractions = PetTourSpot.objects.filter(contenttypeid=PetTourSpot.CONTENT_TYPE_ATTRACTION, **spot_filter).order_by('-score', 'id')[:20]
         for place in attractions:
             places_data.append({
                 'id': f'attr_{place.id}',
                 'name': place.title,
                 'description': f"{place.title}은(는) {place.addr1}에 위치한 관광 명소입니다.",
-                'image_url': place.image or '',
+                'image_url': place.firstimage or '',
                 'latitude': float(place.mapy) if place.mapy else 0,
                 'longitude': float(place.mapx) if place.mapx else 0,
                 'address': place.addr1,
                 'contact': place.tel,
                 'opening_hours': '09:00 - 18:00',  # 기본값
-                'rating': 4.5,  # 기본값
+                'rating': rating_from_score(place.score),
+                'score': place.score,
                 'visit_duration': 120,  # 기본값 2시간
                 'category': '관광지',
             })
         
         # 음식점 데이터 수집 (선호도에 'food'가 있는 경우)
         if 'food' in preferences:
-            foods = Food.objects.filter(addr1__icontains=location)[:10]
+            foods = PetTourSpot.objects.filter(contenttypeid=PetTourSpot.CONTENT_TYPE_FOOD, **spot_filter).order_by('-score', 'id')[:10]
             for place in foods:
                 places_data.append({
                     'id': f'food_{place.id}',
                     'name': place.title,
                     'description': f"{place.title}은(는) {place.addr1}에 위치한 음식점입니다.",
-                    'image_url': place.image or '',
+                    'image_url': place.firstimage or '',
                     'latitude': float(place.mapy) if place.mapy else 0,
                     'longitude': float(place.mapx) if place.mapx else 0,
                     'address': place.addr1,
                     'contact': place.tel,
                     'opening_hours': '11:00 - 21:00',  # 기본값
-                    'rating': 4.3,  # 기본값
+                    'rating': rating_from_score(place.score),
+                    'score': place.score,
                     'visit_duration': 90,  # 기본값 1시간 30분
                     'category': '음식점',
                 })
         
         # 반려동물 동반 여행지 (선호도에 'pet'이 있는 경우)
         if 'pet' in preferences:
-            pet_places = PetTour.objects.filter(addr1__icontains=location)[:10]
+            # 미리 계산된 점수 순으로 상위 장소만 조회
+            pet_places = PetTourSpot.objects.filter(**spot_filter).order_by('-score', 'id')[:10]
             for place in pet_places:
                 places_data.append({
                     'id': f'pet_{place.id}',
@@ -547,7 +761,8 @@ class AITripPlannerView(APIView):
                     'address': place.addr1,
                     'contact': place.tel,
                     'opening_hours': '09:00 - 18:00',  # 기본값
-                    'rating': 4.6,  # 기본값
+                    'rating': rating_from_score(place.score),
+                    'score': place.score,
                     'visit_duration': 120,  # 기본값 2시간
                     'category': '반려동물 동반',
                 })
@@ -561,13 +776,22 @@ class AITripPlannerView(APIView):
                 f"{location} 카페"
             ]
             
+            # 지역 중심 좌표를 알면 좌표 기반 검색 (별도 지오코딩 불필요)
+            search_area = {}
+            if region is not None and region.centroid is not None:
+                search_area = {
+                    'x': region.centroid[1],
+                    'y': region.centroid[0],
+                    'radius': radius_for_region(region),
+                }
+            
             for query in location_queries:
-                search_result = kakao_service.search_places(query=query, size=10)
+                search_result = search_places_cached(kakao_service, query=query, size=10, **search_area)
                 documents = search_result.get('documents', [])
                 
                 for place in documents:
                     # 장소 데이터 가공
-                    rating = round(4.0 + random.random() * 0.7, 1)
+                    score = score_kakao_document(place)
                     
                     if place.get('y') and place.get('x'):
                         places_data.append({
@@ -580,12 +804,14 @@ class AITripPlannerView(APIView):
                             'address': place.get('address_name', ''),
                             'contact': place.get('phone', ''),
                             'opening_hours': '09:00 - 18:00',  # 기본값
-                            'rating': rating,
+                            'rating': rating_from_score(score),
+                            'score': score,
                             'visit_duration': self._estimate_visit_duration(place.get('category_name', '')),
                             'category': self._categorize_place(place.get('category_name', '')),
                         })
         
-        return places_data
+        # 출처 간 중복 제거 (DB 장소 우선)
+        return dedupe_places(places_data)
     
     def _categorize_place(self, category_name):
         """카테고리 분류"""
@@ -619,8 +845,23 @@ class AITripPlannerView(APIView):
         else:
             return 60  # 기본값: 1시간
             
-    def _generate_ai_trip_plan(self, places, location, preferences, duration_days, travel_style, with_who):
+    def _generate_ai_trip_plan(self, places, location, preferences, duration_days, travel_style, with_who, plan_id,
+                               on_day=None, search_budget=None):
         """AI를 활용한 여행 계획 생성"""
+        daily_plans = []
+        for daily_plan in self._iter_daily_plans(places, location, preferences, duration_days, travel_style,
+                                                 search_budget=search_budget):
+            daily_plans.append(daily_plan)
+            if on_day is not None:
+                on_day(daily_plan)
+        
+        return self._summarize_trip_plan(places, daily_plans, location, preferences, duration_days, travel_style, with_who, plan_id)
+    
+    def _iter_daily_plans(self, places, location, preferences, duration_days, travel_style, search_budget=None):
+        """
+        일별 계획을 하루씩 생성 (하루가 완성될 때마다 반환)
+        search_budget초(없으면 PLAN_DEADLINE_MS)를 일수로 나눠 하루씩 장소 구성을 개선
+        """
         # 1일당 최적 방문 장소 수 계산
         places_per_day = 5  # 기본값
         
@@ -629,79 +870,48 @@ class AITripPlannerView(APIView):
         elif travel_style == '효율':
             places_per_day = 6
         
-        # 평점 기준 장소 정렬
-        sorted_places = sorted(places, key=lambda x: x['rating'], reverse=True)
-        
-        # 일별 플랜 생성
-        daily_plans = []
-        plan_id = str(uuid.uuid4())[:8]
-        
-        # 여행 스타일에 따른 문구 생성
-        style_description = self._get_style_description(travel_style, with_who)
-        
-        # 각 일자별 장소 할당 및 계획 생성
-        places_by_category = {
-            '관광지': [p for p in sorted_places if p['category'] == '관광지'],
-            '음식점': [p for p in sorted_places if p['category'] == '음식점'],
-            '카페': [p for p in sorted_places if p['category'] == '카페'],
-            '반려동물 동반': [p for p in sorted_places if p['category'] == '반려동물 동반'],
-            '쇼핑': [p for p in sorted_places if p['category'] == '쇼핑'],
-            '기타': [p for p in sorted_places if p['category'] not in ['관광지', '음식점', '카페', '반려동물 동반', '쇼핑']],
-        }
-        
-        total_places = sum(len(places) for places in places_by_category.values())
-        
-        for day in range(1, duration_days + 1):
-            # 일별 장소 선택 (카테고리별로 균형 있게)
-            day_places = []
-            
-            # 관광지 2개
-            attractions = places_by_category['관광지'][min(2 * (day - 1), len(places_by_category['관광지']) - 1):min(2 * day, len(places_by_category['관광지']))]
-            day_places.extend(attractions)
-            
-            # 음식점 1-2개
-            food_places = places_by_category['음식점'][min(2 * (day - 1), len(places_by_category['음식점']) - 1):min(2 * day, len(places_by_category['음식점']))]
-            day_places.extend(food_places)
-            
-            # 카페 1개
-            if '카페' in preferences:
-                cafes = places_by_category['카페'][min(day - 1, len(places_by_category['카페']) - 1):min(day, len(places_by_category['카페']))]
-                day_places.extend(cafes)
-            
-            # 반려동물 동반 장소
-            if 'pet' in preferences and places_by_category['반려동물 동반']:
-                pet_places = places_by_category['반려동물 동반'][min(day - 1, len(places_by_category['반려동물 동반']) - 1):min(day, len(places_by_category['반려동물 동반']))]
-                day_places.extend(pet_places)
-            
-            # 기타 장소로 채우기
-            remaining_count = places_per_day - len(day_places)
-            if remaining_count > 0:
-                remaining_places = places_by_category['기타'][min(remaining_count * (day - 1), len(places_by_category['기타']) - 1):min(remaining_count * day, len(places_by_category['기타']))]
-                day_places.extend(remaining_places)
+        # 후보 점수(평점, 선호 카테고리, 중심점 거리, 스타일 가중치) 기준 일별 장소 배정
+        # 배정은 빠르므로 모든 날을 먼저 정하고, 어느 날에도 배정되지 않은 후보를 교체 후보로 사용
+        day_selections = list(iter_day_selections(places, preferences, duration_days, travel_style, places_per_day))
+        if search_budget is None:
+            search_budget = settings.PLAN_DEADLINE_MS / 1000
+        candidates = CandidateArrays(places)
+        scores = score_candidates(candidates, preferences, travel_style).tolist()
+        categories = candidates.category.tolist()
+        visit = [place.get('visit_duration', 60) for place in places]
+        matrix = travel_time_matrix(places)
+        position = {id(place): i for i, place in enumerate(places)}
+        unused = set(range(len(places))).difference(*day_selections)
+        
+        for day, day_indices in enumerate(day_selections, start=1):
+            if not day_indices:
+                break
             
-            # 장소가 충분하지 않은 경우 다른 카테고리에서 가져오기
-            if len(day_places) < places_per_day:
-                all_places = []
-                for category, cat_places in places_by_category.items():
-                    all_places.extend([p for p in cat_places if p not in day_places])
-                
-                all_places = sorted(all_places, key=lambda x: x['rating'], reverse=True)
-                day_places.extend(all_places[:places_per_day - len(day_places)])
+            # 시간순 최적 정렬 후, 순서(시간대 슬롯)를 유지한 채 같은 카테고리 후보로 바꿔 점수 - 이동 시간 개선
+            route = [position[id(place)] for place in self._sort_places_by_time([places[i] for i in day_indices])]
+            improved, solver = optimize_route(
+                route=route,
+                visit=visit,
+                rating=scores,
+                matrix=matrix,
+                budget=self.day_minutes,
+                deadline=time.perf_counter() + search_budget / len(day_selections),
+                candidates=sorted(unused),
+                max_stops=len(route),
+                groups=categories,
+            )
+            unused = (unused - set(improved)) | (set(route) - set(improved))
+            day_places = [places[i] for i in improved]
             
-            if not day_places:
-                break
-                
             # 일별 계획 생성
             daily_plan = {
                 'day': day,
                 'title': f'Day {day}: {location} 여행',
                 'description': self._generate_daily_description(day_places, day, location),
-                'places': []
+                'places': [],
+                'solver': solver,
             }
             
-            # 시간순 최적 정렬
-            day_places = self._sort_places_by_time(day_places)
-            
             # 장소별 상세 정보 추가
             for i, place in enumerate(day_places):
                 daily_plan['places'].append({
@@ -719,21 +929,42 @@ class AITripPlannerView(APIView):
                     'tips': self._generate_visit_tips(place),
                 })
             
-            daily_plans.append(daily_plan)
+            yield daily_plan
+    
+    def _summarize_trip_plan(self, places, daily_plans, location, preferences, duration_days, travel_style, with_who, plan_id):
+        """일별 계획을 합쳐 최종 여행 계획 생성"""
+        top_place = max(places, key=lambda x: x['rating']) if places else None
+        
+        # 여행 스타일에 따른 문구 생성
+        style_description = self._get_style_description(travel_style, with_who)
         
         # 최종 여행 계획 생성
         trip_plan = {
             'id': f'ai-trip-{plan_id}',
             'title': f'{location} {duration_days}일 여행 코스',
             'description': f'{location}에서의 {duration_days}일 {style_description}. 당신의 선호도에 맞춘 맞춤형 여행 계획입니다.',
-            'imageUrl': sorted_places[0].get('image_url', '') if sorted_places else '',
+            'imageUrl': top_place.get('image_url', '') if top_place else '',
             'rating': 4.8,
             'duration': duration_days * 24 * 60,  # 분 단위로 표현
             'tags': self._generate_trip_tags(preferences, location, travel_style, with_who),
             'places': self._flatten_daily_places(daily_plans),  # 일별 계획의 장소들을 하나의 리스트로 병합
+            'solver': self._summarize_solver(daily_plans),
         }
         
         return trip_plan
+    
+    def _summarize_solver(self, daily_plans):
+        """일별 경로 개선 통계 합계"""
+        stats = [daily_plan['solver'] for daily_plan in daily_plans if 'solver' in daily_plan]
+        return {
+            'iterations': sum(s['iterations'] for s in stats),
+            'evaluations': sum(s['evaluations'] for s in stats),
+            'objective': round(sum(s['objective'] for s in stats), 4),
+            'initial_objective': round(sum(s['initial_objective'] for s in stats), 4),
+            'converged': all(s['converged'] for s in stats),
+            'elapsed_ms': round(sum(s['elapsed_ms'] for s in stats), 2),
+            'backend': 'process' if any(s['backend'] == 'process' for s in stats) else 'inline',
+        }
         
     def _flatten_daily_places(self, daily_plans):
         """일별 계획의 장소들을 하나의 리스트로 병합"""
@@ -895,9 +1126,10 @@ class AITripPlannerView(APIView):
                 "리뷰를 참고하면 도움이 됩니다."
             ]
         
-        # 랜덤으로 팁 2개 선택
+        # 장소마다 고정된 팁 2개 선택 (같은 장소는 항상 같은 팁)
         if len(tips) > 2:
-            selected_tips = random.sample(tips, 2)
+            start = stable_bucket(place.get('id', place.get('name', '')), 0, len(tips) - 1)
+            selected_tips = [tips[start], tips[(start + 1) % len(tips)]]
         else:
             selected_tips = tips
             
@@ -938,6 +1170,193 @@ class AITripPlannerView(APIView):
         return tags
 
 
+class AITripPlanJobView(AITripPlannerView):
+    """
+    비동기 여행 계획 작업 생성 API
+    POST는 작업 ID를 바로 반환하고(202), 계획은 작업 스레드 풀에서 만듭니다.
+    같은 요청(같은 카탈로그 세대)은 같은 작업 ID를 받습니다.
+    """
+    
+    def post(self, request):
+        params, error = self._plan_params(request)
+        if error is not None:
+            return error
+        
+        try:
+            search_budget = _search_budget(request)
+        except (TypeError, ValueError):
+            return Response({'error': 'deadline_ms는 숫자여야 합니다'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        key = plan_key('ai-trip', params)
+        plan_id = plan_id_from_key(key)
+        
+        def build(report):
+            return get_or_build_plan(
+                key, lambda: self._build_plan(plan_id, report=report, search_budget=search_budget, **params))
+        
+        job = submit_plan_job(plan_id, 'ai-trip', params, build)
+        response = Response({
+            'job_id': job.id,
+            'status': job.status,
+            'status_url': request.build_absolute_uri(f"{request.path.rstrip('/')}/{job.id}/"),
+        }, status=status.HTTP_202_ACCEPTED)
+        if job.status != 'done':
+            response['Retry-After'] = '1'
+        return response
+
+
+class AITripPlanStreamView(AITripPlannerView):
+    """
+    일별 여행 계획 스트리밍 API
+    POST ai-trip/stream/?output=sse|ndjson (없으면 Accept 헤더로 결정)
+    하루 계획이 완성될 때마다 day 이벤트로 보내고, 마지막에 전체 계획을 summary 이벤트로 보냅니다.
+    """
+    renderer_classes = [ORJSONRenderer, NDJSONRenderer, EventStreamRenderer]
+    
+    def post(self, request):
+        params, error = self._plan_params(request)
+        if error is not None:
+            return error
+        
+        try:
+            search_budget = _search_budget(request)
+        except (TypeError, ValueError):
+            return Response({'error': 'deadline_ms는 숫자여야 합니다'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        output = stream_output(request)
+        if output not in STREAM_FORMATS:
+            return Response({'error': 'output은 sse 또는 ndjson 이어야 합니다'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        response = StreamingHttpResponse(iter_stream(self._iter_plan_events(params, search_budget), output),
+                                         content_type=STREAM_FORMATS[output][1])
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # 프록시(nginx) 버퍼링 없이 이벤트마다 전송
+        return response
+    
+    def _iter_plan_events(self, params, search_budget=None):
+        """(이벤트 이름, 데이터) 생성 - 같은 요청의 이벤트 목록은 계획 캐시에서 바로 재생"""
+        generation = current_generation()
+        key = plan_key('ai-trip', params, generation)
+        events_key = plan_key('ai-trip-days', params, generation)
+        
+        cached_events = get_cached_plan(events_key)
+        if cached_events is not None:
+            yield from cached_events
+            return
+        
+        plan_id = plan_id_from_key(key)
+        events = [('start', {'id': f'ai-trip-{plan_id}', 'total_days': params['duration_days']})]
+        yield events[0]
+        
+        try:
+            places = self._collect_place_data(params['location'], params['preferences'])
+            daily_plans = []
+            for daily_plan in self._iter_daily_plans(places, params['location'], params['preferences'],
+                                                     params['duration_days'], params['travel_style'],
+                                                     search_budget=search_budget):
+                daily_plans.append(daily_plan)
+                events.append(('day', daily_plan))
+                yield events[-1]
+            trip_plan = self._summarize_trip_plan(places, daily_plans, plan_id=plan_id, **params)
+        except Exception as e:
+            logger.error(f"AI 여행 계획 스트리밍 오류: {str(e)}")
+            yield 'error', {'error': f'여행 계획 생성 중 오류가 발생했습니다: {str(e)}'}
+            return
+        
+        events.append(('summary', trip_plan))
+        store_plan(events_key, events)
+        store_plan(key, trip_plan)
+        yield events[-1]
+
+
+class AITripPlanBatchView(AITripPlannerView):
+    """
+    여행 계획 변형 일괄 생성 API
+    POST ai-trip/batch/ {"location", "preferences", "duration_days",
+                         "variants": [{"travel_style": "여유", "with_who": "가족"}, ...]}
+    후보 장소는 (지역, 선호도)에만 의존하므로 한 번만 수집하고 모든 변형이 공유합니다.
+    각 계획의 ID와 캐시는 같은 값으로 ai-trip API를 호출한 경우와 같습니다.
+    """
+    max_variants = 6
+    
+    def post(self, request):
+        variants = request.data.get('variants')
+        if not isinstance(variants, list) or not variants or not all(isinstance(v, dict) for v in variants):
+            return Response({'error': 'variants에 travel_style/with_who 목록을 입력해주세요'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(variants) > self.max_variants:
+            return Response({'error': f'variants는 최대 {self.max_variants}개까지 요청할 수 있습니다'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        
+        # 보낸 값만 복사 (빠진 duration_days는 ai-trip API처럼 기본값 1일)
+        base = {field: request.data[field] for field in ('location', 'preferences', 'duration_days') if field in request.data}
+        try:
+            variant_params = [
+                normalize_plan_request({**base, 'travel_style': v.get('travel_style'), 'with_who': v.get('with_who')})
+                for v in variants
+            ]
+        except (TypeError, ValueError):
+            return Response({'error': 'duration_days는 정수여야 합니다'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if not variant_params[0]['location']:
+            return Response({'error': '여행 지역을 입력해주세요'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            search_budget = _search_budget(request)
+        except (TypeError, ValueError):
+            return Response({'error': 'deadline_ms는 숫자여야 합니다'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            generation = current_generation()
+            pool = []
+            
+            def candidates():
+                # 캐시에 없는 변형이 처음 필요로 할 때 한 번만 수집
+                if not pool:
+                    pool.append(self._collect_place_data(variant_params[0]['location'], variant_params[0]['preferences']))
+                return pool[0]
+            
+            def builder(key, params):
+                return lambda: self._generate_ai_trip_plan(places=candidates(), plan_id=plan_id_from_key(key),
+                                                           search_budget=search_budget, **params)
+            
+            plans = []
+            for params in variant_params:
+                key = plan_key('ai-trip', params, generation)
+                plans.append(get_or_build_plan(key, builder(key, params)))
+            
+            return Response({'plans': plans}, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            logger.error(f"AI 여행 계획 일괄 생성 오류: {str(e)}")
+            return Response({'error': f'여행 계획 생성 중 오류가 발생했습니다: {str(e)}'},
+                            status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class AITripPlanJobDetailView(APIView):
+    """
+    비동기 여행 계획 작업 조회 API
+    status: pending | running | done | failed
+    progress: 단계(collecting/planning), 완성된 일 수, 완성된 일별 계획
+    result: 완료 시 여행 계획 (ai-trip API와 같은 형태)
+    """
+    permission_classes = [AllowAny]
+    
+    def get(self, request, job_id):
+        job = TripPlanJob.objects.filter(pk=job_id).first()
+        if job is None:
+            return Response({'error': '작업을 찾을 수 없습니다'}, status=status.HTTP_404_NOT_FOUND)
+        
+        data = {
+            'job_id': job.id,
+            'status': job.status,
+            'progress': job.progress,
+        }
+        if job.status == 'done':
+            data['result'] = job.result
+        elif job.status == 'failed':
+            data['error'] = f'여행 계획 생성 중 오류가 발생했습니다: {job.error}'
+        return Response(data, status=status.HTTP_200_OK)
+
+
 class DbSearchPlacesView(APIView):
     """
     데이터베이스 기반 장소 검색 API
@@ -997,12 +1416,12 @@ class DbSearchPlacesView(APIView):
                 # 실제 이동 시간 계산은 복잡하므로 여기서는 생략
                 pass
                 
-            # 3. 정렬 적용
-            if sort_by == 'rating':
-                places_data.sort(key=lambda x: x['rating'], reverse=True)
+            # 3. 정렬 적용 (미리 계산된 점수 기준, 동점은 ID 순으로 고정)
+            if sort_by in ('rating', 'popularity'):
+                places_data.sort(key=lambda x: (-x['score'], x['id']))
             elif sort_by == 'review_count':
-                # 리뷰 카운트가 없으므로 평점으로 대체
-                places_data.sort(key=lambda x: x['rating'], reverse=True)
+                # 리뷰 수도 점수에서 파생되므로 점수 기준 정렬
+                places_data.sort(key=lambda x: (-x['score'], x['id']))
             elif sort_by == 'distance':
                 # 거리 정보가 없으므로 기본 정렬 유지
                 pass
@@ -1033,12 +1452,12 @@ class DbSearchPlacesView(APIView):
                     'address': place.get('address', ''),
                     'categories': categories,
                     'rating': place.get('rating', 4.0),
-                    'reviewCount': random.randint(10, 200),  # 임시 리뷰 수
+                    'reviewCount': review_count_from_score(place.get('score')),  # 임시 리뷰 수
                     'is_drive_course': 'attr_' in place_id,
                     'is_kids_zone': 'pet_' not in place_id and 'food_' not in place_id,
                     'is_no_kids_zone': 'food_' in place_id,
                     'is_pet_zone': 'pet_' in place_id,
-                    'travel_time': random.randint(10, 60),  # 임시 이동 시간
+                    'travel_time': stable_bucket(place_id, 10, 60),  # 임시 이동 시간
                 }
                 
                 results.append(place_obj)
@@ -1131,12 +1550,12 @@ class DbSearchPlacesView(APIView):
                 # 실제 이동 시간 계산은 복잡하므로 여기서는 생략
                 pass
                 
-            # 3. 정렬 적용
-            if sort_by == 'rating':
-                places_data.sort(key=lambda x: x['rating'], reverse=True)
+            # 3. 정렬 적용 (미리 계산된 점수 기준, 동점은 ID 순으로 고정)
+            if sort_by in ('rating', 'popularity'):
+                places_data.sort(key=lambda x: (-x['score'], x['id']))
             elif sort_by == 'review_count':
-                # 리뷰 카운트가 없으므로 평점으로 대체
-                places_data.sort(key=lambda x: x['rating'], reverse=True)
+                # 리뷰 수도 점수에서 파생되므로 점수 기준 정렬
+                places_data.sort(key=lambda x: (-x['score'], x['id']))
             elif sort_by == 'distance':
                 # 거리 정보가 없으므로 기본 정렬 유지
                 pass
@@ -1167,12 +1586,12 @@ class DbSearchPlacesView(APIView):
                     'address': place.get('address', ''),
                     'categories': categories,
                     'rating': place.get('rating', 4.0),
-                    'reviewCount': random.randint(10, 200),  # 임시 리뷰 수
+                    'reviewCount': review_count_from_score(place.get('score')),  # 임시 리뷰 수
                     'is_drive_course': 'attr_' in place_id,
                     'is_kids_zone': 'pet_' not in place_id and 'food_' not in place_id,
                     'is_no_kids_zone': 'food_' in place_id,
                     'is_pet_zone': 'pet_' in place_id,
-                    'travel_time': random.randint(10, 60),  # 임시 이동 시간
+                    'travel_time': stable_bucket(place_id, 10, 60),  # 임시 이동 시간
                 }
                 
                 results.append(place_obj)
@@ -1218,55 +1637,66 @@ class DbSearchPlacesView(APIView):
         places_data = []
         
         # 관광지 데이터 수집
-        query = Attraction.objects.all()
+        query = PetTourSpot.objects.filter(contenttypeid=PetTourSpot.CONTENT_TYPE_ATTRACTION)
         if keyword:
             query = query.filter(title__icontains=keyword) | query.filter(addr1__icontains=keyword)
         
-        attractions = query[:20]
+        attractions = query.order_by('-score', 'id')[:20]
         for place in attractions:
             places_data.append({
                 'id': f'attr_{place.id}',
                 'name': place.title,
                 'description': f"{place.title}은(는) {place.addr1}에 위치한 관광 명소입니다.",
-                'image_url': place.image or '',
+                'image_url': place.firstimage or '',
                 'latitude': float(place.mapy) if place.mapy else 0,
                 'longitude': float(place.mapx) if place.mapx else 0,
                 'address': place.addr1,
                 'contact': place.tel,
                 'opening_hours': '09:00 - 18:00',  # 기본값
-                'rating': 4.0 + round(random.random() * 1.0, 1),  # 4.0-5.0 사이 랜덤값
+                'rating': rating_from_score(place.score),
+                'score': place.score,
                 'visit_duration': 120,  # 기본값 2시간
                 'category': '관광지',
             })
         
         # 음식점 데이터 수집
-        query = Food.objects.all()
+        query = PetTourSpot.objects.filter(contenttypeid=PetTourSpot.CONTENT_TYPE_FOOD)
         if keyword:
             query = query.filter(title__icontains=keyword) | query.filter(addr1__icontains=keyword)
         
-        foods = query[:10]
+        foods = query.order_by('-score', 'id')[:10]
         for place in foods:
             places_data.append({
                 'id': f'food_{place.id}',
                 'name': place.title,
                 'description': f"{place.title}은(는) {place.addr1}에 위치한 음식점입니다.",
-                'image_url': place.image or '',
+                'image_url': place.firstimage or '',
                 'latitude': float(place.mapy) if place.mapy else 0,
                 'longitude': float(place.mapx) if place.mapx else 0,
                 'address': place.addr1,
                 'contact': place.tel,
                 'opening_hours': '11:00 - 21:00',  # 기본값
-                'rating': 4.0 + round(random.random() * 1.0, 1),  # 4.0-5.0 사이 랜덤값
+                'rating': rating_from_score(place.score),
+                'score': place.score,
                 'visit_duration': 90,  # 기본값 1시간 30분
                 'category': '음식점',
             })
         
-        # 반려동물 동반 여행지
-        query = PetTour.objects.all()
+        # 반려동물 동반 여행지 (미리 계산된 점수 순 상위 N개)
+        query = PetTourSpot.objects.all()
         if keyword:
             query = query.filter(title__icontains=keyword) | query.filter(addr1__icontains=keyword)
             
-        pet_places = query[:10]
+        pet_places = list(query.order_by('-score', 'id')[:10])
+
+        # 일치하는 장소가 부족하면 오타 허용 검색으로 보충 (카카오 API 호출 전에 로컬에서 처리)
+        if keyword and len(places_data) + len(pet_places) < 10:
+            found_ids = {place.id for place in pet_places}
+            fuzzy_ids = [spot_id for spot_id in fuzzy_search_spots(keyword, limit=10) if spot_id not in found_ids]
+            fuzzy_places = PetTourSpot.objects.in_bulk(fuzzy_ids)
+            pet_places += [fuzzy_places[spot_id] for spot_id in fuzzy_ids if spot_id in fuzzy_places]
+            pet_places = pet_places[:10]
+
         for place in pet_places:
             places_data.append({
                 'id': f'pet_{place.id}',
@@ -1278,7 +1708,8 @@ class DbSearchPlacesView(APIView):
                 'address': place.addr1,
                 'contact': place.tel,
                 'opening_hours': '09:00 - 18:00',  # 기본값
-                'rating': 4.0 + round(random.random() * 1.0, 1),  # 4.0-5.0 사이 랜덤값
+                'rating': rating_from_score(place.score),
+                'score': place.score,
                 'visit_duration': 120,  # 기본값 2시간
                 'category': '반려동물 동반',
             })
@@ -1286,12 +1717,12 @@ class DbSearchPlacesView(APIView):
         # 충분한 결과가 없을 경우 카카오 API로 추가 데이터 수집
         if len(places_data) < 10:
             kakao_service = KakaoApiService()
-            search_result = kakao_service.search_places(query=keyword if keyword else "명소", size=10)
+            search_result = search_places_cached(kakao_service, query=keyword if keyword else "명소", size=10)
             documents = search_result.get('documents', [])
             
             for place in documents:
                 # 장소 데이터 가공
-                rating = round(4.0 + random.random() * 0.7, 1)
+                score = score_kakao_document(place)
                 
                 if place.get('y') and place.get('x'):
                     category = self._categorize_place(place.get('category_name', ''))
@@ -1305,12 +1736,14 @@ class DbSearchPlacesView(APIView):
                         'address': place.get('address_name', ''),
                         'contact': place.get('phone', ''),
                         'opening_hours': '09:00 - 18:00',  # 기본값
-                        'rating': rating,
+                        'rating': rating_from_score(score),
+                        'score': score,
                         'visit_duration': self._estimate_visit_duration(place.get('category_name', '')),
                         'category': category,
                     })
         
-        return places_data
+        # 출처 간 중복 제거 (DB 장소 우선)
+        return dedupe_places(places_data)
     
     def _categorize_place(self, category_name):
         """카테고리 분류"""
@@ -1342,4 +1775,341 @@ class DbSearchPlacesView(APIView):
         elif '쇼핑' in category_name:
             return 120  # 쇼핑: 2시간
         else:
-            return 60  # 기본값: 1시간
\ No newline at end of file
+            return 60  # 기본값: 1시간
+
+class RegionBundleView(CatalogConditionalMixin, APIView):
+    """
+    지역(areacode)별 오프라인 번들 매니페스트 API
+    앱은 매니페스트의 url에서 SQLite 번들을 내려받아 로컬 검색에 사용합니다.
+    ETag는 카탈로그 세대가 아니라 실제로 내보낸 번들 세대를 따릅니다 (세대가 올라간 뒤 번들을 다시 만드는 동안 이전 매니페스트가 새 ETag로 캐시되지 않도록).
+    """
+    permission_classes = [AllowAny]
+    
+    def get_etag_version(self):
+        return f'bundle-{latest_bundle_generation()}'
+    
+    def get(self, request):
+        manifest = latest_manifest()
+        if manifest is None:
+            return Response({'error': '생성된 번들이 없습니다'}, status=status.HTTP_404_NOT_FOUND)
+        
+        bundles = manifest['bundles']
+        # 특정 지역만 요청한 경우
+        areacode = request.query_params.get('areacode')
+        if areacode:
+            bundles = [b for b in bundles if b['areacode'] == areacode]
+            if not bundles:
+                return Response({'error': '해당 지역의 번들이 없습니다'}, status=status.HTTP_404_NOT_FOUND)
+        
+        # 다운로드 URL은 이 API 경로 기준 (bundles/<generation>/<filename>)
+        generation = manifest['generation']
+        bundles = [
+            dict(b, url=request.build_absolute_uri(f'{generation}/{b["filename"]}'))
+            for b in bundles
+        ]
+        return Response(dict(manifest, bundles=bundles), status=status.HTTP_200_OK)
+
+
+class RegionBundleFileView(APIView):
+    """
+    오프라인 번들 파일 다운로드 API
+    GET bundles/<generation>/<filename> - 세대별 파일은 내용이 바뀌지 않으므로 오래 캐시됩니다.
+    """
+    permission_classes = [AllowAny]
+    
+    def get(self, request, generation, filename):
+        path = bundle_path(generation, filename)
+        if path is None:
+            return Response({'error': '번들 파일이 없습니다'}, status=status.HTTP_404_NOT_FOUND)
+        response = FileResponse(open(path, 'rb'), content_type='application/vnd.sqlite3', as_attachment=True, filename=filename)
+        patch_cache_control(response, public=True, max_age=settings.BUNDLE_CACHE_MAX_AGE, immutable=True)
+        return response
+
+
+class CatalogChangesView(CatalogConditionalMixin, APIView):
+    """
+    카탈로그 변경분 조회 API (증분 동기화)
+    GET ?since=<세대 번호|시각 YYYYMMDDHHMMSS>&cursor=<변경 ID>&limit=<개수>
+    stream=true 이면 전체 변경분을 NDJSON으로 스트리밍합니다.
+    """
+    permission_classes = [AllowAny]
+    default_limit = 500
+    max_limit = 2000
+    
+    def get(self, request):
+        since = request.query_params.get('since', '')
+        if not since.isdigit():
+            return Response({'error': 'since(세대 번호 또는 시각)가 필요합니다'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            cursor = int(request.query_params.get('cursor', 0))
+            limit = min(int(request.query_params.get('limit', self.default_limit)), self.max_limit)
+        except ValueError:
+            return Response({'error': 'cursor와 limit은 숫자여야 합니다'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if len(since) >= len('YYYYMMDDHHMMSS'):
+            try:
+                since = str(generation_at(since))
+            except ValueError:
+                return Response({'error': 'since 시각은 YYYYMMDDHHMMSS 형식이어야 합니다'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        generation = current_generation()
+        
+        try:
+            if request.query_params.get('stream') == 'true':
+                # 첫 페이지를 미리 조회해 만료 여부를 응답 시작 전에 확인
+                fetch_changes(since, limit=1)
+                return self._stream_changes(since, generation)
+            
+            changes, next_cursor = fetch_changes(since, cursor=cursor, limit=limit)
+        except ChangeLogExpired:
+            return Response({'error': '변경 로그 보관 기간이 지났습니다. 전체 데이터를 다시 받아주세요',
+                             'generation': generation},
+                            status=status.HTTP_410_GONE)
+        
+        return Response({
+            'generation': generation,
+            'changes': changes,
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None,
+        }, status=status.HTTP_200_OK)
+    
+    def _stream_changes(self, since, generation):
+        """변경분을 한 줄에 하나씩 NDJSON으로 전송하고 마지막에 요약 줄 전송"""
+        def lines():
+            count = 0
+            for change in iter_changes(since):
+                count += 1
+                yield orjson.dumps(change) + b'\n'
+            yield orjson.dumps({'generation': generation, 'count': count, 'done': True}) + b'\n'
+        
+        return StreamingHttpResponse(lines(), content_type='application/x-ndjson; charset=utf-8')
+
+
+class CatalogExportView(APIView):
+    """
+    카탈로그 전체 스트리밍 내보내기 API
+    GET export/<source>/?output=ndjson|json&fields=contentid,title,...
+    행을 읽는 즉시 소켓으로 전송하므로 테이블 크기와 무관하게 메모리 사용량이 일정합니다.
+    """
+    permission_classes = [AllowAny]
+    
+    # 내보내기 대상 (source 경로 값 → (모델, 조회 조건)) - 관광지는 PetTourSpot 중 관광지 콘텐츠 타입
+    sources = {
+        'pet-tour': (PetTourSpot, {}),
+        'attractions': (PetTourSpot, {'contenttypeid': PetTourSpot.CONTENT_TYPE_ATTRACTION}),
+    }
+    
+    def get(self, request, source):
+        if source not in self.sources:
+            return Response({'error': f'지원하지 않는 대상입니다: {source}'}, status=status.HTTP_404_NOT_FOUND)
+        model, lookup = self.sources[source]
+        
+        # 필드 선택
+        available_fields = export_field_names(model)
+        fields_param = request.query_params.get('fields', '')
+        fields = [f.strip() for f in fields_param.split(',') if f.strip()] or available_fields
+        invalid_fields = [f for f in fields if f not in available_fields]
+        if invalid_fields:
+            return Response({'error': f'알 수 없는 필드입니다: {", ".join(invalid_fields)}',
+                             'available_fields': available_fields},
+                            status=status.HTTP_400_BAD_REQUEST)
+        
+        output = request.query_params.get('output', 'ndjson')
+        rows = iter_rows(model.objects.filter(**lookup), fields)
+        
+        if output == 'ndjson':
+            response = StreamingHttpResponse(iter_ndjson(rows), content_type='application/x-ndjson; charset=utf-8')
+        elif output == 'json':
+            response = StreamingHttpResponse(iter_json_array(rows), content_type='application/json; charset=utf-8')
+        else:
+            return Response({'error': 'output은 ndjson 또는 json 이어야 합니다'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        response['Content-Disposition'] = f'attachment; filename="{source}-{current_generation()}.{output}"'
+        return response
+
+
+class SuggestView(CatalogConditionalMixin, APIView):
+    """
+    검색어 자동완성 API
+    GET ?q=<입력 중인 검색어>&limit=<개수>
+    장소명/지역명 접두사와 초성("ㅈㅈ" → 제주) 입력을 인기도 순으로 제안합니다.
+    """
+    permission_classes = [AllowAny]
+    default_limit = 10
+    
+    def get(self, request):
+        query = request.query_params.get('q', '')
+        try:
+            limit = max(int(request.query_params.get('limit', self.default_limit)), 1)
+        except ValueError:
+            return Response({'error': 'limit은 숫자여야 합니다'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        suggestions = [
+            {'text': entry['text'], 'type': entry['type'], 'id': entry['id'], 'score': entry['weight']}
+            for entry in suggest(query, limit)
+        ]
+        return Response(suggestions, status=status.HTTP_200_OK)
+
+
+def _valid_coordinate(lat, lng):
+    """유한한 값이고 위도 -90~90, 경도 -180~180 범위인지"""
+    return math.isfinite(lat) and math.isfinite(lng) and -90 <= lat <= 90 and -180 <= lng <= 180
+
+
+class ClusterView(CatalogConditionalMixin, APIView):
+    """
+    지도 마커 클러스터 API
+    GET ?bbox=<서,남,동,북 경위도>&zoom=<지도 줌>
+    원본 좌표 대신 줌에 맞게 묶인 클러스터(개수, 중심, 대표 장소 ID)를 반환합니다.
+    """
+    permission_classes = [AllowAny]
+    
+    def get(self, request):
+        try:
+            min_lng, min_lat, max_lng, max_lat = (float(v) for v in request.query_params.get('bbox', '').split(','))
+            zoom = int(request.query_params.get('zoom', ''))
+        except ValueError:
+            return Response({'error': 'bbox(서,남,동,북)와 zoom이 필요합니다'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if (not _valid_coordinate(min_lat, min_lng) or not _valid_coordinate(max_lat, max_lng)
+                or min_lat > max_lat or min_lng > max_lng):
+            return Response({'error': 'bbox 범위가 올바르지 않습니다'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        clusters = get_clusters(min_lat, min_lng, max_lat, max_lng, zoom)
+        return Response({
+            'zoom': zoom,
+            'count': len(clusters),
+            'clusters': clusters,
+        }, status=status.HTTP_200_OK)
+
+
+class MapTileView(CatalogConditionalMixin, APIView):
+    """
+    지도 포인트 타일 API (바이너리, 형식은 attractions.tiles 참고)
+    GET tiles/<z>/<x>/<y>/?g=<카탈로그 세대>
+    현재 세대 번호(g)를 붙여 요청하면 내용이 바뀌지 않으므로 CDN/브라우저에 오래 캐시됩니다.
+    """
+    permission_classes = [AllowAny]
+    
+    def get(self, request, z, x, y):
+        try:
+            data = get_tile(current_generation(), z, x, y)
+        except TileOutOfRange as e:
+            return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
+        return HttpResponse(data, content_type='application/octet-stream')
+    
+    def _set_cache_headers(self, response, etag):
+        if self.request.GET.get('g') != str(current_generation()):
+            return super()._set_cache_headers(response, etag)
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, max_age=settings.TILE_CACHE_MAX_AGE, immutable=True)
+
+
+class CorridorSearchView(APIView):
+    """
+    경로 주변 장소 검색 API (드라이브 코스)
+    POST {"path": [[위도, 경도], ...], "buffer_km": 2, "limit": 50}
+    경로에서 buffer_km 이내의 반려동물 동반 장소를 경로 진행 순서대로 반환합니다.
+    """
+    permission_classes = [AllowAny]
+    default_buffer_km = 2.0
+    max_buffer_km = 20.0
+    max_path_points = 5000
+    default_limit = 50
+    max_limit = 500
+    
+    def post(self, request):
+        path = request.data.get('path') or []
+        try:
+            path = [(float(lat), float(lng)) for lat, lng in path]
+            buffer_km = float(request.data.get('buffer_km', self.default_buffer_km))
+            limit = min(max(int(request.data.get('limit', self.default_limit)), 1), self.max_limit)
+        except (TypeError, ValueError, OverflowError):
+            return Response({'error': 'path는 [위도, 경도] 목록, buffer_km과 limit은 숫자여야 합니다'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        
+        if not 2 <= len(path) <= self.max_path_points:
+            return Response({'error': f'path는 2~{self.max_path_points}개의 좌표여야 합니다'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if not all(_valid_coordinate(lat, lng) for lat, lng in path):
+            return Response({'error': 'path 좌표의 위도/경도 범위가 올바르지 않습니다'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if not 0 < buffer_km <= self.max_buffer_km:
+            return Response({'error': f'buffer_km은 0보다 크고 {self.max_buffer_km} 이하여야 합니다'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        
+        spots = get_spot_arrays()
+        indices, distances, alongs = corridor_search(spots, path, buffer_km * 1000, limit=limit)
+        places = PetTourSpot.objects.in_bulk([int(pk) for pk in spots.pks[indices]])
+        
+        results = []
+        for pk, distance, along in zip(spots.pks[indices], distances, alongs):
+            place = places.get(int(pk))
+            if place is None:
+                continue
+            results.append({
+                'id': f'pet_{place.id}',
+                'contentid': place.contentid,
+                'name': place.title,
+                'address': place.addr1,
+                'image_url': place.firstimage or '',
+                'latitude': place.mapy,
+                'longitude': place.mapx,
+                'score': place.score,
+                'distance_from_route_m': round(float(distance)),
+                'distance_along_route_m': round(float(along)),
+            })
+        
+        return Response({
+            'buffer_km': buffer_km,
+            'count': len(results),
+            'results': results,
+        }, status=status.HTTP_200_OK)
+
+
+class NearbyPlacesView(CatalogConditionalMixin, APIView):
+    """
+    근처 장소 추천 API (미리 계산된 근접 장소 목록 사용)
+    GET nearby/<장소 pk>/?category=<contenttypeid>&limit=<개수>
+    """
+    permission_classes = [AllowAny]
+    
+    def get_etag_version(self):
+        # 근접 장소 목록은 카탈로그 세대를 올리지 않는 야간 배치로 바뀌므로 계산 세대도 포함
+        return f"{current_generation()}-neighbors-{neighbors_generation(self.kwargs['pk'])}"
+    
+    def get(self, request, pk):
+        category = request.query_params.get('category') or None
+        try:
+            limit = min(max(int(request.query_params.get('limit', NEIGHBOR_K)), 1), NEIGHBOR_K)
+        except ValueError:
+            return Response({'error': 'limit은 숫자여야 합니다'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        neighbors = get_neighbors(pk, category=category, limit=limit)
+        places = PetTourSpot.objects.in_bulk([neighbor_pk for neighbor_pk, _ in neighbors])
+        
+        results = []
+        for neighbor_pk, distance in neighbors:
+            place = places.get(neighbor_pk)
+            if place is None:
+                continue
+            results.append({
+                'id': f'pet_{place.id}',
+                'contentid': place.contentid,
+                'name': place.title,
+                'address': place.addr1,
+                'image_url': place.firstimage or '',
+                'latitude': place.mapy,
+                'longitude': place.mapx,
+                'category': place.contenttypeid,
+                'score': place.score,
+                'distance_m': distance,
+            })
+        
+        return Response({
+            'id': f'pet_{pk}',
+            'count': len(results),
+            'results': results,
+        }, status=status.HTTP_200_OK)
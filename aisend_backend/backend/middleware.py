@@ -0,0 +1,96 @@
+"""
+응답 압축 미들웨어
+
+Accept-Encoding 협상으로 brotli(설치된 경우) 또는 gzip을 선택하고,
+COMPRESSION_MIN_SIZE 바이트 이상인 응답만 압축합니다.
+"""
+import gzip
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # brotli 미설치 시 gzip만 사용
+    brotli = None
+
+
+def _parse_accept_encoding(header):
+    """Accept-Encoding 헤더를 {인코딩: q값} 딕셔너리로 변환"""
+    encodings = {}
+    for part in header.split(','):
+        token, _, params = part.strip().partition(';')
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        encodings[token] = q
+    return encodings
+
+
+def choose_encoding(header):
+    """클라이언트가 허용한 인코딩 중 사용할 인코딩 선택 (없으면 None)"""
+    encodings = _parse_accept_encoding(header or '')
+    wildcard = encodings.get('*', 0.0)
+
+    candidates = []
+    if brotli is not None:
+        candidates.append('br')
+    candidates.append('gzip')
+
+    best, best_q = None, 0.0
+    for encoding in candidates:
+        q = encodings.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(content, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class CompressionMiddleware:
+    """크기 임계값 이상인 응답을 br/gzip으로 압축"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        # 스트리밍 응답(SSE/NDJSON 등)은 청크 단위 전송을 유지하기 위해 압축하지 않음
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        if len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        compressed = compress(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+
+        # 압축된 표현은 바이트가 달라지므로 강한 ETag를 약한 ETag로 변경 (RFC 9110)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+
+        return response
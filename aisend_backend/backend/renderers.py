@@ -0,0 +1,53 @@
+"""
+고속 JSON 렌더러
+
+DRF 기본 JSONRenderer(json 모듈 기반) 대신 orjson으로 직렬화합니다.
+한글을 이스케이프하지 않은 UTF-8 바이트를 바로 만들어 렌더링 시간과 응답 크기를 함께 줄입니다.
+"""
+import orjson
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(BaseRenderer):
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    # orjson이 직접 처리하지 못하는 타입(Decimal, 지연 번역 문자열 등)은 DRF 인코더에 위임
+    _fallback_encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return orjson.dumps(data, default=self._fallback_encoder.default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    text/event-stream 요청(EventSource)을 받는 스트리밍 API용
+    본문은 뷰가 StreamingHttpResponse로 직접 보내므로, 여기서는 오류 응답만 error 이벤트 하나로 렌더링
+    """
+    media_type = 'text/event-stream'
+    format = 'sse'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return b'event: error\ndata: ' + orjson.dumps(data) + b'\n\n'
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    application/x-ndjson 요청을 받는 스트리밍 API용
+    본문은 뷰가 StreamingHttpResponse로 직접 보내므로, 여기서는 오류 응답만 error 이벤트 한 줄로 렌더링
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return orjson.dumps({'event': 'error', 'data': data}) + b'\n'
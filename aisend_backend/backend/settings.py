@@ -57,6 +57,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'backend.middleware.CompressionMiddleware',  # 응답 압축 (br/gzip)
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # CORS 미들웨어 추가
     'django.middleware.common.CommonMiddleware',
@@ -101,8 +102,7 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
-        'rest_framework.renderers.BrowsableAPIRenderer',
+        'backend.renderers.ORJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
@@ -189,6 +189,72 @@ KAKAO_REST_API_KEY = os.environ.get('KAKAO_REST_API_KEY', '')
 PUBLIC_DATA_API_KEY = os.environ.get('PUBLIC_DATA_API_KEY', '')
 TOUR_API_KEY = os.environ.get('TOUR_API_KEY', '')
 
+# 카카오 검색 결과 로컬 저장소 설정
+KAKAO_STORE_TTL_HOURS = int(os.environ.get('KAKAO_STORE_TTL_HOURS', 72))  # 이 시간이 지난 결과는 백그라운드 갱신
+KAKAO_REFRESH_WORKERS = 2
+
+# 응답 압축 설정
+COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))  # 바이트, 이보다 작은 응답은 압축하지 않음
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 5
+
+# 카탈로그 캐시 설정
+# 카탈로그 세대 번호를 프로세스 캐시에 보관하는 시간(초) - 동기화 반영 지연의 상한
+CATALOG_GENERATION_CACHE_SECONDS = int(os.environ.get('CATALOG_GENERATION_CACHE_SECONDS', 60))
+# 카탈로그 조회 API 응답의 Cache-Control max-age(초)
+CATALOG_CACHE_MAX_AGE = int(os.environ.get('CATALOG_CACHE_MAX_AGE', 60))
+# 목록 API 총 개수(COUNT) 캐시 시간(초) - 세대가 바뀌면 키가 달라져 자동 무효화
+CATALOG_COUNT_CACHE_SECONDS = 60 * 60
+
+# 지역별 오프라인 번들 (번들 API로 서빙)
+BUNDLE_ROOT = os.path.join(MEDIA_ROOT, 'bundles')
+BUNDLE_CACHE_MAX_AGE = 60 * 60 * 24 * 30  # 세대별 번들 파일은 내용이 바뀌지 않음
+BUNDLE_KEEP_GENERATIONS = 2  # 보관할 최근 세대 수 (다운로드 중인 클라이언트 보호)
+
+# 지도 포인트 타일 (세대별 디스크 캐시)
+TILE_ROOT = os.path.join(MEDIA_ROOT, 'tiles')
+TILE_MIN_ZOOM = 8  # 이보다 낮은 줌은 클러스터 API 사용
+TILE_MAX_ZOOM = 16
+TILE_PRERENDER_MAX_ZOOM = 12  # 동기화 후 미리 만들고 디스크에 저장하는 최대 줌 (더 깊은 줌은 요청마다 생성, 저장 안 함)
+TILE_KEEP_GENERATIONS = 2
+# 세대 번호(g)가 붙은 타일 요청의 Cache-Control max-age(초) - 내용이 바뀌지 않으므로 길게
+TILE_CACHE_MAX_AGE = 60 * 60 * 24 * 365
+
+# 시군구별 장소 간 이동 시간 행렬 (서버 내부 데이터, 공개 서빙하지 않음)
+TRAVEL_TIME_ROOT = os.path.join(BASE_DIR, 'catalog_data', 'travel_times')
+TRAVEL_TIME_KEEP_GENERATIONS = 2
+
+# 캐시 설정 (프로세스 메모리)
+# plans: 여행 계획 결과 캐시 - 키에 카탈로그 세대가 들어가므로 동기화 후 자동으로 새 계획 생성
+PLAN_CACHE_SECONDS = int(os.environ.get('PLAN_CACHE_SECONDS', 60 * 60 * 6))
+PLAN_CACHE_MAX_ENTRIES = int(os.environ.get('PLAN_CACHE_MAX_ENTRIES', 500))
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'plans': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'trip-plans',
+        'TIMEOUT': PLAN_CACHE_SECONDS,
+        'OPTIONS': {'MAX_ENTRIES': PLAN_CACHE_MAX_ENTRIES},
+    },
+}
+
+# 비동기 여행 계획 작업 (attractions.plan_jobs)
+PLAN_JOB_WORKERS = int(os.environ.get('PLAN_JOB_WORKERS', 2))
+PLAN_JOB_TIMEOUT_SECONDS = 5 * 60  # 이 시간 동안 갱신이 없는 작업은 중단된 것으로 보고 재실행
+PLAN_JOB_RETENTION_HOURS = 24
+
+# 여행 계획 경로 개선 시간 예산 (후보 수집이 끝나고 경로 개선을 시작한 때부터, 밀리초) - 요청의 deadline_ms로 조정 가능
+PLAN_DEADLINE_MS = int(os.environ.get('PLAN_DEADLINE_MS', 150))
+PLAN_MAX_DEADLINE_MS = 2000
+# 경로 탐색 프로세스 풀 (0이면 사용 안 함) - 후보 수가 PLAN_PROCESS_MIN_CANDIDATES 이상일 때만 사용
+PLAN_PROCESS_WORKERS = int(os.environ.get('PLAN_PROCESS_WORKERS', 0))
+PLAN_PROCESS_MIN_CANDIDATES = 20  # 위치 기반 계획 후보는 검색 3회 × 10곳에서 중복을 뺀 30곳 안팎
+
+# 카탈로그 변경 로그 보관 세대 수 (이보다 오래된 since 요청은 410으로 전체 재동기화 요구)
+CATALOG_CHANGE_RETENTION_GENERATIONS = 30
+
 
 # Django REST Framework 설정
 REST_FRAMEWORK = {
@@ -198,6 +264,9 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'backend.renderers.ORJSONRenderer',
+    ],
 }
 
 # 개발 중 CORS 설정
@@ -1,3 +1,5 @@
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
 
@@ -6,3 +8,7 @@ urlpatterns = [
     # 기존 앱들...
     path('pet-tour/', include('pet_tour_sync.urls')),
 ]
+
+# 개발 환경에서 MEDIA(오프라인 번들 등) 파일 서빙
+if settings.DEBUG:
+    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,106 @@
+"""
+JSON 렌더링 / 응답 압축 벤치마크
+
+100개 장소 검색 응답과 5일 AI 여행 계획 응답을 대상으로
+DRF 기본 JSONRenderer와 ORJSONRenderer의 렌더링 시간, 전송 바이트(원본/gzip/br)를 비교합니다.
+
+실행: python benchmarks/render_bench.py  (aisend_backend 디렉터리에서)
+"""
+import gzip
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django
+from django.conf import settings
+
+if not settings.configured:
+    settings.configure(
+        REST_FRAMEWORK={},
+        COMPRESSION_GZIP_LEVEL=6,
+        COMPRESSION_BROTLI_QUALITY=5,
+    )
+    django.setup()
+
+from rest_framework.renderers import JSONRenderer
+
+from backend.renderers import ORJSONRenderer
+from backend.middleware import brotli, compress
+
+
+def build_search_payload(count=100):
+    """DbSearchPlacesView 응답 형태의 검색 결과"""
+    results = []
+    for i in range(count):
+        results.append({
+            'id': f'pet_{i}',
+            'name': f'제주 반려동물 동반 카페 {i}',
+            'description': f'제주 반려동물 동반 카페 {i}은(는) 제주특별자치도 제주시 애월읍에 위치한 반려동물 동반 가능 장소입니다.',
+            'imageUrl': f'http://tong.visitkorea.or.kr/cms/resource/{i:02d}/2765{i:03d}_image2_1.jpg',
+            'latitude': 33.4 + i * 0.001,
+            'longitude': 126.3 + i * 0.001,
+            'address': '제주특별자치도 제주시 애월읍 애월해안로',
+            'categories': ['반려동물 동반'],
+            'rating': 4.3,
+            'reviewCount': 120,
+            'is_drive_course': False,
+            'is_kids_zone': False,
+            'is_no_kids_zone': False,
+            'is_pet_zone': True,
+            'travel_time': 25,
+        })
+    return {'results': results, 'count': count, 'page': 1, 'pageSize': count, 'hasMore': False}
+
+
+def build_trip_payload(days=5, places_per_day=6):
+    """AITripPlannerView 응답 형태의 여행 계획"""
+    places = []
+    for day in range(days):
+        for i in range(places_per_day):
+            places.append({
+                'id': f'kakao_{day}{i:04d}',
+                'name': f'부산 해운대 명소 {day}-{i}',
+                'description': f'부산 해운대 명소 {day}-{i}은(는) 부산광역시 해운대구 우동에 위치한 관광지입니다.',
+                'imageUrl': '',
+                'latitude': 35.15 + i * 0.002,
+                'longitude': 129.15 + day * 0.002,
+                'visitDuration': 120,
+                'rating': 4.4,
+                'order': i + 1,
+                'visitTime': '09:00 ~ 11:00',
+                'category': '관광지',
+                'tips': ['방문 전 영업시간을 확인하세요.', '주변 명소도 함께 둘러보세요.'],
+            })
+    return {
+        'id': 'ai-trip-3f2a9c1d',
+        'title': f'부산 {days}일 여행 코스',
+        'description': f'부산에서의 {days}일 친구와 함께하는 균형 잡힌 일정. 당신의 선호도에 맞춘 맞춤형 여행 계획입니다.',
+        'imageUrl': '',
+        'rating': 4.8,
+        'duration': days * 24 * 60,
+        'tags': ['부산', '우정여행', '맛집탐방'],
+        'places': places,
+    }
+
+
+def bench(name, payload, number=2000):
+    rows = []
+    for renderer in (JSONRenderer(), ORJSONRenderer()):
+        body = renderer.render(payload)
+        seconds = timeit.timeit(lambda: renderer.render(payload), number=number) / number
+        sizes = [len(body), len(compress(body, 'gzip'))]
+        sizes.append(len(compress(body, 'br')) if brotli is not None else None)
+        rows.append((renderer.__class__.__name__, seconds * 1e6, *sizes))
+
+    print(f'\n[{name}]')
+    print(f'{"renderer":<16}{"render(us)":>12}{"raw(B)":>10}{"gzip(B)":>10}{"br(B)":>10}')
+    for renderer_name, micros, raw, gz, br in rows:
+        br_text = f'{br:>10}' if br is not None else f'{"n/a":>10}'
+        print(f'{renderer_name:<16}{micros:>12.1f}{raw:>10}{gz:>10}{br_text}')
+
+
+if __name__ == '__main__':
+    bench('검색 100건', build_search_payload(100))
+    bench('AI 여행 5일', build_trip_payload(5))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from attractions.catalog import current_generation
+from attractions.neighbors import rebuild_neighbors
+
+
+class Command(BaseCommand):
+    help = '장소별 카테고리별 근접 장소 목록 계산 (야간 배치로 실행)'
+
+    def handle(self, *args, **options):
+        generation = current_generation()
+        count = rebuild_neighbors(generation)
+        self.stdout.write(self.style.SUCCESS(f'근접 장소 계산 완료! (세대 {generation}, 장소 {count}건)'))
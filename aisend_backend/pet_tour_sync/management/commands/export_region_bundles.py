@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from attractions.bundles import export_region_bundles
+from attractions.catalog import current_generation
+
+
+class Command(BaseCommand):
+    help = '지역(areacode)별 오프라인 카탈로그 번들(SQLite) 생성'
+
+    def handle(self, *args, **options):
+        generation = current_generation()
+        manifest = export_region_bundles(generation)
+        total = sum(bundle['count'] for bundle in manifest['bundles'])
+        self.stdout.write(self.style.SUCCESS(
+            f'번들 생성 완료! (세대 {generation}, 지역 {len(manifest["bundles"])}개, 총 {total}건)'
+        ))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from attractions.catalog import current_generation
+from attractions.tiles import render_tiles
+
+
+class Command(BaseCommand):
+    help = '현재 카탈로그 세대의 지도 포인트 타일 미리 생성'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-zoom', type=int, default=None, help='미리 만들 최대 줌 (기본값: TILE_PRERENDER_MAX_ZOOM)')
+
+    def handle(self, *args, **options):
+        generation = current_generation()
+        count = render_tiles(generation, max_zoom=options['max_zoom'])
+        self.stdout.write(self.style.SUCCESS(f'타일 생성 완료! (세대 {generation}, 타일 {count}개)'))
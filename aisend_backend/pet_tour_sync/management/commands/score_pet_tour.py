@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from attractions.models import PetTourSpot
+from attractions.scoring import score_spot
+from attractions.catalog import bump_generation
+from attractions.changes import record_changes
+
+
+class Command(BaseCommand):
+    help = '반려동물 관광정보 인기도/품질 점수 재계산 (API 호출 없이 저장된 데이터로 계산)'
+
+    def handle(self, *args, **options):
+        updated = []
+        for spot in PetTourSpot.objects.all().iterator(chunk_size=1000):
+            score = score_spot(spot)
+            if score != spot.score:
+                spot.score = score
+                updated.append(spot)
+
+        if updated:
+            with transaction.atomic():
+                PetTourSpot.objects.bulk_update(updated, ['score'], batch_size=1000)
+                generation = bump_generation(reason='score_pet_tour', spot_count=PetTourSpot.objects.count())
+                record_changes(generation, updated, [])
+        self.stdout.write(self.style.SUCCESS(f'점수 재계산 완료! (변경 {len(updated)}건)'))
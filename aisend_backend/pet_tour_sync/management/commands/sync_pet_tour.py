@@ -1,11 +1,25 @@
 import requests
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from attractions.models import PetTourSpot
+from attractions.scoring import score_spot
+from attractions.catalog import bump_generation
+from attractions.bundles import export_region_bundles
+from attractions.tiles import render_tiles
+from attractions.travel_times import export_travel_times
+from attractions.changes import record_changes, prune_changes
 from django.conf import settings
 import xml.etree.ElementTree as ET
 
+# 수정 시 갱신하는 필드 (contentid 제외)
+SYNC_FIELDS = [
+    'title', 'addr1', 'addr2', 'areacode', 'sigungucode', 'mapx', 'mapy', 'tel',
+    'firstimage', 'contenttypeid', 'cat1', 'cat2', 'cat3', 'overview',
+    'createdtime', 'modifiedtime', 'score',
+]
+
 class Command(BaseCommand):
-    help = '매일 21시, 반려동물 관광정보 API 전체 동기화 (기존 데이터 완전삭제 후 최신화)'
+    help = '매일 21시, 반려동물 관광정보 API 전체 동기화 (변경분만 반영하고 변경 로그 기록)'
 
     def handle(self, *args, **options):
         api_key = settings.TOUR_API_KEY  # settings.py 또는 .env에 저장
@@ -21,14 +35,23 @@ class Command(BaseCommand):
         items = root.findall('.//item')
         self.stdout.write(f'API에서 {len(items)}개 데이터 수신')
 
-        # 기존 데이터 전체 삭제
-        PetTourSpot.objects.all().delete()
-        self.stdout.write('기존 데이터 전체 삭제 완료')
+        # 빈 응답으로 전체 데이터가 삭제되지 않도록 방어
+        if not items:
+            self.stderr.write('수신 데이터가 없어 동기화를 중단합니다')
+            return
+
+        # 기존 데이터 (contentid → (pk, modifiedtime))
+        existing = {
+            contentid: (pk, modifiedtime)
+            for pk, contentid, modifiedtime in PetTourSpot.objects.values_list('pk', 'contentid', 'modifiedtime')
+        }
 
-        # 새 데이터 insert
-        new_objs = []
+        # 신규/수정 데이터 분류
+        to_create = []
+        to_update = []
+        received_ids = set()
         for item in items:
-            new_objs.append(PetTourSpot(
+            spot = PetTourSpot(
                 contentid = item.findtext('contentid'),
                 title = item.findtext('title'),
                 addr1 = item.findtext('addr1'),
@@ -46,6 +69,52 @@ class Command(BaseCommand):
                 overview = item.findtext('overview') or '',
                 createdtime = item.findtext('createdtime'),
                 modifiedtime = item.findtext('modifiedtime'),
-            ))
-        PetTourSpot.objects.bulk_create(new_objs)
-        self.stdout.write(self.style.SUCCESS(f'동기화 완료! (총 {len(new_objs)}건)'))
\ No newline at end of file
+            )
+            # 인기도/품질 점수 미리 계산
+            spot.score = score_spot(spot)
+
+            if spot.contentid in received_ids:
+                continue
+            received_ids.add(spot.contentid)
+
+            current = existing.get(spot.contentid)
+            if current is None:
+                to_create.append(spot)
+            elif current[1] != spot.modifiedtime:
+                spot.pk = current[0]
+                to_update.append(spot)
+
+        deleted_ids = set(existing) - received_ids
+        self.stdout.write(f'신규 {len(to_create)}건, 수정 {len(to_update)}건, 삭제 {len(deleted_ids)}건')
+
+        if not (to_create or to_update or deleted_ids):
+            self.stdout.write(self.style.SUCCESS('변경 사항이 없습니다. 동기화 완료!'))
+            return
+
+        # 데이터 반영 + 세대 증가 + 변경 로그를 하나의 트랜잭션으로 처리
+        with transaction.atomic():
+            PetTourSpot.objects.bulk_create(to_create, batch_size=1000)
+            PetTourSpot.objects.bulk_update(to_update, SYNC_FIELDS, batch_size=1000)
+            deleted_list = list(deleted_ids)
+            for i in range(0, len(deleted_list), 1000):
+                PetTourSpot.objects.filter(contentid__in=deleted_list[i:i + 1000]).delete()
+
+            # 카탈로그 세대 증가 (ETag, 파생 인덱스 무효화)
+            generation = bump_generation(reason='sync_pet_tour', spot_count=len(received_ids))
+            record_changes(generation, to_create + to_update, deleted_ids)
+
+        prune_changes(generation)
+        self.stdout.write(f'카탈로그 세대: {generation}')
+
+        # 지역별 오프라인 번들 갱신
+        manifest = export_region_bundles(generation)
+        self.stdout.write(f'지역 번들 {len(manifest["bundles"])}개 생성')
+
+        # 지도 포인트 타일 미리 생성 (깊은 줌은 요청 시 생성)
+        tile_count = render_tiles(generation)
+        self.stdout.write(f'지도 타일 {tile_count}개 생성')
+
+        # 시군구별 이동 시간 행렬 갱신
+        region_count = export_travel_times(generation)
+        self.stdout.write(f'이동 시간 행렬 {region_count}개 지역 생성')
+        self.stdout.write(self.style.SUCCESS(f'동기화 완료! (총 {len(received_ids)}건)'))